@@ -14,7 +14,7 @@ from config import settings
 from core.Base import Base
 from core.enums import SafeEnum
 from user.User import User
-from auth.RefreshToken import RefreshToken
+from auth.RefreshToken import RefreshToken, is_partition_name
 from partner.Partner import Partner
 from period_log.PeriodLog import PeriodLog
 from daily_log.DailyLog import DailyLog
@@ -41,6 +41,15 @@ def render_item(type_, obj, autogen_context):
     return False
 
 
+def include_object(object_, name, type_, reflected, compare_to):
+    """
+    Skip refresh token partitions, the maintenance job manages them
+    """
+    return not (
+        type_ == "table" and reflected and is_partition_name(name)
+    )
+
+
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
@@ -67,6 +76,7 @@ def run_migrations_offline() -> None:
         compare_type = True,
         compare_server_default = True,
         render_item = render_item,
+        include_object = include_object,
     )
 
     with context.begin_transaction():
@@ -83,6 +93,7 @@ def do_run_migrations(connection: Connection) -> None:
         compare_type = True,
         compare_server_default = True,
         render_item = render_item,
+        include_object = include_object,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,103 @@
+"""partition refresh_tokens by expiry month
+
+Revision ID: c4e1f7a92d3b
+Revises: 3b6202c178ae
+Create Date: 2026-10-18 12:00:00.000000
+"""
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c4e1f7a92d3b'
+down_revision: Union[str, None] = '3b6202c178ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "token_hash, user_id, family_id, device_id, device_name, ip_address, "
+    "expires_at, is_revoked, revoked_at, id, created_at, updated_at"
+)
+
+# Tokens live at most 30 days, so the current month and the next two
+# hold every unexpired row. The maintenance job creates later months
+MONTHS = 3
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('family_id', sa.Uuid(), nullable=False),
+        sa.Column('device_id', sa.String(length=255), nullable=True),
+        sa.Column('device_name', sa.String(length=100), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_revoked', sa.Boolean(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_refresh_tokens_user_id_users'), ondelete='CASCADE'),
+    ]
+
+
+def _drop_indexes() -> None:
+    op.execute("ALTER TABLE refresh_tokens_old DROP CONSTRAINT pk_refresh_tokens")
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens_old')
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens_old')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens_old')
+
+
+def upgrade() -> None:
+    op.rename_table('refresh_tokens', 'refresh_tokens_old')
+    _drop_indexes()
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens_old')
+
+    op.create_table('refresh_tokens',
+    *_columns(),
+    sa.PrimaryKeyConstraint('expires_at', 'id', name=op.f('pk_refresh_tokens')),
+    postgresql_partition_by='RANGE (expires_at)'
+    )
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash', 'expires_at'], unique=True)
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+
+    now = datetime.now(UTC)
+    start = datetime(now.year, now.month, 1, tzinfo=UTC)
+    for _ in range(MONTHS):
+        end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        op.execute(
+            f"CREATE TABLE refresh_tokens_p{start:%Y_%m} PARTITION OF refresh_tokens "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    op.execute("CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT")
+
+    op.execute(
+        f"INSERT INTO refresh_tokens ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM refresh_tokens_old WHERE expires_at > now()"
+    )
+    op.drop_table('refresh_tokens_old')
+
+
+def downgrade() -> None:
+    op.rename_table('refresh_tokens', 'refresh_tokens_old')
+    _drop_indexes()
+
+    op.create_table('refresh_tokens',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_refresh_tokens'))
+    )
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+
+    op.execute(
+        f"INSERT INTO refresh_tokens ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM refresh_tokens_old"
+    )
+    op.drop_table('refresh_tokens_old')
@@ -0,0 +1,36 @@
+"""store token_hash as a bytea digest with a hash index
+
+Revision ID: 5d08b3e6a1f4
+Revises: c4e1f7a92d3b
+Create Date: 2026-10-18 13:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '5d08b3e6a1f4'
+down_revision: Union[str, None] = 'c4e1f7a92d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.alter_column('refresh_tokens', 'token_hash',
+               existing_type=sa.String(length=64),
+               type_=sa.LargeBinary(length=32),
+               existing_nullable=False,
+               postgresql_using="decode(token_hash, 'hex')")
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=False, postgresql_using='hash')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.alter_column('refresh_tokens', 'token_hash',
+               existing_type=sa.LargeBinary(length=32),
+               type_=sa.String(length=64),
+               existing_nullable=False,
+               postgresql_using="encode(token_hash, 'hex')")
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash', 'expires_at'], unique=True)
@@ -5,6 +5,7 @@ __main__.py
 
 import uvicorn
 
+import serve
 from config import settings
 from factory import create_app
 
@@ -12,12 +13,15 @@ from factory import create_app
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.__main__:app",
-        host = settings.HOST,
-        port = settings.PORT,
-        reload = settings.RELOAD,
-    )
+    if settings.RELOAD:
+        uvicorn.run(
+            "app.__main__:app",
+            host = settings.HOST,
+            port = settings.PORT,
+            reload = True,
+        )
+    else:
+        serve.main()
 """
 
 ⠀⠀⠀⠀⠀⠴⣦⣤⡀⢄⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⣀⡀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
@@ -10,13 +10,16 @@ from fastapi import (
     APIRouter,
     Depends,
     Query,
+    Response,
     status,
 )
 
 from config import (
     settings,
+    CountStrategy,
     UserRole,
 )
+from core.constants import NEXT_CURSOR_HEADER
 from core.dependencies import RequireRole
 from core.responses import (
     AUTH_401,
@@ -30,13 +33,13 @@ from user.schemas import (
     UserResponse,
     UserUpdateAdmin,
 )
-from user.User import User
-from user.dependencies import UserServiceDep
+from user.cache import UserPrincipal
+from user.dependencies import UserReadServiceDep, UserServiceDep
 
 
 router = APIRouter(prefix = "/admin", tags = ["admin"])
 
-AdminOnly = Annotated[User, Depends(RequireRole(UserRole.ADMIN))]
+AdminOnly = Annotated[UserPrincipal, Depends(RequireRole(UserRole.ADMIN))]
 
 
 @router.get(
@@ -48,20 +51,33 @@ AdminOnly = Annotated[User, Depends(RequireRole(UserRole.ADMIN))]
     },
 )
 async def list_users(
-    user_service: UserServiceDep,
+    response: Response,
+    user_service: UserReadServiceDep,
     _: AdminOnly,
-    page: int = Query(default = 1,
-                      ge = 1),
+    page: int | None = Query(default = None,
+                             ge = 1,
+                             deprecated = True),
     size: int = Query(
         default = settings.PAGINATION_DEFAULT_SIZE,
         ge = 1,
         le = settings.PAGINATION_MAX_SIZE
     ),
+    cursor: str | None = Query(
+        default = None,
+        description = "Opaque cursor from next_cursor of the previous page",
+    ),
+    count: CountStrategy | None = Query(
+        default = None,
+        description = "How to compute total, USER_COUNT_STRATEGY if unset",
+    ),
 ) -> UserListResponse:
     """
     List all users (admin only)
     """
-    return await user_service.list_users(page, size)
+    users = await user_service.list_users(page, size, cursor, count)
+    if users.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = users.next_cursor
+    return users
 
 
 @router.post(
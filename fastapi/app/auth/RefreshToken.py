@@ -5,6 +5,7 @@ RefreshToken.py
 
 from __future__ import annotations
 
+import re
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
@@ -13,6 +14,8 @@ import uuid6
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
+    LargeBinary,
     String,
 )
 from sqlalchemy.orm import (
@@ -37,19 +40,69 @@ if TYPE_CHECKING:
     from user.User import User
 
 
+DEFAULT_PARTITION = "refresh_tokens_default"
+PARTITION_NAME_RE = re.compile(r"^refresh_tokens_p(\d{4})_(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """
+    First instant of the UTC month containing a moment
+    """
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo = UTC)
+
+
+def next_month(start: datetime) -> datetime:
+    """
+    First instant of the month after a month start
+    """
+    if start.month == 12:
+        return start.replace(year = start.year + 1, month = 1)
+    return start.replace(month = start.month + 1)
+
+
+def partition_name(start: datetime) -> str:
+    """
+    Name of the partition holding tokens expiring in a month
+    """
+    return f"refresh_tokens_p{start:%Y_%m}"
+
+
+def is_partition_name(name: str) -> bool:
+    """
+    Whether a table is one of the refresh token partitions
+    """
+    return name == DEFAULT_PARTITION or bool(PARTITION_NAME_RE.fullmatch(name))
+
+
 class RefreshToken(Base, UUIDMixin, TimestampMixin):
     """
     Refresh token for JWT authentication
 
-    Tokens are stored as SHA 256 hashes, never raw
+    Tokens are stored as raw SHA 256 digests, never in the clear
     Family ID enables detection of token reuse attacks
+
+    On PostgreSQL the table is range partitioned by expiry month, so
+    expired tokens are removed by dropping whole partitions and each
+    partition's indexes stay small. Unique keys must contain the
+    partition key, hence the (expires_at, id) primary key. token_hash
+    is only compared for equality, so it gets a hash index storing a 4
+    byte code per row, digests are unique by construction
     """
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index(
+            "ix_refresh_tokens_token_hash",
+            "token_hash",
+            postgresql_using = "hash",
+        ),
+        {
+            "postgresql_partition_by": "RANGE (expires_at)"
+        },
+    )
 
-    token_hash: Mapped[str] = mapped_column(
-        String(TOKEN_HASH_LENGTH),
-        unique = True,
-        index = True,
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(TOKEN_HASH_LENGTH)
     )
 
     user_id: Mapped[UUID] = mapped_column(
@@ -78,7 +131,7 @@ class RefreshToken(Base, UUIDMixin, TimestampMixin):
 
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone = True),
-        index = True,
+        primary_key = True,
     )
 
     is_revoked: Mapped[bool] = mapped_column(default = False)
@@ -0,0 +1,56 @@
+"""
+ⒸAngelaMos | 2026
+maintenance.py
+"""
+
+from datetime import UTC, datetime
+
+from config import settings
+from core.database import sessionmanager
+from .repository import RefreshTokenRepository
+
+
+async def purge_expired_refresh_tokens() -> int:
+    """
+    Delete expired refresh tokens, committing after every batch
+
+    Short transactions keep row locks and WAL bursts bounded no matter
+    how far behind the purge is
+
+    Returns count of deleted tokens
+    """
+    batch_size = settings.REFRESH_TOKEN_PURGE_BATCH_SIZE
+    cutoff = datetime.now(UTC)
+    total = 0
+    while True:
+        async with sessionmanager.session() as session:
+            deleted = await RefreshTokenRepository.delete_expired_batch(
+                session,
+                cutoff,
+                batch_size,
+            )
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def maintain_refresh_token_partitions() -> int:
+    """
+    Create upcoming monthly partitions and drop fully expired ones
+
+    Runs before the purge so the batched delete only sees the expired
+    part of the current month
+
+    Returns count of partitions created plus dropped
+    """
+    async with sessionmanager.session() as session:
+        created = await RefreshTokenRepository.create_partitions(
+            session,
+            settings.REFRESH_TOKEN_PARTITION_MONTHS_AHEAD,
+        )
+    async with sessionmanager.session() as session:
+        dropped = await RefreshTokenRepository.drop_expired_partitions(
+            session,
+            datetime.now(UTC),
+        )
+    return created + dropped
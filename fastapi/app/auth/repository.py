@@ -3,14 +3,66 @@
 repository.py
 """
 
+from typing import Any
 from uuid import UUID
 from datetime import UTC, datetime
 
-from sqlalchemy import select, update
+import uuid6
+from sqlalchemy import (
+    delete,
+    false,
+    literal,
+    select,
+    text,
+    true,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .RefreshToken import RefreshToken
+from config import settings
+from .RefreshToken import (
+    DEFAULT_PARTITION,
+    PARTITION_NAME_RE,
+    RefreshToken,
+    is_partition_name,
+    month_start,
+    next_month,
+    partition_name,
+)
 from core.base_repository import BaseRepository
+from core.revocation import record_family_revoked
+from user.User import User
+
+
+PARTITION_LOCK_TIMEOUT_SQL = text("SET LOCAL lock_timeout = '5s'")
+
+LIST_PARTITIONS_SQL = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE pg_inherits.inhparent = 'refresh_tokens'::regclass"
+)
+
+
+def partition_table(name: str) -> str:
+    """
+    Quoted identifier of a refresh token partition for raw DDL
+
+    Table names cannot be bound parameters, so only names matching the
+    partition naming scheme are let through
+    """
+    if not is_partition_name(name):
+        raise ValueError(f"Not a refresh token partition: {name!r}")
+    return f'"{name}"'
+
+
+DEFAULT_TABLE = partition_table(DEFAULT_PARTITION)
+
+# Interpolated names below all pass through partition_table
+DEFAULT_HAS_ROWS_SQL = text(
+    f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_TABLE} "  # noqa: S608
+    "WHERE expires_at >= :start AND expires_at < :end)"
+)
 
 
 class RefreshTokenRepository(BaseRepository[RefreshToken]):
@@ -23,15 +75,18 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
     async def get_by_hash(
         cls,
         session: AsyncSession,
-        token_hash: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
         """
         Get refresh token by its hash
+
+        Always reloads the row, set based updates such as rotate do not
+        refresh instances already in the session
         """
         result = await session.execute(
             select(RefreshToken).where(
                 RefreshToken.token_hash == token_hash
-            )
+            ).execution_options(populate_existing = True)
         )
         return result.scalars().first()
 
@@ -39,7 +94,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
     async def get_valid_by_hash(
         cls,
         session: AsyncSession,
-        token_hash: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
         """
         Get valid (not revoked, not expired) refresh token by hash
@@ -58,7 +113,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         cls,
         session: AsyncSession,
         user_id: UUID,
-        token_hash: str,
+        token_hash: bytes,
         family_id: UUID,
         expires_at: datetime,
         device_id: str | None = None,
@@ -82,6 +137,125 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         await session.refresh(token)
         return token
 
+    @classmethod
+    async def rotate(
+        cls,
+        session: AsyncSession,
+        token_hash: bytes,
+        new_token_hash: bytes,
+        expires_at: datetime,
+        device_id: str | None = None,
+        device_name: str | None = None,
+        ip_address: str | None = None,
+    ) -> tuple[UUID,
+               UUID,
+               int] | None:
+        """
+        Revoke a valid token and insert its successor atomically
+
+        The revoke only matches a token that is unrevoked, unexpired and
+        owned by an active user. On PostgreSQL the revoke, the insert and
+        the user lookup are one statement. Of two concurrent rotations of
+        the same token the second waits on the row lock, no longer
+        matches and gets None, like any other token that cannot rotate
+
+        Returns (user_id, family_id, token_version), or None
+        """
+        now = datetime.now(UTC)
+        revoke = (
+            update(RefreshToken).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.is_revoked == false(),
+                RefreshToken.expires_at > now,
+                RefreshToken.user_id == User.id,
+                User.is_active == true(),
+            ).values(is_revoked = True,
+                     revoked_at = now)
+        )
+        successor_columns = [
+            RefreshToken.id,
+            RefreshToken.user_id,
+            RefreshToken.token_hash,
+            RefreshToken.family_id,
+            RefreshToken.expires_at,
+            RefreshToken.device_id,
+            RefreshToken.device_name,
+            RefreshToken.ip_address,
+            RefreshToken.is_revoked,
+        ]
+
+        def successor_values(
+            user_id: object,
+            family_id: object,
+        ) -> list[Any]:
+            return [
+                literal(uuid6.uuid7(), RefreshToken.id.type),
+                user_id,
+                literal(new_token_hash, RefreshToken.token_hash.type),
+                family_id,
+                literal(expires_at, RefreshToken.expires_at.type),
+                literal(device_id, RefreshToken.device_id.type),
+                literal(device_name, RefreshToken.device_name.type),
+                literal(ip_address, RefreshToken.ip_address.type),
+                false(),
+            ]
+
+        if session.get_bind().dialect.name == "postgresql":
+            revoked = revoke.returning(
+                RefreshToken.user_id,
+                RefreshToken.family_id,
+                User.token_version,
+            ).cte("revoked")
+            successor = cls.insert_statement(session).from_select(
+                successor_columns,
+                select(
+                    *successor_values(revoked.c.user_id,
+                                      revoked.c.family_id)
+                ),
+            ).cte("successor")
+            result = await session.execute(
+                select(
+                    revoked.c.user_id,
+                    revoked.c.family_id,
+                    revoked.c.token_version,
+                ).add_cte(successor)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            return row.user_id, row.family_id, row.token_version
+
+        result = await session.execute(
+            revoke.returning(RefreshToken.user_id,
+                             RefreshToken.family_id),
+            execution_options = {"synchronize_session": False},
+        )
+        revoked_row = result.first()
+        if revoked_row is None:
+            return None
+
+        await session.execute(
+            cls.insert_statement(session).from_select(
+                successor_columns,
+                select(
+                    *successor_values(
+                        literal(revoked_row.user_id,
+                                RefreshToken.user_id.type),
+                        literal(revoked_row.family_id,
+                                RefreshToken.family_id.type),
+                    )
+                ),
+            )
+        )
+        token_version = await session.scalar(
+            select(User.token_version).where(
+                User.id == revoked_row.user_id
+            )
+        )
+        if token_version is None:
+            return None
+        return revoked_row.user_id, revoked_row.family_id, token_version
+
     @classmethod
     async def revoke_token(
         cls,
@@ -107,6 +281,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
 
         Returns count of revoked tokens
         """
+        await record_family_revoked(family_id)
         result = await session.execute(
             update(RefreshToken).where(
                 RefreshToken.family_id == family_id,
@@ -156,23 +331,199 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
         )
         return list(result.scalars().all())
 
+    @classmethod
+    async def delete_expired_batch(
+        cls,
+        session: AsyncSession,
+        before: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Delete up to batch_size tokens that expired before a cutoff
+
+        Rows are picked through the expires_at index and removed by one
+        set based statement without loading them into the session. Rows
+        locked by a concurrent purge are skipped instead of waited on.
+        The statement runs on the parent table, so it also clears expired
+        tokens from the default partition, which is never dropped
+
+        Returns count of deleted tokens
+        """
+        expired = (
+            select(RefreshToken.expires_at,
+                   RefreshToken.id).where(
+                       RefreshToken.expires_at < before
+                   ).limit(batch_size).with_for_update(skip_locked = True)
+        )
+        result = await session.execute(
+            delete(RefreshToken).where(
+                tuple_(RefreshToken.expires_at,
+                       RefreshToken.id).in_(expired)
+            ),
+            execution_options = {"synchronize_session": False},
+        )
+        return result.rowcount or 0
+
     @classmethod
     async def cleanup_expired(
         cls,
         session: AsyncSession,
+        batch_size: int = settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
     ) -> int:
         """
         Delete expired tokens (for maintenance job)
 
+        Deletes in bounded batches inside the caller's transaction, use
+        delete_expired_batch with a session per batch to keep
+        transactions short
+
         Returns count of deleted tokens
         """
-        result = await session.execute(
-            select(RefreshToken).where(
-                RefreshToken.expires_at < datetime.now(UTC)
+        now = datetime.now(UTC)
+        total = 0
+        while True:
+            deleted = await cls.delete_expired_batch(
+                session,
+                now,
+                batch_size,
             )
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    @classmethod
+    async def create_partitions(
+        cls,
+        session: AsyncSession,
+        months_ahead: int,
+    ) -> int:
+        """
+        Create the partitions for this month and the next months_ahead
+
+        Tokens never outlive REFRESH_TOKEN_EXPIRE_DAYS, so a couple of
+        months ahead always covers every new token. If the job fell behind
+        and a month's tokens landed in the default partition, they are
+        moved into the new partition, which PostgreSQL otherwise refuses
+        to create. No op off PostgreSQL
+
+        Returns count of partitions created
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            return 0
+
+        existing = set(
+            (await session.execute(LIST_PARTITIONS_SQL)).scalars()
         )
-        tokens = result.scalars().all()
-        for token in tokens:
-            await session.delete(token)
-        await session.flush()
-        return len(tokens)
+        created = 0
+        start = month_start(datetime.now(UTC))
+        for _ in range(months_ahead + 1):
+            end = next_month(start)
+            name = partition_name(start)
+            if name not in existing:
+                await cls._create_partition(
+                    session,
+                    name,
+                    start,
+                    end,
+                    move_default = DEFAULT_PARTITION in existing,
+                )
+                created += 1
+            start = end
+        return created
+
+    @staticmethod
+    async def _create_partition(
+        session: AsyncSession,
+        name: str,
+        start: datetime,
+        end: datetime,
+        move_default: bool,
+    ) -> None:
+        """
+        Create one month partition, taking its rows over from the default
+        """
+        table = partition_table(name)
+        create = text(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "PARTITION OF refresh_tokens "
+            f"FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{end.isoformat()}')"
+        )
+        bounds = {"start": start, "end": end}
+        if not move_default or not (
+                await session.execute(DEFAULT_HAS_ROWS_SQL, bounds)
+        ).scalar_one():
+            await session.execute(create)
+            return
+
+        await session.execute(PARTITION_LOCK_TIMEOUT_SQL)
+        await session.execute(
+            text(
+                "ALTER TABLE refresh_tokens "
+                f"DETACH PARTITION {DEFAULT_TABLE}"
+            )
+        )
+        await session.execute(create)
+        await session.execute(
+            text(
+                f"INSERT INTO {table} SELECT * FROM {DEFAULT_TABLE} "  # noqa: S608
+                "WHERE expires_at >= :start AND expires_at < :end"
+            ),
+            bounds,
+        )
+        await session.execute(
+            text(
+                f"DELETE FROM {DEFAULT_TABLE} "  # noqa: S608
+                "WHERE expires_at >= :start AND expires_at < :end"
+            ),
+            bounds,
+        )
+        await session.execute(
+            text(
+                "ALTER TABLE refresh_tokens "
+                f"ATTACH PARTITION {DEFAULT_TABLE} DEFAULT"
+            )
+        )
+
+    @classmethod
+    async def drop_expired_partitions(
+        cls,
+        session: AsyncSession,
+        before: datetime,
+    ) -> int:
+        """
+        Detach and drop partitions whose whole month ended before a cutoff
+
+        Every token in such a partition has expired, so removing it costs
+        the same however many rows it holds. A short lock timeout keeps
+        the detach from queueing logins behind a long transaction, the
+        next run retries. No op off PostgreSQL
+
+        Returns count of partitions dropped
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            return 0
+
+        await session.execute(PARTITION_LOCK_TIMEOUT_SQL)
+        dropped = 0
+        for name in (await session.execute(LIST_PARTITIONS_SQL)).scalars():
+            match = PARTITION_NAME_RE.match(name)
+            if match is None:
+                continue
+            start = datetime(
+                int(match[1]),
+                int(match[2]),
+                1,
+                tzinfo = UTC,
+            )
+            if next_month(start) > before:
+                continue
+            await session.execute(
+                text(
+                    "ALTER TABLE refresh_tokens "
+                    f"DETACH PARTITION {partition_table(name)}"
+                )
+            )
+            await session.execute(text(f"DROP TABLE {partition_table(name)}"))
+            dropped += 1
+        return dropped
@@ -9,7 +9,6 @@ from fastapi import (
     APIRouter,
     Cookie,
     Depends,
-    Request,
     Response,
     status,
 )
@@ -26,7 +25,7 @@ from core.security import (
     clear_refresh_cookie,
     set_refresh_cookie,
 )
-from core.rate_limit import limiter
+from core.rate_limit import RateLimit
 from core.exceptions import TokenError
 from .schemas import (
     MobileLoginResponse,
@@ -39,7 +38,11 @@ from .schemas import (
 from user.schemas import UserResponse
 from .dependencies import AuthServiceDep
 from user.dependencies import UserServiceDep
-from core.responses import AUTH_401
+from core.responses import (
+    AUTH_401,
+    RATE_LIMITED_429,
+    UNAVAILABLE_503,
+)
 
 
 router = APIRouter(prefix = "/auth", tags = ["auth"])
@@ -48,11 +51,14 @@ router = APIRouter(prefix = "/auth", tags = ["auth"])
 @router.post(
     "/login",
     response_model = TokenWithUserResponse,
-    responses = {**AUTH_401}
+    responses = {
+        **AUTH_401,
+        **RATE_LIMITED_429,
+        **UNAVAILABLE_503
+    },
+    dependencies = [Depends(RateLimit("login", settings.RATE_LIMIT_AUTH))],
 )
-@limiter.limit(settings.RATE_LIMIT_AUTH)
 async def login(
-    request: Request,
     response: Response,
     auth_service: AuthServiceDep,
     ip: ClientIP,
@@ -98,11 +104,17 @@ async def refresh_token(
 @router.post(
     "/login-mobile",
     response_model = MobileLoginResponse,
-    responses = {**AUTH_401}
+    responses = {
+        **AUTH_401,
+        **RATE_LIMITED_429,
+        **UNAVAILABLE_503
+    },
+    dependencies = [
+        Depends(RateLimit("login-mobile",
+                          settings.RATE_LIMIT_AUTH))
+    ],
 )
-@limiter.limit(settings.RATE_LIMIT_AUTH)
 async def login_mobile(
-    request: Request,
     response: Response,
     auth_service: AuthServiceDep,
     ip: ClientIP,
@@ -183,7 +195,10 @@ async def get_current_user(current_user: CurrentUser) -> UserResponse:
 @router.post(
     "/change-password",
     status_code = status.HTTP_204_NO_CONTENT,
-    responses = {**AUTH_401}
+    responses = {
+        **AUTH_401,
+        **UNAVAILABLE_503
+    },
 )
 async def change_password(
     user_service: UserServiceDep,
@@ -3,6 +3,8 @@
 service.py
 """
 
+from typing import NoReturn
+
 import uuid6
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -13,6 +15,7 @@ from core.exceptions import (
     TokenError,
     TokenRevokedError,
 )
+from core.revocation import revocation_store
 from core.security import (
     hash_token,
     create_access_token,
@@ -74,7 +77,7 @@ class AuthService:
         access_token = create_access_token(user.id, user.token_version)
 
         family_id = uuid6.uuid7()
-        raw_refresh, token_hash, expires_at = create_refresh_token(user.id, family_id)
+        raw_refresh, token_hash, expires_at = create_refresh_token()
 
         await RefreshTokenRepository.create_token(
             self.session,
@@ -125,9 +128,48 @@ class AuthService:
         """
         Refresh access token using refresh token
 
-        Implements token rotation with replay attack detection
+        Implements token rotation with replay attack detection. The
+        rotation itself is one atomic statement, only a failed rotation
+        reads the token again to decide how to reject it. A rotation the
+        revocation store already knows to be revoked, by a replay or a
+        logout racing it, revokes the family it just extended
         """
         token_hash = hash_token(refresh_token)
+        new_raw_token, new_hash, expires_at = create_refresh_token()
+
+        rotated = await RefreshTokenRepository.rotate(
+            self.session,
+            token_hash = token_hash,
+            new_token_hash = new_hash,
+            expires_at = expires_at,
+            device_id = device_id,
+            device_name = device_name,
+            ip_address = ip_address,
+        )
+        if rotated is None:
+            await self._reject_refresh(token_hash)
+
+        user_id, family_id, token_version = rotated
+        revoked_below = await revocation_store.token_version(user_id)
+        if await revocation_store.is_family_revoked(family_id) or (
+                revoked_below is not None and token_version < revoked_below):
+            await RefreshTokenRepository.revoke_family(
+                self.session,
+                family_id
+            )
+            raise TokenRevokedError()
+
+        access_token = create_access_token(user_id, token_version)
+
+        return TokenResponse(access_token = access_token), new_raw_token
+
+    async def _reject_refresh(self, token_hash: bytes) -> NoReturn:
+        """
+        Raise the error for a refresh token that could not be rotated
+
+        A token that is already revoked was either replayed or lost a
+        concurrent rotation, both revoke its whole family
+        """
         stored_token = await RefreshTokenRepository.get_by_hash(
             self.session,
             token_hash
@@ -146,36 +188,7 @@ class AuthService:
         if stored_token.is_expired:
             raise TokenError(message = "Refresh token expired")
 
-        user = await UserRepository.get_by_id(
-            self.session,
-            stored_token.user_id
-        )
-        if user is None or not user.is_active:
-            raise TokenError(message = "User not found or inactive")
-
-        await RefreshTokenRepository.revoke_token(
-            self.session,
-            stored_token
-        )
-
-        access_token = create_access_token(user.id, user.token_version)
-
-        new_raw_token, new_hash, expires_at = create_refresh_token(
-            user.id, stored_token.family_id
-        )
-
-        await RefreshTokenRepository.create_token(
-            self.session,
-            user_id = user.id,
-            token_hash = new_hash,
-            family_id = stored_token.family_id,
-            expires_at = expires_at,
-            device_id = device_id,
-            device_name = device_name,
-            ip_address = ip_address,
-        )
-
-        return TokenResponse(access_token = access_token), new_raw_token
+        raise TokenError(message = "User not found or inactive")
 
     async def login_mobile(
         self,
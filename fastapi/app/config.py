@@ -3,6 +3,7 @@
 config.py
 """
 
+import tempfile
 from pathlib import Path
 from typing import Literal
 from functools import lru_cache
@@ -34,6 +35,7 @@ from core.constants import (
     TOKEN_HASH_LENGTH,
 )
 from core.enums import (
+    CountStrategy,
     CyclePhase,
     CycleRegularity,
     Environment,
@@ -49,6 +51,7 @@ from core.enums import (
 __all__ = [
     "API_PREFIX",
     "API_VERSION",
+    "CountStrategy",
     "CyclePhase",
     "CycleRegularity",
     "DEVICE_ID_MAX_LENGTH",
@@ -74,6 +77,7 @@ __all__ = [
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 _ENV_FILE = _PROJECT_ROOT / ".env"
+_SHARED_MEMORY_DIR = Path("/dev/shm")  # noqa: S108
 
 
 class Settings(BaseSettings):
@@ -103,20 +107,75 @@ class Settings(BaseSettings):
     PORT: int = 8000
     RELOAD: bool = True
 
+    SERVER_WORKERS: int | None = Field(default = None, ge = 1)
+    SERVER_WORKERS_PER_CPU: float = Field(default = 1.0, gt = 0)
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = "uvloop"
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = "httptools"
+    SERVER_PRELOAD: bool = True
+    SERVER_BACKLOG: int = Field(default = 2048, ge = 64)
+    SERVER_KEEPALIVE: int = Field(default = 5, ge = 1)
+    SERVER_TIMEOUT: int = Field(default = 60, ge = 1)
+    SERVER_GRACEFUL_TIMEOUT: int = Field(default = 30, ge = 1)
+    SERVER_MAX_REQUESTS: int = Field(default = 1000, ge = 0)
+    SERVER_MAX_REQUESTS_JITTER: int = Field(default = 100, ge = 0)
+
     DATABASE_URL: PostgresDsn
+    DATABASE_REPLICA_URLS: list[PostgresDsn] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(default = 5.0, gt = 0)
     DB_POOL_SIZE: int = Field(default = 20, ge = 5, le = 100)
     DB_MAX_OVERFLOW: int = Field(default = 10, ge = 0, le = 50)
     DB_POOL_TIMEOUT: int = Field(default = 30, ge = 10)
     DB_POOL_RECYCLE: int = Field(default = 1800, ge = 300)
+    DB_MAX_CONNECTIONS: int | None = Field(default = None, ge = 1)
+    API_REPLICAS: int = Field(default = 1, ge = 1)
+    DB_POOLER_MODE: Literal["none", "transaction"] = "none"
+    DB_POOLER_POOL_SIZE: int = Field(default = 0, ge = 0)
 
     SECRET_KEY: SecretStr = Field(..., min_length = 32)
-    JWT_ALGORITHM: Literal["HS256", "HS384", "HS512"] = "HS256"
+    JWT_ALGORITHM: Literal["HS256",
+                           "HS384",
+                           "HS512",
+                           "EdDSA",
+                           "ES256"] = "HS256"
+    JWT_PRIVATE_KEY: SecretStr | None = None
+    JWT_KEY_ID: str | None = None
+    JWT_VERIFICATION_KEYS: dict[str, str] = {}
+    JWKS_CACHE_SECONDS: int = Field(default = 300, ge = 0)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default = 15, ge = 5, le = 60)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default = 7, ge = 1, le = 30)
+    ACCESS_TOKEN_CACHE_MAX_ENTRIES: int = Field(default = 10_000, ge = 0)
+    REVOCATION_BACKEND: Literal["postgres", "redis"] = "postgres"
 
     ADMIN_EMAIL: EmailStr | None = None
 
     REDIS_URL: RedisDsn | None = None
+    REDIS_POOL_MAX_CONNECTIONS: int = Field(default = 20, ge = 1)
+    REDIS_POOL_TIMEOUT: float = Field(default = 2.0, gt = 0)
+    REDIS_SOCKET_TIMEOUT: float = Field(default = 1.0, gt = 0)
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(default = 30, ge = 0)
+
+    CACHE_ENABLED: bool = True
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(default = 10_000, ge = 0)
+    CACHE_LOCAL_TTL_SECONDS: int = Field(default = 5, ge = 0)
+    CYCLE_CACHE_TTL_SECONDS: int = Field(default = 3600, ge = 60)
+    USER_CACHE_TTL_SECONDS: int = Field(default = 60, ge = 1)
+
+    COUNT_CACHE_TTL_SECONDS: int = Field(default = 60, ge = 1)
+    COUNT_ESTIMATE_MIN_ROWS: int = Field(default = 10_000, ge = 0)
+    USER_COUNT_STRATEGY: CountStrategy = CountStrategy.CACHED
+
+    HASHING_BACKEND: Literal["thread", "process"] = "thread"
+    HASHING_MAX_WORKERS: int = Field(default = 4, ge = 1)
+    HASHING_MAX_WAITING: int = Field(default = 32, ge = 0)
+    HASHING_RETRY_AFTER_SECONDS: int = Field(default = 2, ge = 1)
+    ARGON2_TIME_COST: int = Field(default = 3, ge = 1)
+    ARGON2_MEMORY_COST: int = Field(default = 65536, ge = 8)
+    ARGON2_PARALLELISM: int = Field(default = 4, ge = 1)
+
+    MAINTENANCE_ENABLED: bool = True
+    MAINTENANCE_INTERVAL_SECONDS: int = Field(default = 3600, ge = 60)
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = Field(default = 5000, ge = 1)
+    REFRESH_TOKEN_PARTITION_MONTHS_AHEAD: int = Field(default = 2, ge = 1)
 
     CORS_ORIGINS: list[str] = [
         "http://localhost",
@@ -136,10 +195,21 @@ class Settings(BaseSettings):
 
     RATE_LIMIT_DEFAULT: str = "100/minute"
     RATE_LIMIT_AUTH: str = "20/minute"
+    RATE_LIMIT_FALLBACK_PATH: Path = Field(
+        default_factory = lambda: (
+            _SHARED_MEMORY_DIR
+            if _SHARED_MEMORY_DIR.is_dir() else Path(tempfile.gettempdir())
+        ) / "rate_limit.sqlite3"
+    )
 
     PAGINATION_DEFAULT_SIZE: int = Field(default = 20, ge = 1, le = 100)
     PAGINATION_MAX_SIZE: int = Field(default = 100, ge = 1, le = 500)
 
+    IMPORT_MAX_ENTRIES: int = Field(default = 10_000, ge = 1)
+    IMPORT_MAX_BODY_BYTES: int = Field(default = 5 * 1024 * 1024, ge = 1024)
+    IMPORT_BATCH_SIZE: int = Field(default = 1000, ge = 1, le = 5000)
+    EXPORT_BATCH_SIZE: int = Field(default = 500, ge = 1, le = 5000)
+
     LOG_LEVEL: Literal["DEBUG",
                        "INFO",
                        "WARNING",
@@ -161,6 +231,29 @@ class Settings(BaseSettings):
                 )
         return self
 
+    @model_validator(mode = "after")
+    def validate_jwt_settings(self) -> "Settings":
+        """
+        Asymmetric algorithms sign with a private key instead of SECRET_KEY
+        """
+        if (not self.JWT_ALGORITHM.startswith("HS")
+                and self.JWT_PRIVATE_KEY is None):
+            raise ValueError(
+                f"JWT_PRIVATE_KEY is required for {self.JWT_ALGORITHM}"
+            )
+        return self
+
+    @model_validator(mode = "after")
+    def validate_revocation_settings(self) -> "Settings":
+        """
+        The Redis revocation store needs a Redis to write to
+        """
+        if self.REVOCATION_BACKEND == "redis" and self.REDIS_URL is None:
+            raise ValueError(
+                "REDIS_URL is required for REVOCATION_BACKEND=redis"
+            )
+        return self
+
 
 @lru_cache
 def get_settings() -> Settings:
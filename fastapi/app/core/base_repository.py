@@ -3,7 +3,11 @@
 base_repository.py
 """
 
+import base64
+import binascii
+import json
 from collections.abc import Sequence
+from datetime import date, datetime
 from typing import (
     Any,
     Generic,
@@ -11,20 +15,90 @@ from typing import (
 )
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    Select,
+    func,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
+from config import settings
 from .Base import Base
+from .cache import TieredCache
+from .database import run_after_commit
+from .enums import CountStrategy
+from .exceptions import ValidationError
 
 
 ModelT = TypeVar("ModelT", bound = Base)
 
+KeysetColumns = Sequence[InstrumentedAttribute[Any]]
+
+ESTIMATED_COUNT_SQL = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"
+)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque URL safe token for a row's keyset values
+    """
+    plain = [
+        value.isoformat() if isinstance(value, date | datetime) else
+        str(value) if isinstance(value, UUID) else value for value in values
+    ]
+    raw = json.dumps(plain, separators = (",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: KeysetColumns) -> list[Any]:
+    """
+    Keyset values from a cursor token, typed after the key columns
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        plain = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(plain, list) or len(plain) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+
+        values: list[Any] = []
+        for key, value in zip(keys, plain, strict = True):
+            python_type = key.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValidationError("Invalid cursor", field = "cursor") from e
+
 
 class BaseRepository(Generic[ModelT]):
     """
     Generic repository with common CRUD operations
     """
     model: type[ModelT]
+    count_cache: TieredCache[int] | None = None
+
+    @classmethod
+    def insert_statement(
+        cls,
+        session: AsyncSession,
+    ) -> postgresql.Insert | sqlite.Insert:
+        """
+        Dialect specific INSERT for the model with ON CONFLICT support
+        """
+        if session.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(cls.model)
+        return postgresql.insert(cls.model)
 
     @classmethod
     async def get_by_id(
@@ -52,6 +126,49 @@ class BaseRepository(Generic[ModelT]):
         )
         return result.scalars().all()
 
+    @classmethod
+    async def get_page(
+        cls,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        keys: KeysetColumns | None = None,
+        descending: bool = False,
+        statement: Select[Any] | None = None,
+    ) -> tuple[Sequence[ModelT], str | None]:
+        """
+        Keyset paginated records and the cursor of the following page
+
+        Rows are ordered by keys, which must end in a unique column and
+        default to the time sortable UUIDv7 id. Each page seeks past the
+        cursor's key values through an index instead of counting skipped
+        rows, so deep pages cost the same as the first
+        """
+        keys = keys or (cls.model.id, )
+        if statement is None:
+            statement = select(cls.model)
+
+        if cursor is not None:
+            after = tuple_(
+                *decode_cursor(cursor, keys),
+                types = [key.type for key in keys],
+            )
+            statement = statement.where(
+                tuple_(*keys) < after if descending else tuple_(*keys) > after
+            )
+
+        result = await session.execute(
+            statement
+            .order_by(*(key.desc() if descending else key for key in keys))
+            .limit(limit + 1)
+        )
+        rows = result.scalars().all()
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[: limit]
+        return rows, encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
     @classmethod
     async def count(cls, session: AsyncSession) -> int:
         """
@@ -62,6 +179,70 @@ class BaseRepository(Generic[ModelT]):
         )
         return result.scalar_one()
 
+    @classmethod
+    async def estimate_count(cls, session: AsyncSession) -> int | None:
+        """
+        Planner row estimate from pg_class, None when unavailable
+
+        Tables that were never analyzed report -1 and small tables report
+        figures too rough to show, so both return None
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            return None
+        result = await session.execute(
+            ESTIMATED_COUNT_SQL,
+            {"name": cls.model.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < settings.COUNT_ESTIMATE_MIN_ROWS:
+            return None
+        return int(estimate)
+
+    @classmethod
+    async def count_with(
+        cls,
+        session: AsyncSession,
+        strategy: CountStrategy,
+    ) -> tuple[int, CountStrategy]:
+        """
+        Total records and the strategy that actually produced the figure
+
+        ESTIMATED falls back to an exact count where no usable estimate
+        exists. CACHED serves a count stored on an earlier call until its
+        TTL passes or a create / delete invalidates it, and reports EXACT
+        when it had to count
+        """
+        if strategy == CountStrategy.ESTIMATED:
+            estimate = await cls.estimate_count(session)
+            if estimate is not None:
+                return estimate, CountStrategy.ESTIMATED
+        elif strategy == CountStrategy.CACHED and cls.count_cache is not None:
+            key = cls.model.__tablename__
+            cached = await cls.count_cache.get(key)
+            if cached is not None:
+                return cached, CountStrategy.CACHED
+            total = await cls.count(session)
+            await cls.count_cache.set(key, total)
+            return total, CountStrategy.EXACT
+
+        return await cls.count(session), CountStrategy.EXACT
+
+    @classmethod
+    async def invalidate_count(cls, session: AsyncSession) -> None:
+        """
+        Drop the cached count now and again after the session commits
+        """
+        cache = cls.count_cache
+        if cache is None:
+            return
+        key = cls.model.__tablename__
+        await cache.delete(key)
+
+        async def invalidate_after_commit() -> None:
+            await cache.delete(key)
+
+        run_after_commit(session, invalidate_after_commit)
+
     @classmethod
     async def create(
         cls,
@@ -75,6 +256,7 @@ class BaseRepository(Generic[ModelT]):
         session.add(instance)
         await session.flush()
         await session.refresh(instance)
+        await cls.invalidate_count(session)
         return instance
 
     @classmethod
@@ -104,3 +286,4 @@ class BaseRepository(Generic[ModelT]):
         """
         await session.delete(instance)
         await session.flush()
+        await cls.invalidate_count(session)
@@ -0,0 +1,144 @@
+"""
+ⒸAngelaMos | 2026
+bulk.py
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from config import settings
+from .exceptions import ValidationError
+
+
+NDJSON_MEDIA_TYPES = frozenset({
+    "application/x-ndjson",
+    "application/jsonl",
+    "application/jsonlines",
+})
+
+IMPORT_OPENAPI_EXTRA: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                }
+            },
+            "application/x-ndjson": {
+                "schema": {"type": "string"}
+            },
+        },
+    },
+}
+
+
+def _is_ndjson(request: Request) -> bool:
+    """
+    Whether the request body is newline delimited JSON
+    """
+    media_type = request.headers.get("content-type", "")
+    return media_type.split(";")[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+
+def _prefixed(
+    error: PydanticValidationError,
+    index: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Pydantic errors relocated under the request body
+    """
+    prefix: tuple[str | int, ...] = ("body", )
+    if index is not None:
+        prefix += (index, )
+    return [
+        {
+            **detail,
+            "loc": prefix + tuple(detail["loc"]),
+        } for detail in error.errors(include_url = False)
+    ]
+
+
+def _check_size(entries: Sequence[Any]) -> None:
+    """
+    Reject imports above the configured entry limit
+    """
+    if len(entries) > settings.IMPORT_MAX_ENTRIES:
+        raise ValidationError(
+            message = (
+                f"Import is limited to {settings.IMPORT_MAX_ENTRIES} entries"
+            ),
+        )
+
+
+async def _read_body(request: Request) -> bytes:
+    """
+    Read the body, rejecting it once it grows past IMPORT_MAX_BODY_BYTES
+    """
+    limit = settings.IMPORT_MAX_BODY_BYTES
+    too_large = ValidationError(
+        message = f"Import body is limited to {limit} bytes",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+async def read_import_entries[SchemaT: BaseModel](
+    request: Request,
+    schema: type[SchemaT],
+) -> list[SchemaT]:
+    """
+    Parse and validate a bulk import body as a JSON array or NDJSON
+
+    Every entry is validated before any is returned so one request
+    reports all bad entries at once, keyed by their position. The body is
+    capped before anything is parsed
+    """
+    body = await _read_body(request)
+
+    if not _is_ndjson(request):
+        adapter = TypeAdapter(list[schema])  # type: ignore[valid-type]
+        try:
+            entries = adapter.validate_json(body)
+        except PydanticValidationError as e:
+            raise RequestValidationError(_prefixed(e)) from e
+        _check_size(entries)
+        return entries
+
+    entries = []
+    errors: list[dict[str, Any]] = []
+    for index, line in enumerate(
+            line for line in body.splitlines() if line.strip()):
+        try:
+            entries.append(schema.model_validate_json(line))
+        except PydanticValidationError as e:
+            errors.extend(_prefixed(e, index))
+        if index >= settings.IMPORT_MAX_ENTRIES:
+            break
+
+    if errors:
+        raise RequestValidationError(errors)
+    _check_size(entries)
+    return entries
+
+
+def chunked[T](items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Consecutive slices of at most size items
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
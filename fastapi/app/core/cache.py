@@ -0,0 +1,296 @@
+"""
+ⒸAngelaMos | 2026
+cache.py
+"""
+
+import itertools
+import math
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import (
+    Generic,
+    TypeVar,
+)
+
+import redis.asyncio as redis
+
+from config import settings
+from .logging import get_logger
+from .redis_pool import get_redis_client
+
+
+T = TypeVar("T")
+
+logger = get_logger(__name__)
+
+# Fallback versions of unknown keys are seeded this far apart, from a
+# random point per process, so bumps never walk into another seed
+FALLBACK_SEED_STRIDE = 1 << 32
+
+
+class LocalLRU(Generic[T]):
+    """
+    In process LRU with per entry expiry
+
+    Entries are evicted least recently used first once max_entries is
+    reached, and lazily dropped when read after their deadline
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    def get(self, key: str) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: T, ttl_seconds: float | None = None) -> None:
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last = False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache(Generic[T]):
+    """
+    Read through cache with an in process LRU tier and an optional Redis tier
+
+    The local tier absorbs repeated reads inside one worker and uses a short
+    TTL so entries invalidated by another worker age out quickly. Redis is
+    shared by all workers and is the tier invalidations are written to.
+    Redis failures degrade to local only caching instead of failing requests
+    """
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        encode: Callable[[T],
+                         str],
+        decode: Callable[[str],
+                         T],
+        local_ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._encode = encode
+        self._decode = decode
+        self._local: LocalLRU[T] = LocalLRU(
+            max_entries = settings.CACHE_LOCAL_MAX_ENTRIES
+            if max_entries is None else max_entries,
+            ttl_seconds = min(
+                ttl_seconds,
+                settings.CACHE_LOCAL_TTL_SECONDS
+                if local_ttl_seconds is None else local_ttl_seconds,
+            ),
+        )
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> T | None:
+        """
+        Return a cached value from the closest tier that holds it
+        """
+        if not settings.CACHE_ENABLED:
+            return None
+
+        value = self._local.get(key)
+        if value is not None:
+            return value
+
+        client = get_redis_client()
+        if client is None:
+            return None
+
+        try:
+            raw = await client.get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning(
+                "cache_get_failed",
+                namespace = self.namespace,
+                error = str(e),
+            )
+            return None
+
+        if raw is None:
+            return None
+
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        value = self._decode(raw)
+        self._local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: T) -> None:
+        """
+        Store a value in both tiers
+        """
+        if not settings.CACHE_ENABLED:
+            return
+
+        self._local.set(key, value)
+
+        client = get_redis_client()
+        if client is None:
+            return
+
+        try:
+            await client.set(
+                self._redis_key(key),
+                self._encode(value),
+                ex = self.ttl_seconds,
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "cache_set_failed",
+                namespace = self.namespace,
+                error = str(e),
+            )
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Remove keys from both tiers
+        """
+        for key in keys:
+            self._local.delete(key)
+
+        client = get_redis_client()
+        if client is None or not keys:
+            return
+
+        try:
+            await client.delete(*(self._redis_key(key) for key in keys))
+        except redis.RedisError as e:
+            logger.warning(
+                "cache_delete_failed",
+                namespace = self.namespace,
+                error = str(e),
+            )
+
+    def clear_local(self) -> None:
+        """
+        Drop every entry from the in process tier
+        """
+        self._local.clear()
+
+
+class VersionCounter:
+    """
+    Per key monotonically increasing version numbers
+
+    Cached values embed the version they were computed under in their key.
+    Bumping the version makes every older entry unreachable, which also
+    discards values that were being computed concurrently with a write
+
+    Without Redis, versions live in a bounded LRU. A key it evicted is
+    seeded again with a fresh version rather than 0, so entries cached
+    under its earlier versions can never match again
+    """
+    def __init__(self, namespace: str, ttl_seconds: int) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._local: LocalLRU[int] = LocalLRU(
+            max_entries = settings.CACHE_LOCAL_MAX_ENTRIES,
+            ttl_seconds = min(ttl_seconds, settings.CACHE_LOCAL_TTL_SECONDS),
+        )
+        self._fallback: LocalLRU[int] = LocalLRU(
+            max_entries = settings.CACHE_LOCAL_MAX_ENTRIES,
+            ttl_seconds = math.inf,
+        )
+        self._seeds = itertools.count(
+            secrets.randbelow(1 << 30) * FALLBACK_SEED_STRIDE,
+            FALLBACK_SEED_STRIDE,
+        )
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _fallback_version(self, key: str) -> int:
+        version = self._fallback.get(key)
+        if version is None:
+            version = next(self._seeds)
+            self._fallback.set(key, version)
+        return version
+
+    async def get(self, key: str) -> int:
+        """
+        Current version for a key, 0 if it was never bumped in Redis
+        """
+        version = self._local.get(key)
+        if version is not None:
+            return version
+
+        client = get_redis_client()
+        if client is None:
+            return self._fallback_version(key)
+
+        try:
+            raw = await client.get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.warning(
+                "cache_version_get_failed",
+                namespace = self.namespace,
+                error = str(e),
+            )
+            return self._fallback_version(key)
+
+        version = int(raw) if raw is not None else 0
+        self._local.set(key, version)
+        return version
+
+    async def bump(self, key: str) -> int:
+        """
+        Increment the version for a key and return the new value
+        """
+        client = get_redis_client()
+        if client is None:
+            version = self._fallback_version(key) + 1
+            self._fallback.set(key, version)
+            self._local.set(key, version)
+            return version
+
+        try:
+            pipe = client.pipeline()
+            pipe.incr(self._redis_key(key))
+            pipe.expire(self._redis_key(key), self.ttl_seconds)
+            version, _ = await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(
+                "cache_version_bump_failed",
+                namespace = self.namespace,
+                error = str(e),
+            )
+            self._local.delete(key)
+            return -1
+
+        self._local.set(key, version)
+        return int(version)
+
+    def clear_local(self) -> None:
+        """
+        Drop every locally known version
+        """
+        self._local.clear()
+        self._fallback.clear()
@@ -16,12 +16,53 @@ class HealthResponse(BaseSchema):
     version: str
 
 
+class HashingStats(BaseSchema):
+    """
+    Password hashing pool utilization for this worker
+    """
+    backend: str
+    max_workers: int
+    max_waiting: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    latency_seconds_sum: float
+    latency_seconds_max: float
+
+
+class DatabasePoolStats(BaseSchema):
+    """
+    Database connection pool utilization for this worker
+    """
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+
+
+class RedisPoolStats(BaseSchema):
+    """
+    Redis connection pool utilization for this worker
+
+    Connection counts are None when the client library does not expose them
+    """
+    max_connections: int
+    open_connections: int | None = None
+    in_use: int | None = None
+    idle: int | None = None
+
+
 class HealthDetailedResponse(HealthResponse):
     """
     Detailed health check with component status
     """
     database: HealthStatus
+    database_pool: DatabasePoolStats | None = None
     redis: HealthStatus | None = None
+    redis_pool: RedisPoolStats | None = None
+    hashing: HashingStats | None = None
 
 
 class AppInfoResponse(BaseSchema):
@@ -32,3 +73,32 @@ class AppInfoResponse(BaseSchema):
     version: str
     environment: str
     docs_url: str | None
+
+
+class JSONWebKey(BaseSchema):
+    """
+    Public signing key in JWK format
+    """
+    kty: str
+    crv: str
+    x: str
+    y: str | None = None
+    kid: str
+    alg: str
+    use: str
+
+
+class JWKSResponse(BaseSchema):
+    """
+    JSON Web Key Set of the access token verification keys
+    """
+    keys: list[JSONWebKey]
+
+
+class ImportResponse(BaseSchema):
+    """
+    Outcome of a bulk import
+    """
+    received: int
+    imported: int
+    skipped: int
@@ -9,10 +9,16 @@ PASSWORD_MAX_LENGTH = 128
 PASSWORD_HASH_MAX_LENGTH = 1024
 FULL_NAME_MAX_LENGTH = 255
 
-TOKEN_HASH_LENGTH = 64
+TOKEN_HASH_LENGTH = 32
 DEVICE_ID_MAX_LENGTH = 255
 DEVICE_NAME_MAX_LENGTH = 100
 IP_ADDRESS_MAX_LENGTH = 45
 
 API_VERSION = "v1"
 API_PREFIX = f"/{API_VERSION}"
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+READ_PRIMARY_UNTIL_HEADER = "X-Read-Primary-Until"
+READ_PRIMARY_UNTIL_COOKIE = "read_primary_until"
+
+MAINTENANCE_LOCK_KEY = 0x6D61696E74656E
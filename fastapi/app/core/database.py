@@ -3,15 +3,23 @@
 database.py
 """
 
+import asyncio
 import contextlib
+import itertools
 from collections.abc import (
     AsyncIterator,
+    Awaitable,
+    Callable,
     Iterator,
+    Sequence,
 )
+from typing import Any
+from uuid import uuid4
 
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
-from sqlalchemy.engine.url import make_url
+from sqlalchemy.engine.url import URL, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -20,36 +28,130 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
 from config import settings
+from .common_schemas import DatabasePoolStats
+from .logging import get_logger
+from .workers import worker_count
+
+
+AFTER_COMMIT_KEY = "after_commit"
+
+logger = get_logger(__name__)
+
+
+def pool_limits() -> tuple[int, int]:
+    """
+    Pool size and overflow for one worker's engine
+
+    With DB_MAX_CONNECTIONS set, the budget is split evenly across
+    API_REPLICAS times the worker count, and DB_POOL_SIZE and
+    DB_MAX_OVERFLOW only act as upper bounds inside each share
+    """
+    if settings.DB_MAX_CONNECTIONS is None:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    processes = settings.API_REPLICAS * worker_count()
+    share = settings.DB_MAX_CONNECTIONS // processes
+    if share < 1:
+        logger.warning(
+            "db_connection_budget_exceeded",
+            max_connections = settings.DB_MAX_CONNECTIONS,
+            processes = processes,
+        )
+        share = 1
+    pool_size = min(settings.DB_POOL_SIZE, share)
+    return pool_size, min(settings.DB_MAX_OVERFLOW, share - pool_size)
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def async_engine_options() -> dict[str, Any]:
+    """
+    Pool and driver options for the async engine
+
+    Behind PgBouncer in transaction mode, consecutive transactions may run
+    on different server connections, so asyncpg's cached named prepared
+    statements would be missing or collide there. DB_POOLER_MODE=transaction
+    turns the statement caches off, gives every statement a unique name
+    and keeps at most DB_POOLER_POOL_SIZE local connections, none for
+    NullPool. Per checkout pings are dropped, a disconnect error
+    invalidates the pool instead so the next checkout reconnects
+    """
+    if settings.DB_POOLER_MODE == "none":
+        pool_size, max_overflow = pool_limits()
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+
+    options: dict[str, Any] = {
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        },
+        "pool_pre_ping": False,
+    }
+    if settings.DB_POOLER_POOL_SIZE == 0:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size = settings.DB_POOLER_POOL_SIZE,
+            max_overflow = 0,
+            pool_timeout = settings.DB_POOL_TIMEOUT,
+            pool_recycle = settings.DB_POOL_RECYCLE,
+        )
+    return options
 
 
 class DatabaseSessionManager:
     """
     Manages database connections and sessions for both sync and async contexts
+
+    Only the async engine is built by init. The sync engine is created on
+    first use, so API workers, which never touch it, hold no connections
+    for it
+
+    Replica engines, when configured, serve read_session. Reads fall back
+    to the primary when there are none or the caller asks for it
+
+    unpooled_connect opens connections outside the per worker pool budget
+    for work that holds one for a long time, such as a leader lock
     """
     def __init__(self) -> None:
+        self._url: URL | None = None
         self._async_engine: AsyncEngine | None = None
+        self._replica_engines: list[AsyncEngine] = []
+        self._replica_sessionmakers: list[async_sessionmaker[AsyncSession]] = []
+        self._next_replica: Iterator[async_sessionmaker[AsyncSession]] | None = None
+        self._unpooled_engine: AsyncEngine | None = None
         self._sync_engine: Engine | None = None
         self._async_sessionmaker: async_sessionmaker[AsyncSession
                                                      ] | None = None
         self._sync_sessionmaker: sessionmaker[Session] | None = None
 
-    def init(self, database_url: str) -> None:
+    def init(
+        self,
+        database_url: str,
+        replica_urls: Sequence[str] = (),
+    ) -> None:
         """
-        Initialize database engines and session factories
+        Initialize the async engines and session factories
         """
-        base_url = make_url(database_url)
+        self._url = make_url(database_url)
 
-        async_url = base_url.set(drivername = "postgresql+asyncpg")
+        async_url = self._url.set(drivername = "postgresql+asyncpg")
         self._async_engine = create_async_engine(
             async_url,
-            pool_size = settings.DB_POOL_SIZE,
-            max_overflow = settings.DB_MAX_OVERFLOW,
-            pool_timeout = settings.DB_POOL_TIMEOUT,
-            pool_recycle = settings.DB_POOL_RECYCLE,
-            pool_pre_ping = True,
             echo = settings.DEBUG,
+            **async_engine_options(),
         )
         self._async_sessionmaker = async_sessionmaker(
             bind = self._async_engine,
@@ -58,24 +160,83 @@ class DatabaseSessionManager:
             autoflush = False,
             expire_on_commit = False,
         )
+        for replica_url in replica_urls:
+            replica_engine = create_async_engine(
+                make_url(replica_url).set(drivername = "postgresql+asyncpg"),
+                echo = settings.DEBUG,
+                **async_engine_options(),
+            )
+            self._replica_engines.append(replica_engine)
+            self._replica_sessionmakers.append(
+                async_sessionmaker(
+                    bind = replica_engine,
+                    class_ = AsyncSession,
+                    autocommit = False,
+                    autoflush = False,
+                    expire_on_commit = False,
+                )
+            )
+        if self._replica_sessionmakers:
+            self._next_replica = itertools.cycle(self._replica_sessionmakers)
 
-        sync_url = base_url.set(drivername = "postgresql+psycopg2")
-        self._sync_engine = create_engine(
-            sync_url,
-            pool_size = settings.DB_POOL_SIZE,
-            max_overflow = settings.DB_MAX_OVERFLOW,
-            pool_timeout = settings.DB_POOL_TIMEOUT,
-            pool_recycle = settings.DB_POOL_RECYCLE,
-            pool_pre_ping = True,
-            echo = settings.DEBUG,
-        )
-        self._sync_sessionmaker = sessionmaker(
-            bind = self._sync_engine,
-            autocommit = False,
-            autoflush = False,
-            expire_on_commit = False,
+        logger.info(
+            "db_pool_started",
+            pooler_mode = settings.DB_POOLER_MODE,
+            pool = self._async_engine.pool.status(),
+            replicas = len(self._replica_sessionmakers),
         )
 
+    @property
+    def has_replicas(self) -> bool:
+        """
+        Whether reads can be routed away from the primary
+        """
+        return bool(self._replica_engines)
+
+    def _init_unpooled(self) -> AsyncEngine:
+        """
+        Build the engine behind unpooled_connect
+        """
+        if self._url is None:
+            raise RuntimeError("DatabaseSessionManager is not initialized")
+
+        if self._unpooled_engine is None:
+            connect_args = async_engine_options().get("connect_args", {})
+            self._unpooled_engine = create_async_engine(
+                self._url.set(drivername = "postgresql+asyncpg"),
+                echo = settings.DEBUG,
+                poolclass = NullPool,
+                connect_args = connect_args,
+            )
+        return self._unpooled_engine
+
+    def _init_sync(self) -> Engine:
+        """
+        Build the sync engine for migrations and CLI tools
+        """
+        if self._url is None:
+            raise RuntimeError("DatabaseSessionManager is not initialized")
+
+        if self._sync_engine is None:
+            pool_size, max_overflow = pool_limits()
+            sync_url = self._url.set(drivername = "postgresql+psycopg2")
+            self._sync_engine = create_engine(
+                sync_url,
+                pool_size = pool_size,
+                max_overflow = max_overflow,
+                pool_timeout = settings.DB_POOL_TIMEOUT,
+                pool_recycle = settings.DB_POOL_RECYCLE,
+                pool_pre_ping = True,
+                echo = settings.DEBUG,
+            )
+            self._sync_sessionmaker = sessionmaker(
+                bind = self._sync_engine,
+                autocommit = False,
+                autoflush = False,
+                expire_on_commit = False,
+            )
+        return self._sync_engine
+
     async def close(self) -> None:
         """
         Dispose of all database connections
@@ -85,30 +246,76 @@ class DatabaseSessionManager:
             self._async_engine = None
             self._async_sessionmaker = None
 
+        for replica_engine in self._replica_engines:
+            await replica_engine.dispose()
+        self._replica_engines = []
+        self._replica_sessionmakers = []
+        self._next_replica = None
+
+        if self._unpooled_engine:
+            await self._unpooled_engine.dispose()
+            self._unpooled_engine = None
+
         if self._sync_engine:
             self._sync_engine.dispose()
             self._sync_engine = None
             self._sync_sessionmaker = None
 
+        self._url = None
+
     @contextlib.asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
         """
         Async context manager for database sessions
 
-        Handles commit on success, rollback on exception
+        Handles commit on success, rollback on exception unless the
+        exception asks for its writes to be committed
         """
         if self._async_sessionmaker is None:
             raise RuntimeError("DatabaseSessionManager is not initialized")
 
         session = self._async_sessionmaker()
+        committed = False
         try:
             yield session
             await session.commit()
-        except Exception:
-            await session.rollback()
+            committed = True
+        except Exception as e:
+            if getattr(e, "commit_session", False):
+                await session.commit()
+                committed = True
+            else:
+                await session.rollback()
             raise
         finally:
+            callbacks = session.info.pop(AFTER_COMMIT_KEY, [])
             await session.close()
+            if committed:
+                for callback in callbacks:
+                    await callback()
+
+    @contextlib.asynccontextmanager
+    async def read_session(
+        self,
+        use_primary: bool = False,
+    ) -> AsyncIterator[AsyncSession]:
+        """
+        Async context manager for read only sessions
+
+        Sessions come from the next replica in turn, or the primary when
+        use_primary is set or no replica is configured. Nothing is
+        committed, the transaction is rolled back when the session closes
+        """
+        if self._async_sessionmaker is None:
+            raise RuntimeError("DatabaseSessionManager is not initialized")
+
+        if use_primary or self._next_replica is None:
+            factory = self._async_sessionmaker
+        else:
+            factory = next(self._next_replica)
+
+        async with factory() as session:
+            yield session
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -121,20 +328,47 @@ class DatabaseSessionManager:
         async with self._async_engine.begin() as connection:
             yield connection
 
+    @contextlib.asynccontextmanager
+    async def unpooled_connect(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Async context manager for a connection of its own, closed on exit
+
+        It never takes a slot from the pool, so holding it while running
+        pooled sessions cannot starve them
+        """
+        async with self._init_unpooled().begin() as connection:
+            yield connection
+
+    def stats(self) -> DatabasePoolStats | None:
+        """
+        Snapshot of the async pool's utilization for this worker
+        """
+        if self._async_engine is None:
+            return None
+        pool = self._async_engine.pool
+        if not isinstance(pool, QueuePool):
+            return None
+        return DatabasePoolStats(
+            pool_size = pool.size(),
+            max_overflow = pool._max_overflow,
+            checked_out = pool.checkedout(),
+            idle = pool.checkedin(),
+            overflow = max(pool.overflow(), 0),
+        )
+
     @property
     def sync_engine(self) -> Engine:
         """
-        Sync engine for Alembic migrations
+        Sync engine for Alembic migrations, created on first use
         """
-        if self._sync_engine is None:
-            raise RuntimeError("DatabaseSessionManager is not initialized")
-        return self._sync_engine
+        return self._init_sync()
 
     @contextlib.contextmanager
     def sync_session(self) -> Iterator[Session]:
         """
         Sync context manager for migrations and CLI tools
         """
+        self._init_sync()
         if self._sync_sessionmaker is None:
             raise RuntimeError("DatabaseSessionManager is not initialized")
 
@@ -152,9 +386,72 @@ class DatabaseSessionManager:
 sessionmanager = DatabaseSessionManager()
 
 
+def run_after_commit(
+    session: AsyncSession,
+    callback: Callable[[],
+                       Awaitable[None]],
+) -> None:
+    """
+    Schedule a callback to run once the request session has committed
+
+    Used for cache invalidation so concurrent readers cannot repopulate a
+    cache from data that is about to change
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+_delayed_callbacks: set[asyncio.Task[None]] = set()
+
+
+async def _run_later(
+    delay: float,
+    callback: Callable[[],
+                       Awaitable[None]],
+) -> None:
+    await asyncio.sleep(delay)
+    await callback()
+
+
+def run_after_replication(
+    session: AsyncSession,
+    callback: Callable[[],
+                       Awaitable[None]],
+) -> None:
+    """
+    Run a callback after commit and again once replicas have caught up
+
+    A reader on a lagging replica can repopulate a cache from the old rows
+    after the first run, the second run DB_REPLICA_MAX_LAG_SECONDS later
+    discards whatever it stored
+    """
+    async def run_now_and_later() -> None:
+        await callback()
+        if sessionmanager.has_replicas:
+            task = asyncio.create_task(
+                _run_later(settings.DB_REPLICA_MAX_LAG_SECONDS,
+                           callback)
+            )
+            _delayed_callbacks.add(task)
+            task.add_done_callback(_delayed_callbacks.discard)
+
+    run_after_commit(session, run_now_and_later)
+
+
 async def get_db_session() -> AsyncIterator[AsyncSession]:
     """
     FastAPI dependency for database sessions
     """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency for read only routes
+
+    Served by a replica unless the client wrote within the replica lag
+    window, as flagged by ReadYourWritesMiddleware
+    """
+    use_primary = getattr(request.state, "read_from_primary", False)
+    async with sessionmanager.read_session(use_primary) as session:
+        yield session
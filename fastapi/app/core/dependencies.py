@@ -18,7 +18,7 @@ from config import (
     TokenType,
     UserRole,
 )
-from .database import get_db_session
+from .database import get_db_session, get_read_db_session
 from .exceptions import (
     InactiveUser,
     PermissionDenied,
@@ -27,7 +27,10 @@ from .exceptions import (
     UserNotFound,
 )
 from user.User import User
+from .redis_pool import StrRedis, get_redis_client
+from .revocation import revocation_store
 from .security import decode_access_token
+from user.cache import UserPrincipal, user_principal_cache
 from user.repository import UserRepository
 
 
@@ -42,15 +45,13 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
 )
 
 DBSession = Annotated[AsyncSession, Depends(get_db_session)]
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db_session)]
+RedisClient = Annotated[StrRedis | None, Depends(get_redis_client)]
 
 
-async def get_current_user(
-    token: Annotated[str,
-                     Depends(oauth2_scheme)],
-    db: DBSession,
-) -> User:
+def _decode_access_payload(token: str) -> tuple[UUID, int | None]:
     """
-    Validate access token and return current user
+    Validate an access token and return its user id and token version
     """
     try:
         payload = decode_access_token(token)
@@ -60,13 +61,68 @@ async def get_current_user(
     if payload.get("type") != TokenType.ACCESS.value:
         raise TokenError(message = "Invalid token type")
 
-    user_id = UUID(payload["sub"])
-    user = await UserRepository.get_by_id(db, user_id)
+    return UUID(payload["sub"]), payload.get("token_version")
+
+
+async def get_current_principal(
+    token: Annotated[str,
+                     Depends(oauth2_scheme)],
+    db: DBSession,
+) -> UserPrincipal:
+    """
+    Validate access token and return the cached principal of its user
+
+    Tokens below the version the revocation store knows are rejected
+    before any lookup. Only loads the user row when the principal cache
+    misses
+    """
+    user_id, token_version = _decode_access_payload(token)
+
+    revoked_below = await revocation_store.token_version(user_id)
+    if revoked_below is not None and (token_version or 0) < revoked_below:
+        raise TokenRevokedError()
+
+    principal = await user_principal_cache.get(user_id)
+    if principal is None:
+        version = await user_principal_cache.version(user_id)
+        user = await UserRepository.get_by_id(db, user_id)
+        if user is None:
+            raise UserNotFound(identifier = str(user_id))
+        principal = UserPrincipal.from_user(user)
+        await user_principal_cache.set(principal, version)
+
+    if token_version != principal.token_version:
+        raise TokenRevokedError()
+
+    return principal
+
+
+async def get_current_active_principal(
+    principal: Annotated[UserPrincipal,
+                         Depends(get_current_principal)],
+) -> UserPrincipal:
+    """
+    Ensure the principal is active
+    """
+    if not principal.is_active:
+        raise InactiveUser()
+    return principal
+
+
+async def get_current_user(
+    principal: Annotated[UserPrincipal,
+                         Depends(get_current_principal)],
+    db: DBSession,
+) -> User:
+    """
+    Validate access token and return current user model
+    """
+    user = await UserRepository.get_by_id(db, principal.id)
 
     if user is None:
-        raise UserNotFound(identifier = str(user_id))
+        raise UserNotFound(identifier = str(principal.id))
 
-    if payload.get("token_version") != user.token_version:
+    if principal.token_version != user.token_version:
         raise TokenRevokedError()
 
     return user
@@ -118,18 +174,20 @@ class RequireRole:
 
     async def __call__(
         self,
-        user: Annotated[User,
-                        Depends(get_current_active_user)],
-    ) -> User:
-        if user.role not in self.allowed_roles:
+        principal: Annotated[UserPrincipal,
+                             Depends(get_current_active_principal)],
+    ) -> UserPrincipal:
+        if principal.role not in self.allowed_roles:
             raise PermissionDenied(
                 message =
                 f"Requires one of roles: {', '.join(r.value for r in self.allowed_roles)}",
             )
-        return user
+        return principal
 
 
 CurrentUser = Annotated["User", Depends(get_current_active_user)]
+CurrentPrincipal = Annotated[UserPrincipal,
+                             Depends(get_current_active_principal)]
 OptionalUser = Annotated["User | None", Depends(get_optional_user)]
 
 
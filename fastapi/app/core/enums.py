@@ -120,3 +120,20 @@ class FlowIntensity(str, Enum):
     LIGHT = "light"
     MEDIUM = "medium"
     HEAVY = "heavy"
+
+
+class ExportFormat(str, Enum):
+    """
+    Serialization formats for streamed exports
+    """
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class CountStrategy(str, Enum):
+    """
+    How a repository produces a table's total row count
+    """
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
@@ -9,7 +9,12 @@ from typing import Any
 class BaseAppException(Exception):
     """
     Base exception for all application specific errors
+
+    Exceptions with commit_session set keep the request's writes, for
+    errors that are the result of a deliberate state change
     """
+    commit_session = False
+
     def __init__(
         self,
         message: str,
@@ -112,7 +117,11 @@ class TokenError(AuthenticationError):
 class TokenRevokedError(TokenError):
     """
     Raised when a revoked token is used
+
+    Commits so a family revocation triggered by the reuse is kept
     """
+    commit_session = True
+
     def __init__(self, extra: dict[str, Any] | None = None) -> None:
         super().__init__(message = "Token has been revoked", extra = extra)
 
@@ -149,12 +158,65 @@ class RateLimitExceeded(BaseAppException):
     ) -> None:
         super().__init__(
             message = message,
-            status_code = 420,
+            status_code = 429,
             extra = extra
         )
         self.retry_after = retry_after
 
 
+class ServiceUnavailable(BaseAppException):
+    """
+    Raised when the server sheds load and the client should retry later
+    """
+    def __init__(
+        self,
+        message: str = "Service temporarily unavailable",
+        retry_after: int | None = None,
+        extra: dict[str,
+                    Any] | None = None,
+    ) -> None:
+        super().__init__(
+            message = message,
+            status_code = 503,
+            extra = extra
+        )
+        self.retry_after = retry_after
+
+
+class HashingCapacityExceeded(ServiceUnavailable):
+    """
+    Raised when the password hashing pool and its wait queue are full
+    """
+    def __init__(
+        self,
+        retry_after: int | None = None,
+        extra: dict[str,
+                    Any] | None = None,
+    ) -> None:
+        super().__init__(
+            message = "Too many sign in attempts in progress, retry shortly",
+            retry_after = retry_after,
+            extra = extra,
+        )
+
+
+class HashingUnavailable(ServiceUnavailable):
+    """
+    Raised when a password hashing worker died and the pool is rebuilt
+    """
+    def __init__(
+        self,
+        retry_after: int | None = None,
+        extra: dict[str,
+                    Any] | None = None,
+    ) -> None:
+        super().__init__(
+            message = "Sign in is temporarily unavailable, retry shortly",
+            retry_after = retry_after,
+            extra = extra,
+        )
+
+
 class UserNotFound(ResourceNotFound):
     """
     Raised when a user is not found
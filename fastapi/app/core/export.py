@@ -0,0 +1,114 @@
+"""
+ⒸAngelaMos | 2026
+export.py
+"""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+from .enums import ExportFormat
+
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class RowStream:
+    """
+    Column names plus an async iterator of row batches
+
+    Rows are plain tuples straight from the database cursor so exports
+    never materialize ORM objects or response models
+    """
+    def __init__(
+        self,
+        fields: Sequence[str],
+        batches: AsyncIterator[Sequence[Sequence[Any]]],
+    ) -> None:
+        self.fields = fields
+        self.batches = batches
+
+
+def _plain(value: Any) -> Any:
+    """
+    JSON friendly form of a column value
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    """
+    CSV friendly form of a column value, lists joined by semicolons
+    """
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(str(_plain(item)) for item in value)
+    return _plain(value)
+
+
+async def _ndjson(stream: RowStream) -> AsyncIterator[str]:
+    """
+    One JSON object per row, one chunk per batch
+    """
+    async for batch in stream.batches:
+        yield "".join(
+            json.dumps(
+                {
+                    field: _plain(value)
+                    for field, value in zip(stream.fields, row, strict = True)
+                },
+                separators = (",", ":"),
+            ) + "\n" for row in batch
+        )
+
+
+async def _csv(stream: RowStream) -> AsyncIterator[str]:
+    """
+    Header row first, then one chunk per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(stream.fields)
+    yield buffer.getvalue()
+
+    async for batch in stream.batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+
+
+def export_response(
+    stream: RowStream,
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Stream rows as an NDJSON or CSV attachment, one chunk per batch
+    """
+    encode = _csv if export_format == ExportFormat.CSV else _ndjson
+    return StreamingResponse(
+        encode(stream),
+        media_type = EXPORT_MEDIA_TYPES[export_format],
+        headers = {
+            "Content-Disposition":
+            f'attachment; filename="{filename}.{export_format.value}"',
+        },
+    )
@@ -0,0 +1,332 @@
+"""
+ⒸAngelaMos | 2026
+hashing.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Literal,
+    NamedTuple,
+    Self,
+    TypeVar,
+)
+
+from config import settings
+from .common_schemas import HashingStats
+from .exceptions import HashingCapacityExceeded, HashingUnavailable
+from .logging import get_logger
+
+
+if TYPE_CHECKING:
+    from pwdlib import PasswordHash
+
+
+T = TypeVar("T")
+
+HashingBackend = Literal["thread", "process"]
+
+logger = get_logger(__name__)
+
+
+class Argon2Params(NamedTuple):
+    """
+    Argon2id cost parameters shared by the API and hashing processes
+    """
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+
+    @classmethod
+    def from_settings(cls) -> Self:
+        return cls(
+            time_cost = settings.ARGON2_TIME_COST,
+            memory_cost = settings.ARGON2_MEMORY_COST,
+            parallelism = settings.ARGON2_PARALLELISM,
+        )
+
+
+# Argon2id of DUMMY_PASSWORD with the default ARGON2_* parameters
+PRECOMPUTED_DUMMY_HASH = (
+    "$argon2id$v=19$m=65536,t=3,p=4$MTrJj9GAyQ9tYOIMDANZNg"
+    "$O3Yol1c5zUZps3q73sEXtn87p+nVl8znE7miPvYV7qk"
+)
+DUMMY_PASSWORD = "dummy_password_for_timing_attack_prevention"
+
+_password_hasher: PasswordHash | None = None
+_dummy_hash: str | None = None
+
+
+def configure_password_hasher(params: Argon2Params) -> PasswordHash:
+    """
+    Build the process wide hasher, also the process pool initializer
+
+    pwdlib and argon2 are imported here so workers that never hash a
+    password do not load them
+    """
+    from pwdlib import PasswordHash
+    from pwdlib.hashers.argon2 import Argon2Hasher
+
+    global _password_hasher, _dummy_hash
+    _password_hasher = PasswordHash((Argon2Hasher(**params._asdict()), ))
+    _dummy_hash = None
+    return _password_hasher
+
+
+def get_password_hasher() -> PasswordHash:
+    """
+    Process wide hasher, configured from settings on first use
+    """
+    if _password_hasher is None:
+        return configure_password_hasher(Argon2Params.from_settings())
+    return _password_hasher
+
+
+def hash_secret(password: str) -> str:
+    """
+    Argon2id hash of a password
+    """
+    return get_password_hasher().hash(password)
+
+
+def verify_secret(password: str, hashed: str) -> bool:
+    """
+    Check a password against a hash
+    """
+    return get_password_hasher().verify(password, hashed)
+
+
+def verify_and_update_secret(
+    password: str,
+    hashed: str,
+) -> tuple[bool,
+           str | None]:
+    """
+    Check a password and rehash it when the stored parameters are outdated
+
+    A hash that is not a valid Argon2 hash fails like a wrong password
+    """
+    from argon2.exceptions import InvalidHashError, VerificationError
+    from pwdlib.exceptions import UnknownHashError
+
+    try:
+        return get_password_hasher().verify_and_update(password, hashed)
+    except (UnknownHashError, InvalidHashError, VerificationError):
+        return False, None
+
+
+def get_dummy_hash() -> str:
+    """
+    Hash verified for unknown users so they cost as much as real ones
+
+    The precomputed hash is used while it matches the configured Argon2
+    parameters, otherwise one is computed on first use instead of at
+    import, keeping a full Argon2 hash off every worker's startup
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        hasher = get_password_hasher()
+        if hasher.current_hasher.check_needs_rehash(PRECOMPUTED_DUMMY_HASH):
+            _dummy_hash = hasher.hash(DUMMY_PASSWORD)
+        else:
+            _dummy_hash = PRECOMPUTED_DUMMY_HASH
+    return _dummy_hash
+
+
+def verify_dummy_secret(password: str) -> bool:
+    """
+    Burn one verification on the dummy hash, always False
+    """
+    verify_secret(password, get_dummy_hash())
+    return False
+
+
+def _warm_up() -> None:
+    get_dummy_hash()
+
+
+class HashingExecutor:
+    """
+    Dedicated bounded pool for password hashing
+
+    Argon2 is memory hard, every running hash holds its full memory cost,
+    so concurrency is capped at max_workers and at most max_waiting calls
+    may queue behind them. Anything beyond that is rejected immediately
+    instead of growing memory and latency without bound. Keeping hashing
+    off the default executor stops login bursts from starving every other
+    asyncio.to_thread caller
+
+    The process backend runs hashes in spawned worker processes that build
+    their own hasher from the API's Argon2 parameters, spreading work over
+    every core regardless of how much of Argon2 holds the GIL. Only module
+    level functions such as hash_secret can be submitted to it
+    """
+    def __init__(
+        self,
+        max_workers: int,
+        max_waiting: int,
+        backend: HashingBackend = "thread",
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_waiting = max_waiting
+        self.backend = backend
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Calls admitted but still waiting for a worker
+        """
+        return max(self._in_flight - self.max_workers, 0)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers = self.max_workers,
+                    mp_context = multiprocessing.get_context("spawn"),
+                    initializer = configure_password_hasher,
+                    initargs = (Argon2Params.from_settings(), ),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers = self.max_workers,
+                    thread_name_prefix = "hashing",
+                )
+        return self._executor
+
+    async def start(self) -> None:
+        """
+        Create the pool ahead of the first request
+
+        Worker processes are started and initialized here so the first
+        logins after a deploy do not pay for spawning them
+        """
+        executor = self._get_executor()
+        if self.backend != "process":
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor,
+                                     _warm_up)
+                for _ in range(self.max_workers)
+            )
+        )
+        logger.info("hashing_pool_started", workers = self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing call on the pool, or fail fast when it is saturated
+
+        Raises:
+            HashingCapacityExceeded: If every worker and queue slot is taken
+            HashingUnavailable: If a worker process died, the next call
+                gets a fresh pool
+        """
+        if self._in_flight >= self.max_workers + self.max_waiting:
+            self._rejected += 1
+            logger.warning(
+                "hashing_capacity_exceeded",
+                in_flight = self._in_flight,
+                rejected = self._rejected,
+            )
+            raise HashingCapacityExceeded(
+                retry_after = settings.HASHING_RETRY_AFTER_SECONDS
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+            self._in_flight += 1
+            # Registered before wrap_future's own callback, so the slot is
+            # released before the awaiting task resumes
+            future.add_done_callback(
+                functools.partial(
+                    self._on_done,
+                    loop,
+                    time.perf_counter(),
+                )
+            )
+            return await asyncio.wrap_future(future)
+        except BrokenExecutor as e:
+            if self._executor is executor:
+                self.shutdown()
+            logger.error("hashing_pool_broken", error = str(e))
+            raise HashingUnavailable(
+                retry_after = settings.HASHING_RETRY_AFTER_SECONDS
+            ) from e
+
+    def _on_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        started: float,
+        _future: Future[Any],
+    ) -> None:
+        """
+        Release the slot once the pool is done with the call
+
+        Runs on the pool's thread. A caller cancelled mid hash does not
+        stop the hash, so its slot stays taken until the work really ends
+        """
+        elapsed = time.perf_counter() - started
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._finish, elapsed)
+
+    def _finish(self, elapsed: float) -> None:
+        self._in_flight -= 1
+        self._completed += 1
+        self._latency_sum += elapsed
+        self._latency_max = max(self._latency_max, elapsed)
+
+    def stats(self) -> HashingStats:
+        """
+        Snapshot of pool utilization, latency includes queue wait
+        """
+        return HashingStats(
+            backend = self.backend,
+            max_workers = self.max_workers,
+            max_waiting = self.max_waiting,
+            in_flight = self._in_flight,
+            queue_depth = self.queue_depth,
+            completed = self._completed,
+            rejected = self._rejected,
+            latency_seconds_sum = self._latency_sum,
+            latency_seconds_max = self._latency_max,
+        )
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers, queued calls still finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait = False)
+            self._executor = None
+
+
+hashing_executor = HashingExecutor(
+    max_workers = settings.HASHING_MAX_WORKERS,
+    max_waiting = settings.HASHING_MAX_WAITING,
+    backend = settings.HASHING_BACKEND,
+)
@@ -7,7 +7,6 @@ from fastapi import (
     APIRouter,
     status,
 )
-import redis.asyncio as redis
 from sqlalchemy import text
 
 from config import (
@@ -19,6 +18,9 @@ from .common_schemas import (
     HealthDetailedResponse,
 )
 from .database import sessionmanager
+from .dependencies import RedisClient
+from .hashing import hashing_executor
+from .redis_pool import redis_manager
 
 
 router = APIRouter(tags = ["health"])
@@ -45,7 +47,9 @@ async def health_check() -> HealthResponse:
     response_model = HealthDetailedResponse,
     status_code = status.HTTP_200_OK,
 )
-async def health_check_detailed() -> HealthDetailedResponse:
+async def health_check_detailed(
+    redis_client: RedisClient,
+) -> HealthDetailedResponse:
     """
     Detailed health check including database connectivity
     """
@@ -59,12 +63,10 @@ async def health_check_detailed() -> HealthDetailedResponse:
     except Exception:
         db_status = HealthStatus.UNHEALTHY
 
-    if settings.REDIS_URL:
+    if redis_client is not None:
         try:
-            r = redis.from_url(str(settings.REDIS_URL))
-            await r.ping()
+            await redis_client.ping()
             redis_status = HealthStatus.HEALTHY
-            await r.close()
         except Exception:
             redis_status = HealthStatus.UNHEALTHY
 
@@ -75,5 +77,8 @@ async def health_check_detailed() -> HealthDetailedResponse:
         environment = settings.ENVIRONMENT.value,
         version = settings.APP_VERSION,
         database = db_status,
+        database_pool = sessionmanager.stats(),
         redis = redis_status,
+        redis_pool = redis_manager.stats(),
+        hashing = hashing_executor.stats(),
     )
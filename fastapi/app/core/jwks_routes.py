@@ -0,0 +1,33 @@
+"""
+ⒸAngelaMos | 2026
+jwks_routes.py
+"""
+
+from fastapi import (
+    APIRouter,
+    Response,
+    status,
+)
+
+from config import settings
+from .common_schemas import JWKSResponse
+from .jwt_keys import get_key_ring
+
+
+router = APIRouter(tags = ["auth"])
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    response_model = JWKSResponse,
+    response_model_exclude_none = True,
+    status_code = status.HTTP_200_OK,
+)
+async def jwks(response: Response) -> JWKSResponse:
+    """
+    Public keys that verify access tokens, empty for HMAC signing
+    """
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.JWKS_CACHE_SECONDS}"
+    )
+    return JWKSResponse.model_validate(get_key_ring().jwks())
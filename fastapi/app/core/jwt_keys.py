@@ -0,0 +1,201 @@
+"""
+ⒸAngelaMos | 2026
+jwt_keys.py
+"""
+
+import base64
+import hashlib
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Self
+
+import jwt
+from jwt.types import Options
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from config import settings
+
+
+SYMMETRIC_ALGORITHMS = frozenset({"HS256", "HS384", "HS512"})
+
+PublicKey = ed25519.Ed25519PublicKey | ec.EllipticCurvePublicKey
+
+THUMBPRINT_MEMBERS = {
+    "OKP": ("crv",
+            "kty",
+            "x"),
+    "EC": ("crv",
+           "kty",
+           "x",
+           "y"),
+}
+
+
+def _algorithm_for(public_key: PublicKey) -> str:
+    """
+    JWS algorithm matching a public key type
+    """
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+            public_key.curve, ec.SECP256R1):
+        return "ES256"
+    raise ValueError("Only Ed25519 and P-256 keys are supported")
+
+
+def _public_jwk(
+    public_key: PublicKey,
+    kid: str | None = None,
+) -> dict[str,
+          Any]:
+    """
+    Public JWK of a key, with its RFC 7638 thumbprint as kid by default
+    """
+    algorithm = _algorithm_for(public_key)
+    jwk: dict[str, Any] = jwt.get_algorithm_by_name(algorithm).to_jwk(
+        public_key,
+        as_dict = True,
+    )
+    if kid is None:
+        members = {
+            name: jwk[name]
+            for name in THUMBPRINT_MEMBERS[jwk["kty"]]
+        }
+        digest = hashlib.sha256(
+            json.dumps(members,
+                       separators = (",",
+                                     ":"),
+                       sort_keys = True).encode()
+        ).digest()
+        kid = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    return {
+        **jwk,
+        "kid": kid,
+        "alg": algorithm,
+        "use": "sig",
+    }
+
+
+class KeyRing:
+    """
+    Signing key plus every key access tokens may be verified with
+
+    HMAC rings sign and verify with SECRET_KEY and publish nothing.
+    Asymmetric rings sign with one private key and accept tokens from it
+    and any retired public keys, selected by the kid header, so keys can
+    be rotated without invalidating tokens that are still live. Their
+    public halves are published as a JWKS for other services
+    """
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key: str,
+        key_id: str | None = None,
+        verification_keys: Mapping[str,
+                                   str] | None = None,
+    ) -> None:
+        self.algorithm = algorithm
+        self._signing_key: Any = signing_key
+        self._keys: dict[str, tuple[str, Any]] = {}
+        self._jwks: list[dict[str, Any]] = []
+
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            self.key_id = key_id
+            return
+
+        private_key = load_pem_private_key(signing_key.encode(), None)
+        public_key = private_key.public_key()
+        if not isinstance(public_key, PublicKey):
+            raise ValueError("Only Ed25519 and P-256 keys are supported")
+        if _algorithm_for(public_key) != algorithm:
+            raise ValueError(f"JWT_PRIVATE_KEY is not a {algorithm} key")
+
+        current = _public_jwk(public_key, key_id)
+        self.key_id = current["kid"]
+        self._signing_key = private_key
+        self._keys[current["kid"]] = (algorithm, public_key)
+        self._jwks.append(current)
+
+        for kid, pem in (verification_keys or {}).items():
+            retired = load_pem_public_key(pem.encode())
+            if not isinstance(retired, PublicKey):
+                raise ValueError(f"Unsupported verification key {kid}")
+            self._keys[kid] = (_algorithm_for(retired), retired)
+            self._jwks.append(_public_jwk(retired, kid))
+
+    @classmethod
+    def from_settings(cls) -> Self:
+        if settings.JWT_ALGORITHM in SYMMETRIC_ALGORITHMS:
+            return cls(
+                settings.JWT_ALGORITHM,
+                settings.SECRET_KEY.get_secret_value(),
+                settings.JWT_KEY_ID,
+            )
+        if settings.JWT_PRIVATE_KEY is None:
+            raise ValueError("JWT_PRIVATE_KEY is not configured")
+        return cls(
+            settings.JWT_ALGORITHM,
+            settings.JWT_PRIVATE_KEY.get_secret_value(),
+            settings.JWT_KEY_ID,
+            settings.JWT_VERIFICATION_KEYS,
+        )
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        """
+        Sign a payload with the current key, tagged with its kid
+        """
+        return jwt.encode(
+            payload,
+            self._signing_key,
+            algorithm = self.algorithm,
+            headers = {"kid": self.key_id} if self.key_id else None,
+        )
+
+    def decode(
+        self,
+        token: str,
+        options: Options | None = None,
+    ) -> dict[str, Any]:
+        """
+        Verify a token against the key its kid names
+
+        Raises:
+            jwt.InvalidTokenError: If the key is unknown or verification fails
+        """
+        if self.algorithm in SYMMETRIC_ALGORITHMS:
+            return jwt.decode(
+                token,
+                self._signing_key,
+                algorithms = [self.algorithm],
+                options = options,
+            )
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid not in self._keys:
+            raise jwt.InvalidSignatureError("Unknown signing key")
+        algorithm, public_key = self._keys[kid]
+        return jwt.decode(
+            token,
+            public_key,
+            algorithms = [algorithm],
+            options = options,
+        )
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Public verification keys as a JSON Web Key Set
+        """
+        return {"keys": list(self._jwks)}
+
+
+@lru_cache
+def get_key_ring() -> KeyRing:
+    """
+    Key ring built once from settings
+    """
+    return KeyRing.from_settings()
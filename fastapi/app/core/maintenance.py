@@ -0,0 +1,121 @@
+"""
+ⒸAngelaMos | 2026
+maintenance.py
+"""
+
+import asyncio
+import contextlib
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Mapping,
+)
+
+from sqlalchemy import text
+
+from .database import sessionmanager
+from .logging import get_logger
+
+
+logger = get_logger(__name__)
+
+MaintenanceJob = Callable[[], Awaitable[int]]
+
+TRY_ADVISORY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+@contextlib.asynccontextmanager
+async def leader_lock(key: int) -> AsyncIterator[bool]:
+    """
+    Transaction scoped advisory lock, yields whether this process won it
+
+    The lock lives on an unpooled connection and is released when the
+    block exits or the connection drops, so a crashed leader never blocks
+    the next election. Jobs still get every pooled connection, even with
+    a one connection pool. Databases without advisory locks always win
+    """
+    async with sessionmanager.unpooled_connect() as connection:
+        if connection.dialect.name != "postgresql":
+            yield True
+            return
+        result = await connection.execute(
+            TRY_ADVISORY_LOCK_SQL,
+            {"key": key},
+        )
+        yield bool(result.scalar_one())
+
+
+class MaintenanceScheduler:
+    """
+    Runs maintenance jobs periodically in one process out of many
+
+    Every worker starts a scheduler, each tick they race for an advisory
+    lock and only the winner runs the jobs. Jobs are idempotent so a
+    tick that runs right after another worker's finishes only costs an
+    empty indexed lookup
+    """
+    def __init__(
+        self,
+        jobs: Mapping[str,
+                      MaintenanceJob],
+        interval_seconds: float,
+        lock_key: int,
+    ) -> None:
+        self.jobs = jobs
+        self.interval_seconds = interval_seconds
+        self.lock_key = lock_key
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> dict[str, int] | None:
+        """
+        Run every job if elected, None when another process holds the lock
+
+        A failing job is logged and does not stop the remaining ones
+        """
+        async with leader_lock(self.lock_key) as leader:
+            if not leader:
+                logger.debug("maintenance_skipped_not_leader")
+                return None
+
+            results: dict[str, int] = {}
+            for name, job in self.jobs.items():
+                try:
+                    results[name] = await job()
+                except Exception:
+                    logger.exception("maintenance_job_failed", job = name)
+                    continue
+                logger.info(
+                    "maintenance_job_finished",
+                    job = name,
+                    affected = results[name],
+                )
+            return results
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("maintenance_run_failed")
+
+    def start(self) -> None:
+        """
+        Schedule the loop on the running event loop
+
+        The first run happens after one interval so startup stays fast
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """
+        Cancel the loop and wait for it to unwind
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
@@ -3,12 +3,400 @@
 rate_limit.py
 """
 
+import asyncio
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
 import jwt
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from starlette.requests import Request
+import redis.asyncio as redis
+from fastapi import Request, Response
 
 from config import settings
+from .exceptions import RateLimitExceeded
+from .logging import get_logger
+from .redis_pool import StrRedis, get_redis_client
+from .security import decode_access_token
+
+
+logger = get_logger(__name__)
+
+WINDOW_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+LIMIT_RE = re.compile(
+    r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$"
+)
+
+REDIS_RETRY_SECONDS = 5.0
+FALLBACK_BUSY_RETRY_SECONDS = 1
+PRUNE_EVERY_HITS = 1000
+
+SLIDING_WINDOW_SCRIPT = """
+local n = #KEYS / 2
+local counts = {}
+local allowed = 1
+for i = 1, n do
+    local previous = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local current = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    counts[2 * i - 1] = previous
+    counts[2 * i] = current
+    local weight = tonumber(ARGV[3 * i - 2])
+    if previous * weight + current + 1 > tonumber(ARGV[3 * i - 1]) then
+        allowed = 0
+    end
+end
+if allowed == 1 then
+    for i = 1, n do
+        counts[2 * i] = redis.call('INCR', KEYS[2 * i])
+        redis.call('EXPIRE', KEYS[2 * i], ARGV[3 * i])
+    end
+end
+table.insert(counts, 1, allowed)
+return counts
+"""
+
+
+class RateLimitItem(NamedTuple):
+    """
+    At most amount requests per window_seconds
+    """
+    amount: int
+    window_seconds: int
+
+
+class Window(NamedTuple):
+    """
+    One limit's counters for the current hit
+    """
+    limit: RateLimitItem
+    previous_key: str
+    current_key: str
+    weight: float
+
+
+class RateLimitResult(NamedTuple):
+    """
+    Outcome of a hit, reported against the tightest limit
+    """
+    allowed: bool
+    limit: RateLimitItem
+    remaining: int
+    reset_after: int
+
+
+def parse_limits(spec: str) -> tuple[RateLimitItem, ...]:
+    """
+    Parse limits such as "20/minute" or "5 per second; 100/hour"
+    """
+    limits = []
+    for part in re.split(r"[;,]", spec):
+        if not part.strip():
+            continue
+        match = LIMIT_RE.match(part)
+        if match is None or int(match[1]) < 1:
+            raise ValueError(f"Invalid rate limit: {part!r}")
+        amount, multiple, unit = match.groups()
+        limits.append(
+            RateLimitItem(
+                int(amount),
+                int(multiple or 1) * WINDOW_SECONDS[unit],
+            )
+        )
+    return tuple(limits)
+
+
+def _windows(
+    key: str,
+    limits: Sequence[RateLimitItem],
+    now: float,
+) -> list[Window]:
+    windows = []
+    for limit in limits:
+        bucket, elapsed = divmod(now, limit.window_seconds)
+        prefix = f"ratelimit:{key}:{limit.window_seconds}"
+        windows.append(
+            Window(
+                limit = limit,
+                previous_key = f"{prefix}:{int(bucket) - 1}",
+                current_key = f"{prefix}:{int(bucket)}",
+                weight = 1 - elapsed / limit.window_seconds,
+            )
+        )
+    return windows
+
+
+def _retry_after(
+    limit: RateLimitItem,
+    previous: int,
+    current: int,
+    now: float,
+) -> float:
+    """
+    Seconds until one more request fits under a sliding window limit
+    """
+    window = limit.window_seconds
+    elapsed = now % window
+    if current + 1 <= limit.amount:
+        needed = window * (1 - (limit.amount - current - 1) / previous)
+        return max(needed - elapsed, 0.0)
+    rollover = window - elapsed
+    return rollover + window * (1 - (limit.amount - 1) / current)
+
+
+def _result(
+    windows: Sequence[Window],
+    counts: Sequence[tuple[int,
+                           int]],
+    allowed: bool,
+    now: float,
+) -> RateLimitResult:
+    """
+    Summarize a hit as the limit with the least budget left
+    """
+    results = []
+    for window, (previous, current) in zip(windows, counts, strict = True):
+        limit = window.limit
+        used = previous * window.weight + current
+        blocking = not allowed and used + 1 > limit.amount
+        if blocking:
+            reset_after = _retry_after(limit, previous, current, now)
+        else:
+            reset_after = limit.window_seconds - now % limit.window_seconds
+        results.append((
+            blocking,
+            RateLimitResult(
+                allowed = allowed,
+                limit = limit,
+                remaining = max(math.floor(limit.amount - used), 0),
+                reset_after = math.ceil(reset_after),
+            ),
+        ))
+    if allowed:
+        return min((r for _, r in results), key = lambda r: r.remaining)
+    return max(results, key = lambda pair: (pair[0], pair[1].reset_after))[1]
+
+
+class SharedWindowStore:
+    """
+    Sliding window counters in a SQLite file shared by a host's workers
+
+    Used when Redis is unset or unreachable. The file lives on tmpfs by
+    default so it is effectively shared memory, and every check runs in
+    one immediate transaction, so all workers on the host enforce a
+    single budget instead of one each. Connections are opened lazily per
+    process so forked workers never share one
+
+    Calls block on the file lock, so the limiter runs them in a thread,
+    and a lock serializes the threads of one process on its connection
+    """
+    def __init__(self, path: Path, busy_timeout: float = 1.0) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+        self._hits = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout = self.busy_timeout,
+                isolation_level = None,
+                check_same_thread = False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_counters ("
+                "key TEXT PRIMARY KEY, "
+                "count INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def hit(
+        self,
+        windows: Sequence[Window],
+        now: float,
+    ) -> tuple[bool,
+               list[tuple[int,
+                          int]]]:
+        """
+        Count a hit against every window if all of them have room
+        """
+        with self._lock:
+            return self._hit(windows, now)
+
+    def _hit(
+        self,
+        windows: Sequence[Window],
+        now: float,
+    ) -> tuple[bool,
+               list[tuple[int,
+                          int]]]:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            counts = [
+                (
+                    self._count(connection,
+                                window.previous_key,
+                                now),
+                    self._count(connection,
+                                window.current_key,
+                                now),
+                ) for window in windows
+            ]
+            allowed = all(
+                previous * window.weight + current + 1 <= window.limit.amount
+                for window, (previous, current) in zip(windows, counts, strict = True)
+            )
+            if allowed:
+                for window in windows:
+                    connection.execute(
+                        "INSERT INTO rate_limit_counters VALUES (?, 1, ?) "
+                        "ON CONFLICT (key) DO UPDATE SET count = count + 1",
+                        (
+                            window.current_key,
+                            now + 2 * window.limit.window_seconds,
+                        ),
+                    )
+                counts = [
+                    (previous, current + 1) for previous, current in counts
+                ]
+            self._hits += 1
+            if self._hits % PRUNE_EVERY_HITS == 0:
+                connection.execute(
+                    "DELETE FROM rate_limit_counters WHERE expires_at <= ?",
+                    (now, ),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed, counts
+
+    @staticmethod
+    def _count(connection: sqlite3.Connection, key: str, now: float) -> int:
+        row = connection.execute(
+            "SELECT count FROM rate_limit_counters "
+            "WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def reset(self) -> None:
+        """
+        Drop every counter
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM rate_limit_counters")
+
+
+class RateLimiter:
+    """
+    Sliding window rate limiter shared by every worker
+
+    Each check is one atomic Lua call on the pooled Redis client that
+    covers every limit of the route, a request only counts when all of
+    them have room. When Redis is unset or failing, checks go to the
+    host wide SharedWindowStore and Redis is retried after a short pause
+
+    If the store is locked past its busy timeout or otherwise failing,
+    the request is refused with a short Retry-After rather than let
+    through, so a Redis outage under load never lifts the login limits
+    """
+    def __init__(self, fallback: SharedWindowStore) -> None:
+        self.fallback = fallback
+        self._script: Any = None
+        self._script_client: StrRedis | None = None
+        self._redis_retry_at = 0.0
+
+    async def _hit_redis(
+        self,
+        client: StrRedis,
+        windows: Sequence[Window],
+    ) -> tuple[bool,
+               list[tuple[int,
+                          int]]]:
+        if self._script_client is not client:
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = client
+        keys = []
+        args: list[float | int] = []
+        for window in windows:
+            keys += [window.previous_key, window.current_key]
+            args += [
+                window.weight,
+                window.limit.amount,
+                2 * window.limit.window_seconds,
+            ]
+        allowed, *counts = await self._script(keys = keys, args = args)
+        return bool(allowed), [
+            (int(counts[i]), int(counts[i + 1]))
+            for i in range(0, len(counts), 2)
+        ]
+
+    async def hit(
+        self,
+        key: str,
+        limits: Sequence[RateLimitItem],
+    ) -> RateLimitResult:
+        """
+        Count one request for key against every limit
+        """
+        now = time.time()
+        windows = _windows(key, limits, now)
+
+        client = get_redis_client()
+        if client is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                allowed, counts = await self._hit_redis(client, windows)
+                return _result(windows, counts, allowed, now)
+            except redis.RedisError as e:
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("rate_limit_redis_failed", error = str(e))
+
+        try:
+            allowed, counts = await asyncio.to_thread(
+                self.fallback.hit,
+                windows,
+                now,
+            )
+        except sqlite3.Error as e:
+            logger.warning("rate_limit_fallback_failed", error = str(e))
+            return RateLimitResult(
+                allowed = False,
+                limit = min(limits, key = lambda limit: limit.amount),
+                remaining = 0,
+                reset_after = FALLBACK_BUSY_RETRY_SECONDS,
+            )
+        return _result(windows, counts, allowed, now)
+
+    def reset(self) -> None:
+        """
+        Drop every local counter
+        """
+        self.fallback.reset()
+
+
+rate_limiter = RateLimiter(
+    SharedWindowStore(settings.RATE_LIMIT_FALLBACK_PATH)
+)
 
 
 def get_identifier(request: Request) -> str:
@@ -17,28 +405,47 @@ def get_identifier(request: Request) -> str:
 
     Uses user ID if authenticated, otherwise falls back to IP address
     (Will add more fingerprinting if needed depending on project)
+
+    The token goes through the same verified decode cache as the auth
+    dependency, so it is usually a cache hit and a forged sub cannot
+    spend another user's budget
     """
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
         try:
             token = auth_header.split(" ")[1]
-            payload = jwt.decode(
-                token,
-                options = {"verify_signature": False},
-            )
+            payload = decode_access_token(token)
             user_id = payload.get("sub")
             if user_id:
                 return f"user:{user_id}"
-        except Exception:
+        except (IndexError, jwt.InvalidTokenError):
             pass
 
-    return get_remote_address(request)
+    return request.client.host if request.client else "127.0.0.1"
 
 
-limiter = Limiter(
-    key_func = get_identifier,
-    storage_uri = str(settings.REDIS_URL) if settings.REDIS_URL else None,
-    default_limits = [settings.RATE_LIMIT_DEFAULT],
-    headers_enabled = True,
-    in_memory_fallback_enabled = True,
-)
+class RateLimit:
+    """
+    Dependency enforcing request limits per client on a route
+
+    Limits with several windows, such as "5/second;100/hour", are
+    checked together in one round trip
+    """
+    def __init__(
+        self,
+        scope: str,
+        spec: str = settings.RATE_LIMIT_DEFAULT,
+    ) -> None:
+        self.scope = scope
+        self.limits = parse_limits(spec)
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        result = await rate_limiter.hit(
+            f"{self.scope}:{get_identifier(request)}",
+            self.limits,
+        )
+        if not result.allowed:
+            raise RateLimitExceeded(retry_after = result.reset_after)
+        response.headers["X-RateLimit-Limit"] = str(result.limit.amount)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(result.reset_after)
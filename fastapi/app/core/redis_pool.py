@@ -0,0 +1,121 @@
+"""
+ⒸAngelaMos | 2026
+redis_pool.py
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import redis.asyncio as redis
+
+from config import settings
+from .common_schemas import RedisPoolStats
+from .logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# The pool decodes responses, so every client speaks str. redis-py's
+# classes are only generic in the type stubs
+if TYPE_CHECKING:
+    StrRedis = redis.Redis[str]
+    StrPool = redis.BlockingConnectionPool[redis.Connection]
+else:
+    StrRedis = redis.Redis
+    StrPool = redis.BlockingConnectionPool
+
+
+def _pool_counts(pool: Any) -> tuple[int, int] | None:
+    """
+    (idle, in use) connection counts read from redis-py's pool internals
+
+    Those attributes are private and may change in any release, None
+    when they are missing
+    """
+    available = getattr(pool, "_available_connections", None)
+    in_use = getattr(pool, "_in_use_connections", None)
+    if available is None or in_use is None:
+        return None
+    return len(available), len(in_use)
+
+
+class RedisConnectionManager:
+    """
+    Process wide Redis connection pool owned by the app lifespan
+
+    Health checks, rate limiting, revocation and the cache tiers all
+    borrow connections from this one bounded pool instead of opening
+    their own. When every connection is busy callers wait up to
+    REDIS_POOL_TIMEOUT for one to be released rather than opening more
+    """
+    def __init__(self) -> None:
+        self._pool: StrPool | None = None
+        self._client: StrRedis | None = None
+
+    def init(self, redis_url: str) -> None:
+        """
+        Create the pool, connections are opened on first use
+        """
+        self._pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections = settings.REDIS_POOL_MAX_CONNECTIONS,
+            timeout = settings.REDIS_POOL_TIMEOUT,
+            socket_timeout = settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout = settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval = settings.REDIS_HEALTH_CHECK_INTERVAL,
+            decode_responses = True,
+        )
+        self._client = redis.Redis(
+            connection_pool = self._pool,
+            decode_responses = True,
+        )
+        logger.info(
+            "redis_pool_started",
+            max_connections = settings.REDIS_POOL_MAX_CONNECTIONS,
+        )
+
+    async def close(self) -> None:
+        """
+        Close every pooled connection
+
+        The client holds no connection of its own, they all live in the pool
+        """
+        self._client = None
+        if self._pool is not None:
+            await self._pool.disconnect()
+            self._pool = None
+
+    @property
+    def client(self) -> StrRedis | None:
+        """
+        Client on the shared pool, None when Redis is not configured
+        """
+        return self._client
+
+    def stats(self) -> RedisPoolStats | None:
+        """
+        Snapshot of pool utilization for this worker
+        """
+        if self._pool is None:
+            return None
+        counts = _pool_counts(self._pool)
+        if counts is None:
+            return RedisPoolStats(max_connections = self._pool.max_connections)
+        idle, in_use = counts
+        return RedisPoolStats(
+            max_connections = self._pool.max_connections,
+            open_connections = idle + in_use,
+            in_use = in_use,
+            idle = idle,
+        )
+
+
+redis_manager = RedisConnectionManager()
+
+
+def get_redis_client() -> StrRedis | None:
+    """
+    Shared Redis client, None when REDIS_URL is unset
+
+    Also the FastAPI dependency behind RedisClient
+    """
+    return redis_manager.client
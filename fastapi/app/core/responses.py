@@ -43,3 +43,21 @@ CONFLICT_409: dict[int | str,
                                 "description": "Resource conflict"
                             },
                         }
+
+RATE_LIMITED_429: dict[int | str,
+                       dict[str,
+                            Any]] = {
+                                429: {
+                                    "model": ErrorDetail,
+                                    "description": "Rate limited, see Retry-After"
+                                },
+                            }
+
+UNAVAILABLE_503: dict[int | str,
+                      dict[str,
+                           Any]] = {
+                               503: {
+                                   "model": ErrorDetail,
+                                   "description": "Overloaded, see Retry-After"
+                               },
+                           }
@@ -0,0 +1,194 @@
+"""
+ⒸAngelaMos | 2026
+revocation.py
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from .database import run_after_commit
+from .logging import get_logger
+from .redis_pool import StrRedis, get_redis_client
+
+
+logger = get_logger(__name__)
+
+SET_MAX_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if current == nil or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+return 1
+"""
+
+
+class RevocationStore(ABC):
+    """
+    Where token versions and revoked refresh token families are checked
+
+    A known token version is the lowest version a user's tokens may carry,
+    None means the store has no opinion and the database rows decide
+    """
+    @abstractmethod
+    async def token_version(self, user_id: UUID) -> int | None:
+        """
+        Lowest token version still accepted for a user, None if unknown
+        """
+
+    @abstractmethod
+    async def set_token_version(self, user_id: UUID, version: int) -> None:
+        """
+        Raise the lowest accepted token version for a user
+        """
+
+    @abstractmethod
+    async def is_family_revoked(self, family_id: UUID) -> bool:
+        """
+        Whether a refresh token family was revoked
+        """
+
+    @abstractmethod
+    async def revoke_family(self, family_id: UUID) -> None:
+        """
+        Mark a refresh token family revoked
+        """
+
+
+class PostgresRevocationStore(RevocationStore):
+    """
+    Revocation recorded only in users.token_version and refresh_tokens
+
+    Those rows are already written by the repositories and read by the
+    principal cache and the rotate statement, so this store has nothing
+    of its own to hold
+    """
+    async def token_version(self, _user_id: UUID) -> int | None:
+        return None
+
+    async def set_token_version(self, _user_id: UUID, _version: int) -> None:
+        return None
+
+    async def is_family_revoked(self, _family_id: UUID) -> bool:
+        return False
+
+    async def revoke_family(self, _family_id: UUID) -> None:
+        return None
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Revocation state mirrored in Redis with refresh token lifetime TTLs
+
+    Access token checks read one key instead of the user row, and refresh
+    rotation sees families revoked by a concurrent replay even when that
+    transaction has not committed yet. Versions only move forward so
+    out of order write throughs cannot resurrect revoked tokens. Redis
+    failures fall back to the database rows
+    """
+    def __init__(
+        self,
+        ttl_seconds: int,
+        client: Callable[[],
+                         StrRedis | None] = get_redis_client,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._client = client
+        self._set_max: Any = None
+        self._set_max_client: StrRedis | None = None
+
+    async def token_version(self, user_id: UUID) -> int | None:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(f"revocation:version:{user_id}")
+        except redis.RedisError as e:
+            logger.warning("revocation_get_failed", error = str(e))
+            return None
+        return int(raw) if raw is not None else None
+
+    async def set_token_version(self, user_id: UUID, version: int) -> None:
+        client = self._client()
+        if client is None:
+            return
+        if self._set_max_client is not client:
+            self._set_max = client.register_script(SET_MAX_SCRIPT)
+            self._set_max_client = client
+        try:
+            await self._set_max(
+                keys = [f"revocation:version:{user_id}"],
+                args = [version, self.ttl_seconds],
+            )
+        except redis.RedisError as e:
+            logger.warning("revocation_set_failed", error = str(e))
+
+    async def is_family_revoked(self, family_id: UUID) -> bool:
+        client = self._client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.exists(f"revocation:family:{family_id}"))
+        except redis.RedisError as e:
+            logger.warning("revocation_get_failed", error = str(e))
+            return False
+
+    async def revoke_family(self, family_id: UUID) -> None:
+        client = self._client()
+        if client is None:
+            return
+        try:
+            await client.set(
+                f"revocation:family:{family_id}",
+                1,
+                ex = self.ttl_seconds,
+            )
+        except redis.RedisError as e:
+            logger.warning("revocation_set_failed", error = str(e))
+
+
+def create_revocation_store() -> RevocationStore:
+    """
+    Store selected by REVOCATION_BACKEND
+    """
+    if settings.REVOCATION_BACKEND == "redis":
+        return RedisRevocationStore(
+            ttl_seconds = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        )
+    return PostgresRevocationStore()
+
+
+revocation_store = create_revocation_store()
+
+
+def record_token_version(
+    session: AsyncSession,
+    user_id: UUID,
+    version: int,
+) -> None:
+    """
+    Write a bumped token version through once the session commits
+
+    Writing earlier would reject the user's current tokens for good if
+    the bump were rolled back
+    """
+    async def write_through() -> None:
+        await revocation_store.set_token_version(user_id, version)
+
+    run_after_commit(session, write_through)
+
+
+async def record_family_revoked(family_id: UUID) -> None:
+    """
+    Write a revoked family through before the session commits
+
+    Revoking is conservative so the early write is safe even if the
+    transaction rolls back, and it lets a concurrent rotation of the same
+    family see the revocation
+    """
+    await revocation_store.revoke_family(family_id)
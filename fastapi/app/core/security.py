@@ -3,9 +3,9 @@
 security.py
 """
 
-import asyncio
 import hashlib
 import secrets
+import time
 from datetime import (
     UTC,
     datetime,
@@ -14,28 +14,37 @@ from datetime import (
 from typing import Any
 from uuid import UUID
 
-import jwt
 from fastapi import Response
-from pwdlib import PasswordHash
 
 from config import (
     API_PREFIX,
     settings,
     TokenType,
 )
+from .cache import LocalLRU
+from .jwt_keys import get_key_ring
+from .hashing import (
+    hash_secret,
+    hashing_executor,
+    verify_and_update_secret,
+    verify_dummy_secret,
+)
 
 
-password_hasher = PasswordHash.recommended()
+access_token_cache: LocalLRU[dict[str, Any]] = LocalLRU(
+    max_entries = settings.ACCESS_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 
 async def hash_password(password: str) -> str:
     """
     Hash password using Argon2id
 
-    Runs in thread pool to avoid blocking the async event loop
-    since Argon2 is CPU intensive by design
+    Runs on the bounded hashing pool to avoid blocking the async event
+    loop since Argon2 is CPU and memory intensive by design
     """
-    return await asyncio.to_thread(password_hasher.hash, password)
+    return await hashing_executor.run(hash_secret, password)
 
 
 async def verify_password(plain_password: str,
@@ -48,19 +57,11 @@ async def verify_password(plain_password: str,
         Tuple of (is_valid, new_hash_if_needs_rehash)
         If password is valid but hash params are outdated, returns new hash
     """
-    try:
-        return await asyncio.to_thread(
-            password_hasher.verify_and_update,
-            plain_password,
-            hashed_password
-        )
-    except Exception:
-        return False, None
-
-
-DUMMY_HASH = password_hasher.hash(
-    "dummy_password_for_timing_attack_prevention"
-)
+    return await hashing_executor.run(
+        verify_and_update_secret,
+        plain_password,
+        hashed_password
+    )
 
 
 async def verify_password_with_timing_safety(
@@ -75,11 +76,7 @@ async def verify_password_with_timing_safety(
     hash operation to prevent timing attacks
     """
     if hashed_password is None:
-        await asyncio.to_thread(
-            password_hasher.verify,
-            plain_password,
-            DUMMY_HASH
-        )
+        await hashing_executor.run(verify_dummy_secret, plain_password)
         return False, None
     return await verify_password(plain_password, hashed_password)
 
@@ -105,28 +102,22 @@ def create_access_token(
     if extra_claims:
         payload.update(extra_claims)
 
-    return jwt.encode(
-        payload,
-        settings.SECRET_KEY.get_secret_value(),
-        algorithm = settings.JWT_ALGORITHM,
-    )
+    return get_key_ring().encode(payload)
 
 
-def create_refresh_token(
-    user_id: UUID,
-    family_id: UUID,
-) -> tuple[str,
-           str,
-           datetime]:
+def create_refresh_token() -> tuple[str, bytes, datetime]:
     """
     Create a long lived refresh token
 
+    The token is opaque, its user and family live only in the database
+    row, so it can be minted before the row it rotates is known
+
     Returns:
         Tuple of (raw_token, token_hash, expires_at)
         Raw token is sent to client, hash is stored in database
     """
     raw_token = secrets.token_urlsafe(32)
-    token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+    token_hash = hash_token(raw_token)
     expires_at = datetime.now(UTC) + timedelta(
         days = settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
@@ -138,13 +129,20 @@ def decode_access_token(token: str) -> dict[str, Any]:
     """
     Decode and validate an access token
 
+    Verified payloads are cached by token digest until their exp, so a
+    token reused across requests is verified once per worker. Failed
+    verifications are never cached
+
     Raises:
         jwt.InvalidTokenError: If token is invalid or expired
     """
-    return jwt.decode(
+    key = hash_token(token).hex()
+    cached = access_token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = get_key_ring().decode(
         token,
-        settings.SECRET_KEY.get_secret_value(),
-        algorithms = [settings.JWT_ALGORITHM],
         options = {
             "require": ["exp",
                         "sub",
@@ -153,13 +151,19 @@ def decode_access_token(token: str) -> dict[str, Any]:
                         "token_version"]
         },
     )
+    remaining = payload["exp"] - time.time()
+    if remaining > 0:
+        access_token_cache.set(key, payload, ttl_seconds = remaining)
+    return payload
 
 
-def hash_token(token: str) -> str:
+def hash_token(token: str) -> bytes:
     """
     Hash a token for secure storage
+
+    The raw 32 byte SHA 256 digest, half the size of its hex form
     """
-    return hashlib.sha256(token.encode()).hexdigest()
+    return hashlib.sha256(token.encode()).digest()
 
 
 def generate_secure_token(nbytes: int = 32) -> str:
@@ -0,0 +1,63 @@
+"""
+ⒸAngelaMos | 2026
+workers.py
+"""
+
+import math
+import os
+from pathlib import Path
+
+from config import settings
+
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_DIR = Path("/sys/fs/cgroup/cpu")
+
+
+def _cgroup_cpu_quota() -> float | None:
+    """
+    CPUs granted by the cgroup CFS quota, None when unlimited or unknown
+    """
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+
+        quota_file = CGROUP_V1_CPU_DIR / "cpu.cfs_quota_us"
+        period_file = CGROUP_V1_CPU_DIR / "cpu.cfs_period_us"
+        if quota_file.exists() and period_file.exists():
+            quota_us = int(quota_file.read_text())
+            if quota_us <= 0:
+                return None
+            return quota_us / int(period_file.read_text())
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def available_cpus() -> float:
+    """
+    CPUs this process may use, honoring container quotas and affinity
+
+    os.cpu_count() reports the host's cores, so a 2 CPU container on a
+    large host would otherwise start a worker per host core
+    """
+    try:
+        cpus: float = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return cpus
+
+
+def worker_count() -> int:
+    """
+    SERVER_WORKERS when set, otherwise SERVER_WORKERS_PER_CPU per CPU
+    """
+    if settings.SERVER_WORKERS is not None:
+        return settings.SERVER_WORKERS
+    return max(1, math.ceil(available_cpus() * settings.SERVER_WORKERS_PER_CPU))
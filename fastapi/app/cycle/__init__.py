@@ -4,11 +4,13 @@ __init__.py
 """
 
 from .service import CycleService
+from .timeline import CycleTimeline, build_timeline
 from .schemas import (
     CycleStatus,
     PhaseInfo,
     CalendarDay,
     CalendarMonth,
+    CalendarRange,
     CyclePattern,
     PHASE_TIPS,
 )
@@ -17,10 +19,13 @@ from .routes import router
 
 __all__ = [
     "CycleService",
+    "CycleTimeline",
+    "build_timeline",
     "CycleStatus",
     "PhaseInfo",
     "CalendarDay",
     "CalendarMonth",
+    "CalendarRange",
     "CyclePattern",
     "PHASE_TIPS",
     "CycleServiceDep",
@@ -0,0 +1,180 @@
+"""
+ⒸAngelaMos | 2026
+cache.py
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import date
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from core.cache import TieredCache, VersionCounter
+from core.database import run_after_replication
+from core.enums import CyclePhase
+from . import timeline
+
+if TYPE_CHECKING:
+    from partner.Partner import Partner
+    from period_log.PeriodLog import PeriodLog
+
+
+class CycleState(BaseModel):
+    """
+    Derived cycle state for a partner, independent of the current date
+    """
+    partner_id: UUID
+    user_id: UUID
+    cycle_length: int
+    period_length: int
+    last_period_start: date | None
+    phase_boundaries: list[tuple[CyclePhase, int, int]]
+    average_cycle_length: float
+    cycle_length_range: tuple[int, int]
+    average_period_length: float
+
+    @classmethod
+    def from_partner(
+        cls,
+        partner: Partner,
+        actual_logs: Sequence[PeriodLog],
+    ) -> CycleState:
+        """
+        Build state from a partner and its recent actual period logs
+        """
+        cycle_lengths = [
+            log.cycle_length for log in actual_logs
+            if log.cycle_length is not None
+        ]
+        if cycle_lengths:
+            average_cycle = sum(cycle_lengths) / len(cycle_lengths)
+            cycle_range = (min(cycle_lengths), max(cycle_lengths))
+        else:
+            average_cycle = float(partner.average_cycle_length)
+            cycle_range = (
+                partner.average_cycle_length,
+                partner.average_cycle_length,
+            )
+
+        period_lengths = [
+            (log.end_date - log.start_date).days + 1
+            for log in actual_logs if log.end_date
+        ]
+        average_period = (
+            sum(period_lengths) / len(period_lengths)
+            if period_lengths else float(partner.average_period_length)
+        )
+
+        return cls(
+            partner_id = partner.id,
+            user_id = partner.user_id,
+            cycle_length = partner.average_cycle_length,
+            period_length = partner.average_period_length,
+            last_period_start = partner.last_period_start,
+            phase_boundaries = timeline.phase_boundaries(
+                partner.average_cycle_length
+            ),
+            average_cycle_length = average_cycle,
+            cycle_length_range = cycle_range,
+            average_period_length = average_period,
+        )
+
+
+class CycleStateCache:
+    """
+    Cycle state keyed by partner id and version
+
+    A user to partner index lets the hottest reads resolve state without
+    touching the database. Writes bump the partner version so any state
+    computed from older rows becomes unreachable
+    """
+    def __init__(self) -> None:
+        ttl = settings.CYCLE_CACHE_TTL_SECONDS
+        self._states: TieredCache[CycleState] = TieredCache(
+            namespace = "cycle:state",
+            ttl_seconds = ttl,
+            encode = CycleState.model_dump_json,
+            decode = CycleState.model_validate_json,
+        )
+        self._partners: TieredCache[UUID] = TieredCache(
+            namespace = "cycle:partner",
+            ttl_seconds = ttl,
+            encode = str,
+            decode = UUID,
+        )
+        self._versions = VersionCounter("cycle:version", ttl_seconds = ttl * 2)
+
+    async def get(self, user_id: UUID) -> CycleState | None:
+        """
+        Cached state for a user's partner, None on a miss
+        """
+        partner_id = await self._partners.get(str(user_id))
+        if partner_id is None:
+            return None
+        version = await self._versions.get(str(partner_id))
+        return await self._states.get(f"{partner_id}:{version}")
+
+    async def version(self, partner_id: UUID) -> int:
+        """
+        Version to read before loading the rows a state is built from
+        """
+        return await self._versions.get(str(partner_id))
+
+    async def set(self, state: CycleState, version: int) -> None:
+        """
+        Store state computed under a version
+        """
+        if version < 0:
+            return
+        await self._states.set(f"{state.partner_id}:{version}", state)
+        await self._partners.set(str(state.user_id), state.partner_id)
+
+    async def invalidate(
+        self,
+        partner_id: UUID,
+        user_id: UUID | None = None,
+    ) -> None:
+        """
+        Drop the current state and move the partner to a new version
+        """
+        version = await self._versions.get(str(partner_id))
+        await self._states.delete(f"{partner_id}:{version}")
+        await self._versions.bump(str(partner_id))
+        if user_id is not None:
+            await self._partners.delete(str(user_id))
+
+    def clear_local(self) -> None:
+        """
+        Drop every in process entry
+        """
+        self._states.clear_local()
+        self._partners.clear_local()
+        self._versions.clear_local()
+
+
+cycle_state_cache = CycleStateCache()
+
+
+async def invalidate_cycle_state(
+    session: AsyncSession,
+    partner_id: UUID,
+    user_id: UUID | None = None,
+) -> None:
+    """
+    Invalidate now, after the session commits and once replicas catch up
+
+    The later passes discard state a concurrent reader may have cached
+    from rows that were still uncommitted, or not yet replicated, during
+    the earlier ones
+    """
+    await cycle_state_cache.invalidate(partner_id, user_id)
+
+    async def invalidate_after_commit() -> None:
+        await cycle_state_cache.invalidate(partner_id, user_id)
+
+    run_after_replication(session, invalidate_after_commit)
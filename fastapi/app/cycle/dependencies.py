@@ -7,13 +7,15 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from core.dependencies import DBSession
+from core.dependencies import ReadDBSession
 from .service import CycleService
 
 
-def get_cycle_service(db: DBSession) -> CycleService:
+def get_cycle_service(db: ReadDBSession) -> CycleService:
     """
     Dependency to inject CycleService instance
+
+    Every cycle route only reads, so it runs on a replica session
     """
     return CycleService(db)
 
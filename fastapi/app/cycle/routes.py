@@ -6,11 +6,21 @@ routes.py
 from datetime import date
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
-from core.dependencies import CurrentUser
+from core.dependencies import CurrentPrincipal
+from core.enums import ExportFormat
+from core.export import export_response
 from core.responses import AUTH_401, NOT_FOUND_404
 from .dependencies import CycleServiceDep
-from .schemas import CycleStatus, PhaseInfo, CalendarMonth, CyclePattern
+from .schemas import (
+    CALENDAR_RANGE_MAX_MONTHS,
+    CycleStatus,
+    PhaseInfo,
+    CalendarMonth,
+    CalendarRange,
+    CyclePattern,
+)
 
 
 router = APIRouter(prefix = "/partners/me/cycle", tags = ["cycle"])
@@ -26,7 +36,7 @@ router = APIRouter(prefix = "/partners/me/cycle", tags = ["cycle"])
 )
 async def get_current_status(
     cycle_service: CycleServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> CycleStatus:
     """
     Get current cycle status for dashboard
@@ -44,7 +54,7 @@ async def get_current_status(
 )
 async def get_phase_info(
     cycle_service: CycleServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> list[PhaseInfo]:
     """
     Get information about all cycle phases
@@ -62,7 +72,7 @@ async def get_phase_info(
 )
 async def get_calendar_month(
     cycle_service: CycleServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     year: int = Query(default_factory = lambda: date.today().year),
     month: int = Query(default_factory = lambda: date.today().month, ge = 1, le = 12),
 ) -> CalendarMonth:
@@ -72,6 +82,67 @@ async def get_calendar_month(
     return await cycle_service.get_calendar_month(current_user.id, year, month)
 
 
+@router.get(
+    "/calendar/range",
+    response_model = CalendarRange,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+)
+async def get_calendar_range(
+    cycle_service: CycleServiceDep,
+    current_user: CurrentPrincipal,
+    start: str = Query(
+        default_factory = lambda: date.today().strftime("%Y-%m"),
+        pattern = r"^[1-9]\d{3}-(0[1-9]|1[0-2])$",
+        description = "First month as YYYY-MM",
+    ),
+    months: int = Query(default = 12, ge = 1, le = CALENDAR_RANGE_MAX_MONTHS),
+) -> CalendarRange:
+    """
+    Get calendar data for several consecutive months (year view)
+    """
+    year, month = (int(part) for part in start.split("-"))
+    return await cycle_service.get_calendar_range(
+        current_user.id,
+        year,
+        month,
+        months,
+    )
+
+
+@router.get(
+    "/calendar/export",
+    response_class = StreamingResponse,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+)
+async def export_calendar(
+    cycle_service: CycleServiceDep,
+    current_user: CurrentPrincipal,
+    start: date | None = Query(
+        default = None,
+        description = "First day, defaults to the first logged period",
+    ),
+    end: date | None = Query(
+        default = None,
+        description = "Last day, defaults to today",
+    ),
+    export_format: ExportFormat = Query(
+        default = ExportFormat.NDJSON,
+        alias = "format",
+    ),
+) -> StreamingResponse:
+    """
+    Stream derived calendar days as NDJSON or CSV
+    """
+    stream = await cycle_service.export_calendar(current_user.id, start, end)
+    return export_response(stream, export_format, "calendar")
+
+
 @router.get(
     "/patterns",
     response_model = CyclePattern,
@@ -82,7 +153,7 @@ async def get_calendar_month(
 )
 async def get_patterns(
     cycle_service: CycleServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> CyclePattern:
     """
     Get historical cycle patterns and insights
@@ -10,6 +10,10 @@ from pydantic import BaseModel
 from core.enums import CyclePhase, Mood
 
 
+CALENDAR_RANGE_MAX_MONTHS = 24
+CALENDAR_EXPORT_MAX_DAYS = 3660
+
+
 class CycleStatus(BaseModel):
     """
     Current cycle status for dashboard display
@@ -56,6 +60,15 @@ class CalendarMonth(BaseModel):
     days: list[CalendarDay]
 
 
+class CalendarRange(BaseModel):
+    """
+    Consecutive months of calendar data computed in one pass
+    """
+    start_year: int
+    start_month: int
+    months: list[CalendarMonth]
+
+
 class CyclePattern(BaseModel):
     """
     Historical pattern analysis
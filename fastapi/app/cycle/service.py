@@ -3,28 +3,65 @@
 service.py
 """
 
+import calendar
 import random
 from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
 from datetime import date, timedelta
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from core.enums import CyclePhase, Mood
-from core.exceptions import PartnerNotFound
+from core.exceptions import PartnerNotFound, ValidationError
+from core.export import RowStream
 from partner.repository import PartnerRepository
 from period_log.repository import PeriodLogRepository
 from daily_log.repository import DailyLogRepository
+from . import timeline
+from .cache import CycleState, cycle_state_cache
 from .schemas import (
+    CALENDAR_EXPORT_MAX_DAYS,
     CycleStatus,
     PhaseInfo,
     CalendarDay,
     CalendarMonth,
+    CalendarRange,
     CyclePattern,
     PHASE_TIPS,
 )
 
 
+CALENDAR_EXPORT_FIELDS = (
+    "date",
+    "cycle_day",
+    "phase",
+    "is_period",
+    "is_predicted_period",
+)
+
+
+async def _calendar_batches(
+    window: timeline.CycleTimeline,
+    batch_size: int,
+) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    """
+    Calendar rows of a timeline in batches of batch_size days
+    """
+    for first in range(0, len(window), batch_size):
+        yield [
+            (
+                window.start + timedelta(days = index),
+                window.cycle_day_at(index),
+                window.phase_at(index),
+                bool(window.period[index]),
+                bool(window.predicted[index]),
+            ) for index in range(first, min(first + batch_size, len(window)))
+        ]
+
+
 class CycleService:
     """
     Cycle phase calculations, predictions, and pattern analysis
@@ -32,48 +69,27 @@ class CycleService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def _get_phase(self, cycle_day: int, cycle_length: int) -> CyclePhase:
+    async def _get_state(self, user_id: UUID) -> CycleState:
         """
-        Determine cycle phase based on cycle day
+        Derived cycle state for the user's partner, cached when possible
         """
-        if cycle_day <= 0 or cycle_day > cycle_length:
-            return CyclePhase.UNKNOWN
-
-        if cycle_day <= 5:
-            return CyclePhase.MENSTRUAL
+        state = await cycle_state_cache.get(user_id)
+        if state is not None:
+            return state
 
-        ovulation_day = cycle_length - 14
-        follicular_end = ovulation_day - 2
-        ovulation_end = ovulation_day + 2
-
-        if cycle_day <= follicular_end:
-            return CyclePhase.FOLLICULAR
-        elif cycle_day <= ovulation_end:
-            return CyclePhase.OVULATION
-        else:
-            return CyclePhase.LUTEAL
-
-    def _get_phase_day(self, cycle_day: int, cycle_length: int) -> int:
-        """
-        Get day within current phase
-        """
-        phase = self._get_phase(cycle_day, cycle_length)
-
-        if phase == CyclePhase.MENSTRUAL:
-            return cycle_day
-
-        ovulation_day = cycle_length - 14
-        follicular_end = ovulation_day - 2
-        ovulation_end = ovulation_day + 2
-
-        if phase == CyclePhase.FOLLICULAR:
-            return cycle_day - 5
-        elif phase == CyclePhase.OVULATION:
-            return cycle_day - follicular_end
-        elif phase == CyclePhase.LUTEAL:
-            return cycle_day - ovulation_end
+        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
+        if not partner:
+            raise PartnerNotFound(str(user_id))
 
-        return 1
+        version = await cycle_state_cache.version(partner.id)
+        actual_logs = await PeriodLogRepository.get_actual_logs(
+            self.session,
+            partner.id,
+            limit = 12,
+        )
+        state = CycleState.from_partner(partner, actual_logs)
+        await cycle_state_cache.set(state, version)
+        return state
 
     def _get_random_tip(self, phase: CyclePhase) -> str:
         """
@@ -86,12 +102,10 @@ class CycleService:
         """
         Get current cycle status for dashboard
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
-            raise PartnerNotFound(str(user_id))
+        state = await self._get_state(user_id)
 
-        cycle_length = partner.average_cycle_length
-        last_period = partner.last_period_start
+        cycle_length = state.cycle_length
+        last_period = state.last_period_start
         today = date.today()
 
         if not last_period:
@@ -106,19 +120,18 @@ class CycleService:
                 is_period_active = False,
             )
 
-        days_since = (today - last_period).days + 1
-        current_day = ((days_since - 1) % cycle_length) + 1
-
-        predicted_start = last_period + timedelta(days = cycle_length)
-        while predicted_start <= today:
-            predicted_start += timedelta(days = cycle_length)
-
+        current_day = timeline.cycle_position(last_period, cycle_length, today)
+        predicted_start = timeline.next_period_start(
+            last_period,
+            cycle_length,
+            today,
+        )
         days_until = (predicted_start - today).days
 
-        phase = self._get_phase(current_day, cycle_length)
-        phase_day = self._get_phase_day(current_day, cycle_length)
+        phase = timeline.phase_for_day(current_day, cycle_length)
+        phase_day = timeline.phase_day(current_day, cycle_length)
 
-        is_period_active = current_day <= partner.average_period_length
+        is_period_active = current_day <= state.period_length
 
         return CycleStatus(
             current_day = current_day,
@@ -135,40 +148,15 @@ class CycleService:
         """
         Get info about all phases for current cycle length
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
-            raise PartnerNotFound(str(user_id))
-
-        cycle_length = partner.average_cycle_length
-        ovulation_day = cycle_length - 14
-        follicular_end = ovulation_day - 2
-        ovulation_end = ovulation_day + 2
+        state = await self._get_state(user_id)
 
         return [
             PhaseInfo(
-                phase = CyclePhase.MENSTRUAL,
-                start_day = 1,
-                end_day = 5,
-                tip = self._get_random_tip(CyclePhase.MENSTRUAL),
-            ),
-            PhaseInfo(
-                phase = CyclePhase.FOLLICULAR,
-                start_day = 6,
-                end_day = follicular_end,
-                tip = self._get_random_tip(CyclePhase.FOLLICULAR),
-            ),
-            PhaseInfo(
-                phase = CyclePhase.OVULATION,
-                start_day = follicular_end + 1,
-                end_day = ovulation_end,
-                tip = self._get_random_tip(CyclePhase.OVULATION),
-            ),
-            PhaseInfo(
-                phase = CyclePhase.LUTEAL,
-                start_day = ovulation_end + 1,
-                end_day = cycle_length,
-                tip = self._get_random_tip(CyclePhase.LUTEAL),
-            ),
+                phase = phase,
+                start_day = start_day,
+                end_day = end_day,
+                tip = self._get_random_tip(phase),
+            ) for phase, start_day, end_day in state.phase_boundaries
         ]
 
     async def get_calendar_month(
@@ -180,147 +168,183 @@ class CycleService:
         """
         Get calendar data for a specific month
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
-            raise PartnerNotFound(str(user_id))
+        calendar_range = await self.get_calendar_range(user_id, year, month, 1)
+        return calendar_range.months[0]
+
+    async def get_calendar_range(
+        self,
+        user_id: UUID,
+        year: int,
+        month: int,
+        months: int,
+    ) -> CalendarRange:
+        """
+        Get calendar data for consecutive months starting at year/month
 
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days = 1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days = 1)
+        Period and daily logs are fetched once for the whole window and
+        every month is sliced from a single timeline
+        """
+        if (year * 12 + month - 1 + months - 1) // 12 > date.max.year:
+            raise ValidationError(
+                f"The range must end by {date.max:%Y-%m}",
+                field = "start",
+            )
+        state = await self._get_state(user_id)
+
+        month_starts = [
+            date(year + (month - 1 + i) // 12, (month - 1 + i) % 12 + 1, 1)
+            for i in range(months)
+        ]
+        first_day = month_starts[0]
+        final_month = month_starts[-1]
+        last_day = date(
+            final_month.year,
+            final_month.month,
+            calendar.monthrange(final_month.year, final_month.month)[1],
+        )
 
-        period_logs = await PeriodLogRepository.get_by_partner_id(
+        period_logs = await PeriodLogRepository.get_overlapping_range(
             self.session,
-            partner.id,
-            limit = 12,
+            state.partner_id,
+            first_day,
+            last_day,
+            open_period_days = state.period_length,
         )
 
         daily_logs = await DailyLogRepository.get_date_range(
             self.session,
-            partner.id,
+            state.partner_id,
             first_day,
             last_day,
         )
         daily_log_map = {log.log_date: log for log in daily_logs}
 
-        period_dates: set[date] = set()
-        predicted_dates: set[date] = set()
-
-        for log in period_logs:
-            period_length = partner.average_period_length
-            if log.end_date:
-                period_length = (log.end_date - log.start_date).days + 1
-
-            for i in range(period_length):
-                d = log.start_date + timedelta(days = i)
-                if log.is_predicted:
-                    predicted_dates.add(d)
-                else:
-                    period_dates.add(d)
-
-        if partner.last_period_start:
-            predicted_start = partner.last_period_start + timedelta(
-                days = partner.average_cycle_length
-            )
-            while predicted_start <= last_day:
-                if predicted_start >= first_day:
-                    for i in range(partner.average_period_length):
-                        d = predicted_start + timedelta(days = i)
-                        if first_day <= d <= last_day and d not in period_dates:
-                            predicted_dates.add(d)
-                predicted_start += timedelta(days = partner.average_cycle_length)
+        window = timeline.build_timeline(
+            cycle_length = state.cycle_length,
+            period_length = state.period_length,
+            last_period_start = state.last_period_start,
+            spans = [
+                (log.start_date, log.end_date, log.is_predicted)
+                for log in period_logs
+            ],
+            start = first_day,
+            end = last_day,
+        )
 
         days: list[CalendarDay] = []
-        current_date = first_day
-
-        while current_date <= last_day:
-            cycle_day = None
-            phase = CyclePhase.UNKNOWN
-
-            if partner.last_period_start:
-                days_since = (current_date - partner.last_period_start).days + 1
-                if days_since > 0:
-                    cycle_day = ((days_since - 1) % partner.average_cycle_length) + 1
-                    phase = self._get_phase(cycle_day, partner.average_cycle_length)
-
+        for index, current_date in enumerate(window.dates()):
             daily_log = daily_log_map.get(current_date)
-
             days.append(CalendarDay(
                 date = current_date,
-                cycle_day = cycle_day,
-                phase = phase,
-                is_period = current_date in period_dates,
-                is_predicted_period = current_date in predicted_dates,
+                cycle_day = window.cycle_day_at(index),
+                phase = window.phase_at(index),
+                is_period = bool(window.period[index]),
+                is_predicted_period = bool(window.predicted[index]),
                 has_daily_log = daily_log is not None,
                 mood = daily_log.mood if daily_log else None,
             ))
 
-            current_date += timedelta(days = 1)
+        calendar_months: list[CalendarMonth] = []
+        for month_start in month_starts:
+            offset = window.offset(month_start)
+            month_length = calendar.monthrange(
+                month_start.year,
+                month_start.month,
+            )[1]
+            calendar_months.append(CalendarMonth(
+                year = month_start.year,
+                month = month_start.month,
+                days = days[offset : offset + month_length],
+            ))
 
-        return CalendarMonth(
-            year = year,
-            month = month,
-            days = days,
+        return CalendarRange(
+            start_year = year,
+            start_month = month,
+            months = calendar_months,
         )
 
-    async def get_patterns(self, user_id: UUID) -> CyclePattern:
+    async def export_calendar(
+        self,
+        user_id: UUID,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> RowStream:
         """
-        Analyze historical patterns
+        Stream derived calendar days for a date range
+
+        The range defaults to the first logged period through today
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
-            raise PartnerNotFound(str(user_id))
+        state = await self._get_state(user_id)
 
-        period_logs = await PeriodLogRepository.get_actual_logs(
+        end = end or date.today()
+        if start is None:
+            first_logged = await PeriodLogRepository.get_first_start(
+                self.session,
+                state.partner_id,
+            )
+            start = first_logged or state.last_period_start or end
+        if start > end:
+            raise ValidationError(
+                "start must not be after end",
+                field = "start",
+            )
+        if (end - start).days >= CALENDAR_EXPORT_MAX_DAYS:
+            raise ValidationError(
+                f"Export is limited to {CALENDAR_EXPORT_MAX_DAYS} days",
+                field = "start",
+            )
+
+        period_logs = await PeriodLogRepository.get_overlapping_range(
             self.session,
-            partner.id,
-            limit = 12,
+            state.partner_id,
+            start,
+            end,
+            open_period_days = state.period_length,
         )
-
-        cycle_lengths = [
-            log.cycle_length for log in period_logs
-            if log.cycle_length is not None
-        ]
-
-        if cycle_lengths:
-            avg_cycle = sum(cycle_lengths) / len(cycle_lengths)
-            cycle_range = (min(cycle_lengths), max(cycle_lengths))
-        else:
-            avg_cycle = float(partner.average_cycle_length)
-            cycle_range = (partner.average_cycle_length, partner.average_cycle_length)
-
-        period_lengths = []
-        for log in period_logs:
-            if log.end_date:
-                length = (log.end_date - log.start_date).days + 1
-                period_lengths.append(length)
-
-        avg_period = (
-            sum(period_lengths) / len(period_lengths)
-            if period_lengths
-            else float(partner.average_period_length)
+        window = timeline.build_timeline(
+            cycle_length = state.cycle_length,
+            period_length = state.period_length,
+            last_period_start = state.last_period_start,
+            spans = [
+                (log.start_date, log.end_date, log.is_predicted)
+                for log in period_logs
+            ],
+            start = start,
+            end = end,
+        )
+        return RowStream(
+            CALENDAR_EXPORT_FIELDS,
+            _calendar_batches(window, settings.EXPORT_BATCH_SIZE),
         )
 
+    async def get_patterns(self, user_id: UUID) -> CyclePattern:
+        """
+        Analyze historical patterns
+        """
+        state = await self._get_state(user_id)
+
         daily_logs = await DailyLogRepository.get_by_partner_id(
             self.session,
-            partner.id,
+            state.partner_id,
             limit = 90,
         )
 
         symptoms_by_phase: dict[str, list[str]] = defaultdict(list)
         mood_counts_by_phase: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
 
+        last_period = state.last_period_start
+        cycle_length = state.cycle_length
+        phases = timeline.phase_table(cycle_length)
+
         for log in daily_logs:
-            if not partner.last_period_start:
+            if not last_period:
                 continue
 
-            days_since = (log.log_date - partner.last_period_start).days + 1
-            if days_since <= 0:
+            days_since = (log.log_date - last_period).days
+            if days_since < 0:
                 continue
 
-            cycle_day = ((days_since - 1) % partner.average_cycle_length) + 1
-            phase = self._get_phase(cycle_day, partner.average_cycle_length)
+            phase = timeline.PHASE_CODES[phases[days_since % cycle_length]]
             phase_key = phase.value
 
             for symptom in log.symptoms:
@@ -342,9 +366,9 @@ class CycleService:
                 mood_trends[phase] = None
 
         return CyclePattern(
-            average_cycle_length = round(avg_cycle, 1),
-            cycle_length_range = cycle_range,
-            average_period_length = round(avg_period, 1),
+            average_cycle_length = round(state.average_cycle_length, 1),
+            cycle_length_range = state.cycle_length_range,
+            average_period_length = round(state.average_period_length, 1),
             common_symptoms_by_phase = common_symptoms,
             mood_trends_by_phase = mood_trends,
         )
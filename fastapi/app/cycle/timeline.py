@@ -0,0 +1,292 @@
+"""
+ⒸAngelaMos | 2026
+timeline.py
+
+Pure cycle timeline engine
+
+A cycle is fully described by one pattern of cycle_length entries
+(cycle day number, phase code, predicted period mask). Any date range
+is produced by rotating and tiling that pattern with bytes operations,
+so building a window costs a constant number of Python operations plus
+one slice write per logged period, regardless of how many days it spans
+"""
+
+from __future__ import annotations
+
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+from datetime import date, timedelta
+
+from core.enums import CyclePhase
+
+
+PHASE_CODES: tuple[CyclePhase, ...] = (
+    CyclePhase.UNKNOWN,
+    CyclePhase.MENSTRUAL,
+    CyclePhase.FOLLICULAR,
+    CyclePhase.OVULATION,
+    CyclePhase.LUTEAL,
+)
+PHASE_CODE: dict[CyclePhase, int] = {
+    phase: code for code, phase in enumerate(PHASE_CODES)
+}
+
+MENSTRUAL_DAYS = 5
+LUTEAL_DAYS = 14
+OVULATION_WINDOW_DAYS = 2
+
+PeriodSpan = tuple[date, date | None, bool]
+
+
+def phase_boundaries(cycle_length: int) -> list[tuple[CyclePhase, int, int]]:
+    """
+    Inclusive (phase, start_day, end_day) ranges for a cycle length
+    """
+    ovulation_day = cycle_length - LUTEAL_DAYS
+    follicular_end = ovulation_day - OVULATION_WINDOW_DAYS
+    ovulation_end = ovulation_day + OVULATION_WINDOW_DAYS
+
+    return [
+        (CyclePhase.MENSTRUAL, 1, MENSTRUAL_DAYS),
+        (CyclePhase.FOLLICULAR, MENSTRUAL_DAYS + 1, follicular_end),
+        (CyclePhase.OVULATION, follicular_end + 1, ovulation_end),
+        (CyclePhase.LUTEAL, ovulation_end + 1, cycle_length),
+    ]
+
+
+def phase_table(cycle_length: int) -> bytes:
+    """
+    Phase code for every cycle day, indexed by cycle_day - 1
+
+    Later phases are written first so earlier phases win any overlap,
+    matching the threshold order used for short cycles
+    """
+    table = bytearray(cycle_length)
+    for phase, _, end_day in reversed(phase_boundaries(cycle_length)):
+        end = max(0, min(end_day, cycle_length))
+        table[: end] = bytes((PHASE_CODE[phase], )) * end
+    return bytes(table)
+
+
+def phase_for_day(cycle_day: int, cycle_length: int) -> CyclePhase:
+    """
+    Phase for a 1 based cycle day, UNKNOWN outside the cycle
+    """
+    if cycle_day <= 0 or cycle_day > cycle_length:
+        return CyclePhase.UNKNOWN
+    return PHASE_CODES[phase_table(cycle_length)[cycle_day - 1]]
+
+
+def phase_day(cycle_day: int, cycle_length: int) -> int:
+    """
+    Day number within the phase that contains cycle_day
+    """
+    phase = phase_for_day(cycle_day, cycle_length)
+    if phase == CyclePhase.UNKNOWN:
+        return 1
+
+    previous_end = 0
+    for bound_phase, _, end_day in phase_boundaries(cycle_length):
+        if bound_phase == phase:
+            return cycle_day - previous_end
+        previous_end = max(previous_end, end_day)
+    return 1
+
+
+def cycle_position(
+    last_period_start: date,
+    cycle_length: int,
+    on: date,
+) -> int:
+    """
+    1 based cycle day of a date relative to the last period start
+    """
+    return ((on - last_period_start).days % cycle_length) + 1
+
+
+def next_period_start(
+    last_period_start: date,
+    cycle_length: int,
+    on: date,
+) -> date:
+    """
+    First predicted period start strictly after a date
+    """
+    elapsed = (on - last_period_start).days
+    cycles = max(elapsed // cycle_length + 1, 1)
+    return last_period_start + timedelta(days = cycles * cycle_length)
+
+
+def _tile(pattern: bytes, shift: int, count: int) -> bytes:
+    """
+    Repeat a cycle pattern starting at shift until count entries exist
+    """
+    if count <= 0:
+        return b""
+    repeats = (shift + count) // len(pattern) + 1
+    return (pattern * repeats)[shift : shift + count]
+
+
+def _union(left: bytes, right: bytes) -> bytes:
+    """
+    Elementwise OR of two 0/1 masks of equal length
+    """
+    merged = int.from_bytes(left, "big") | int.from_bytes(right, "big")
+    return merged.to_bytes(len(left), "big")
+
+
+def _difference(left: bytes, right: bytes) -> bytes:
+    """
+    Elementwise left AND NOT right of two 0/1 masks of equal length
+    """
+    kept = int.from_bytes(left, "big") & ~int.from_bytes(right, "big")
+    return kept.to_bytes(len(left), "big")
+
+
+class CycleTimeline:
+    """
+    Array backed per day cycle data for a contiguous date window
+
+    Index i holds values for start + i days. cycle_days uses 0 for days
+    before the first known period, phases holds PHASE_CODES indexes and
+    period / predicted are 0/1 masks. Cycle lengths stay well below 256
+    so every column fits in one byte per day
+    """
+    __slots__ = (
+        "cycle_days",
+        "end",
+        "period",
+        "phases",
+        "predicted",
+        "start",
+    )
+
+    def __init__(
+        self,
+        start: date,
+        end: date,
+        cycle_days: bytes,
+        phases: bytes,
+        period: bytes,
+        predicted: bytes,
+    ) -> None:
+        self.start = start
+        self.end = end
+        self.cycle_days = cycle_days
+        self.phases = phases
+        self.period = period
+        self.predicted = predicted
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+    def offset(self, day: date) -> int:
+        """
+        Index of a date inside the window
+        """
+        index = (day - self.start).days
+        if index < 0 or index >= len(self):
+            raise IndexError(f"{day} is outside the timeline window")
+        return index
+
+    def dates(self) -> Iterator[date]:
+        """
+        Every date in the window, in order
+        """
+        ordinal = self.start.toordinal()
+        return (date.fromordinal(ordinal + i) for i in range(len(self)))
+
+    def cycle_day_at(self, index: int) -> int | None:
+        """
+        Cycle day at an index, None before the first known period
+        """
+        return self.cycle_days[index] or None
+
+    def phase_at(self, index: int) -> CyclePhase:
+        """
+        Phase at an index
+        """
+        return PHASE_CODES[self.phases[index]]
+
+
+def build_timeline(
+    cycle_length: int,
+    period_length: int,
+    last_period_start: date | None,
+    spans: Iterable[PeriodSpan],
+    start: date,
+    end: date,
+) -> CycleTimeline:
+    """
+    Compute cycle days, phases and period flags for start..end inclusive
+
+    spans are (start_date, end_date, is_predicted) logged periods, a
+    missing end_date spans period_length days. Periods projected from
+    last_period_start fill the predicted mask on days without a logged
+    actual period
+    """
+    size = (end - start).days + 1
+    if size <= 0:
+        raise ValueError("Timeline end must not be before start")
+
+    period = bytearray(size)
+    logged_predicted = bytearray(size)
+    for span_start, span_end, is_predicted in spans:
+        if span_end is None:
+            span_end = span_start + timedelta(days = period_length - 1)
+        first = max((span_start - start).days, 0)
+        last = min((span_end - start).days, size - 1)
+        if first > last:
+            continue
+        target = logged_predicted if is_predicted else period
+        target[first : last + 1] = b"\x01" * (last - first + 1)
+
+    if last_period_start is None:
+        return CycleTimeline(
+            start = start,
+            end = end,
+            cycle_days = bytes(size),
+            phases = bytes(size),
+            period = bytes(period),
+            predicted = bytes(logged_predicted),
+        )
+
+    anchor = (start - last_period_start).days
+    lead = min(max(-anchor, 0), size)
+    shift = max(anchor, 0) % cycle_length
+
+    cycle_days = bytes(lead) + _tile(
+        bytes(range(1, cycle_length + 1)),
+        shift,
+        size - lead,
+    )
+    phases = bytes(lead) + _tile(
+        phase_table(cycle_length),
+        shift,
+        size - lead,
+    )
+
+    projected_lead = min(max(cycle_length - anchor, 0), size)
+    projected_mask = (
+        b"\x01" * min(period_length, cycle_length)
+    ).ljust(cycle_length, b"\x00")
+    projected = bytes(projected_lead) + _tile(
+        projected_mask,
+        max(anchor, cycle_length) % cycle_length,
+        size - projected_lead,
+    )
+
+    actual = bytes(period)
+    return CycleTimeline(
+        start = start,
+        end = end,
+        cycle_days = cycle_days,
+        phases = phases,
+        period = actual,
+        predicted = _union(
+            bytes(logged_predicted),
+            _difference(projected, actual),
+        ),
+    )
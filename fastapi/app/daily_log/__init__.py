@@ -7,7 +7,12 @@ from .DailyLog import DailyLog
 from .repository import DailyLogRepository
 from .service import DailyLogService
 from .schemas import DailyLogCreate, DailyLogResponse, DailyLogUpdate
-from .dependencies import DailyLogServiceDep, get_daily_log_service
+from .dependencies import (
+    DailyLogReadServiceDep,
+    DailyLogServiceDep,
+    get_daily_log_read_service,
+    get_daily_log_service,
+)
 from .routes import router
 
 __all__ = [
@@ -17,7 +22,9 @@ __all__ = [
     "DailyLogCreate",
     "DailyLogResponse",
     "DailyLogUpdate",
+    "DailyLogReadServiceDep",
     "DailyLogServiceDep",
+    "get_daily_log_read_service",
     "get_daily_log_service",
     "router",
 ]
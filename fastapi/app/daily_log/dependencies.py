@@ -7,7 +7,7 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from core.dependencies import DBSession
+from core.dependencies import DBSession, ReadDBSession
 from .service import DailyLogService
 
 
@@ -19,3 +19,16 @@ def get_daily_log_service(db: DBSession) -> DailyLogService:
 
 
 DailyLogServiceDep = Annotated[DailyLogService, Depends(get_daily_log_service)]
+
+
+def get_daily_log_read_service(db: ReadDBSession) -> DailyLogService:
+    """
+    Dependency to inject a DailyLogService for read only routes
+    """
+    return DailyLogService(db)
+
+
+DailyLogReadServiceDep = Annotated[
+    DailyLogService,
+    Depends(get_daily_log_read_service),
+]
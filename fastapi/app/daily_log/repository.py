@@ -3,17 +3,40 @@
 repository.py
 """
 
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import date
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+import uuid6
+from sqlalchemy import (
+    Date,
+    delete,
+    literal,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.base_repository import BaseRepository
+from core.enums import Mood
+from core.export import RowStream
+from partner.Partner import Partner
+from partner.repository import PartnerRepository
 from .DailyLog import DailyLog
 
 
+EXPORT_COLUMNS = (
+    DailyLog.id,
+    DailyLog.log_date,
+    DailyLog.mood,
+    DailyLog.energy_level,
+    DailyLog.symptoms,
+    DailyLog.notes,
+    DailyLog.created_at,
+)
+
+
 class DailyLogRepository(BaseRepository[DailyLog]):
     """
     Database operations for DailyLog model
@@ -40,6 +63,236 @@ class DailyLogRepository(BaseRepository[DailyLog]):
         )
         return result.scalars().all()
 
+    @classmethod
+    async def get_by_user_id(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[DailyLog]:
+        """
+        Get daily logs for a user's partner, ordered by log_date descending
+        """
+        result = await session.execute(
+            select(DailyLog)
+            .join(Partner, Partner.id == DailyLog.partner_id)
+            .where(Partner.user_id == user_id)
+            .order_by(DailyLog.log_date.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    @classmethod
+    async def get_page_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[DailyLog], str | None]:
+        """
+        Daily logs of a user's partner, newest first, keyset paginated on
+        (log_date, id)
+        """
+        return await cls.get_page(
+            session,
+            limit,
+            cursor,
+            keys = (DailyLog.log_date, DailyLog.id),
+            descending = True,
+            statement = select(DailyLog)
+            .join(Partner, Partner.id == DailyLog.partner_id)
+            .where(Partner.user_id == user_id),
+        )
+
+    @classmethod
+    async def get_by_user_and_date(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_date: date,
+    ) -> DailyLog | None:
+        """
+        Get the daily log of a user's partner for a date
+        """
+        result = await session.execute(
+            select(DailyLog)
+            .join(Partner, Partner.id == DailyLog.partner_id)
+            .where(
+                Partner.user_id == user_id,
+                DailyLog.log_date == log_date,
+            )
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def get_date_range_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+    ) -> Sequence[DailyLog]:
+        """
+        Get daily logs of a user's partner within a date range
+        """
+        result = await session.execute(
+            select(DailyLog)
+            .join(Partner, Partner.id == DailyLog.partner_id)
+            .where(
+                Partner.user_id == user_id,
+                DailyLog.log_date >= start_date,
+                DailyLog.log_date <= end_date,
+            )
+            .order_by(DailyLog.log_date.desc())
+        )
+        return result.scalars().all()
+
+    @classmethod
+    async def create_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_date: date,
+        mood: Mood | None = None,
+        energy_level: int | None = None,
+        symptoms: list[str] | None = None,
+        notes: str | None = None,
+    ) -> DailyLog | None:
+        """
+        Insert a daily log for a user's partner in one statement
+
+        Returns None when the user has no partner or the date is taken
+        """
+        source = select(
+            literal(uuid6.uuid7(), DailyLog.id.type),
+            Partner.id,
+            literal(log_date, Date),
+            literal(mood, DailyLog.mood.type),
+            literal(energy_level, DailyLog.energy_level.type),
+            literal(symptoms or [], DailyLog.symptoms.type),
+            literal(notes, DailyLog.notes.type),
+        ).where(Partner.user_id == user_id)
+
+        statement = (
+            cls.insert_statement(session)
+            .from_select(
+                [
+                    DailyLog.id,
+                    DailyLog.partner_id,
+                    DailyLog.log_date,
+                    DailyLog.mood,
+                    DailyLog.energy_level,
+                    DailyLog.symptoms,
+                    DailyLog.notes,
+                ],
+                source,
+            )
+            .on_conflict_do_nothing(
+                index_elements = [DailyLog.partner_id, DailyLog.log_date]
+            )
+            .returning(DailyLog)
+        )
+        result = await session.execute(statement)
+        return result.scalars().first()
+
+    @classmethod
+    async def update_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_date: date,
+        **kwargs: Any,
+    ) -> DailyLog | None:
+        """
+        Update the daily log of a user's partner for a date in one statement
+        """
+        if not kwargs:
+            return await cls.get_by_user_and_date(session, user_id, log_date)
+
+        result = await session.execute(
+            update(DailyLog)
+            .where(
+                DailyLog.partner_id == PartnerRepository.id_for_user(user_id),
+                DailyLog.log_date == log_date,
+            )
+            .values(**kwargs)
+            .returning(DailyLog)
+            .execution_options(populate_existing = True)
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def delete_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_date: date,
+    ) -> bool:
+        """
+        Delete the daily log of a user's partner for a date
+        """
+        result = await session.execute(
+            delete(DailyLog)
+            .where(
+                DailyLog.partner_id == PartnerRepository.id_for_user(user_id),
+                DailyLog.log_date == log_date,
+            )
+            .returning(DailyLog.id)
+        )
+        return result.scalars().first() is not None
+
+    @classmethod
+    async def insert_many(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+    ) -> int:
+        """
+        Insert rows as one executemany, skipping existing dates
+
+        Returns the number of rows actually inserted
+        """
+        if not rows:
+            return 0
+        result = await session.execute(
+            cls.insert_statement(session)
+            .on_conflict_do_nothing(
+                index_elements = [DailyLog.partner_id, DailyLog.log_date]
+            )
+            .returning(DailyLog.id),
+            rows,
+        )
+        return len(result.all())
+
+    @classmethod
+    def stream_for_partner(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+        batch_size: int,
+    ) -> RowStream:
+        """
+        Every log of a partner as plain rows from a server side cursor,
+        oldest first
+        """
+        async def batches() -> AsyncIterator[Sequence[Any]]:
+            result = await session.stream(
+                select(*EXPORT_COLUMNS)
+                .where(DailyLog.partner_id == partner_id)
+                .order_by(DailyLog.log_date)
+                .execution_options(yield_per = batch_size)
+            )
+            async for partition in result.partitions():
+                yield partition
+
+        return RowStream(
+            [column.key for column in EXPORT_COLUMNS],
+            batches(),
+        )
+
     @classmethod
     async def get_by_partner_and_date(
         cls,
@@ -5,11 +5,17 @@ routes.py
 
 from datetime import date
 
-from fastapi import APIRouter, Query, status
-
-from core.dependencies import CurrentUser
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from core.bulk import IMPORT_OPENAPI_EXTRA, read_import_entries
+from core.common_schemas import ImportResponse
+from core.constants import NEXT_CURSOR_HEADER
+from core.dependencies import CurrentPrincipal
+from core.enums import ExportFormat
+from core.export import export_response
 from core.responses import AUTH_401, CONFLICT_409, NOT_FOUND_404
-from .dependencies import DailyLogServiceDep
+from .dependencies import DailyLogReadServiceDep, DailyLogServiceDep
 from .schemas import DailyLogCreate, DailyLogResponse, DailyLogUpdate
 
 
@@ -28,7 +34,7 @@ router = APIRouter(prefix = "/partners/me/daily-logs", tags = ["daily-logs"])
 )
 async def create_daily_log(
     daily_log_service: DailyLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     data: DailyLogCreate,
 ) -> DailyLogResponse:
     """
@@ -37,6 +43,50 @@ async def create_daily_log(
     return await daily_log_service.create_daily_log(current_user.id, data)
 
 
+@router.post(
+    "/import",
+    response_model = ImportResponse,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+    openapi_extra = IMPORT_OPENAPI_EXTRA,
+)
+async def import_daily_logs(
+    request: Request,
+    daily_log_service: DailyLogServiceDep,
+    current_user: CurrentPrincipal,
+) -> ImportResponse:
+    """
+    Bulk import historical daily logs from a JSON array or NDJSON body
+    """
+    entries = await read_import_entries(request, DailyLogCreate)
+    return await daily_log_service.import_daily_logs(current_user.id, entries)
+
+
+@router.get(
+    "/export",
+    response_class = StreamingResponse,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+)
+async def export_daily_logs(
+    daily_log_service: DailyLogReadServiceDep,
+    current_user: CurrentPrincipal,
+    export_format: ExportFormat = Query(
+        default = ExportFormat.NDJSON,
+        alias = "format",
+    ),
+) -> StreamingResponse:
+    """
+    Stream the full history as NDJSON or CSV
+    """
+    stream = await daily_log_service.export_daily_logs(current_user.id)
+    return export_response(stream, export_format, "daily-logs")
+
+
 @router.get(
     "",
     response_model = list[DailyLogResponse],
@@ -46,10 +96,15 @@ async def create_daily_log(
     },
 )
 async def get_daily_logs(
-    daily_log_service: DailyLogServiceDep,
-    current_user: CurrentUser,
-    skip: int = Query(default = 0, ge = 0),
+    response: Response,
+    daily_log_service: DailyLogReadServiceDep,
+    current_user: CurrentPrincipal,
+    skip: int = Query(default = 0, ge = 0, deprecated = True),
     limit: int = Query(default = 30, ge = 1, le = 100),
+    cursor: str | None = Query(
+        default = None,
+        description = f"Opaque cursor from the {NEXT_CURSOR_HEADER} header",
+    ),
     start_date: date | None = Query(default = None),
     end_date: date | None = Query(default = None),
 ) -> list[DailyLogResponse]:
@@ -64,12 +119,22 @@ async def get_daily_logs(
         )
         return list(logs)
 
-    logs = await daily_log_service.get_daily_logs(
+    if skip:
+        logs = await daily_log_service.get_daily_logs(
+            current_user.id,
+            skip = skip,
+            limit = limit,
+        )
+        return list(logs)
+
+    page, next_cursor = await daily_log_service.get_daily_log_page(
         current_user.id,
-        skip = skip,
-        limit = limit,
+        limit,
+        cursor,
     )
-    return list(logs)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
 
 
 @router.get(
@@ -81,8 +146,8 @@ async def get_daily_logs(
     },
 )
 async def get_daily_log(
-    daily_log_service: DailyLogServiceDep,
-    current_user: CurrentUser,
+    daily_log_service: DailyLogReadServiceDep,
+    current_user: CurrentPrincipal,
     log_date: date,
 ) -> DailyLogResponse:
     """
@@ -101,7 +166,7 @@ async def get_daily_log(
 )
 async def update_daily_log(
     daily_log_service: DailyLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     log_date: date,
     data: DailyLogUpdate,
 ) -> DailyLogResponse:
@@ -121,7 +186,7 @@ async def update_daily_log(
 )
 async def delete_daily_log(
     daily_log_service: DailyLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     log_date: date,
 ) -> None:
     """
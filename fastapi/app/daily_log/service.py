@@ -5,13 +5,17 @@ service.py
 
 from collections.abc import Sequence
 from datetime import date
+from typing import NoReturn
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
+from core.bulk import chunked
+from core.common_schemas import ImportResponse
+from core.export import RowStream
 from core.exceptions import DailyLogNotFound, DailyLogAlreadyExists, PartnerNotFound
 from partner.repository import PartnerRepository
-from .DailyLog import DailyLog
 from .repository import DailyLogRepository
 from .schemas import DailyLogCreate, DailyLogResponse, DailyLogUpdate
 
@@ -23,14 +27,17 @@ class DailyLogService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def _get_partner_id(self, user_id: UUID) -> UUID:
+    async def _raise_not_found(
+        self,
+        user_id: UUID,
+        log_date: date,
+    ) -> NoReturn:
         """
-        Get partner ID for user, raise if not found
+        Raise the error explaining why a user scoped lookup matched nothing
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
+        if not await PartnerRepository.exists_for_user(self.session, user_id):
             raise PartnerNotFound(str(user_id))
-        return partner.id
+        raise DailyLogNotFound(str(log_date))
 
     async def create_daily_log(
         self,
@@ -40,27 +47,100 @@ class DailyLogService:
         """
         Create a new daily log entry
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        existing = await DailyLogRepository.get_by_partner_and_date(
-            self.session,
-            partner_id,
-            data.log_date,
-        )
-        if existing:
-            raise DailyLogAlreadyExists(str(data.log_date))
-
-        daily_log = await DailyLogRepository.create(
+        daily_log = await DailyLogRepository.create_for_user(
             self.session,
-            partner_id = partner_id,
+            user_id,
             log_date = data.log_date,
             mood = data.mood,
             energy_level = data.energy_level,
             symptoms = data.symptoms,
             notes = data.notes,
         )
+        if daily_log is None:
+            if not await PartnerRepository.exists_for_user(self.session,
+                                                           user_id):
+                raise PartnerNotFound(str(user_id))
+            raise DailyLogAlreadyExists(str(data.log_date))
+
         return DailyLogResponse.model_validate(daily_log)
 
+    async def import_daily_logs(
+        self,
+        user_id: UUID,
+        entries: Sequence[DailyLogCreate],
+    ) -> ImportResponse:
+        """
+        Bulk import historical daily logs
+
+        Entries whose date is already logged, or repeated within the
+        import, are skipped. New rows are inserted in executemany batches
+        """
+        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
+        if not partner:
+            raise PartnerNotFound(str(user_id))
+
+        fresh: dict[date, DailyLogCreate] = {}
+        for entry in entries:
+            fresh.setdefault(entry.log_date, entry)
+
+        rows = [
+            {
+                "partner_id": partner.id,
+                "log_date": entry.log_date,
+                "mood": entry.mood,
+                "energy_level": entry.energy_level,
+                "symptoms": entry.symptoms,
+                "notes": entry.notes,
+            } for entry in fresh.values()
+        ]
+
+        imported = 0
+        for batch in chunked(rows, settings.IMPORT_BATCH_SIZE):
+            imported += await DailyLogRepository.insert_many(
+                self.session,
+                batch,
+            )
+
+        return ImportResponse(
+            received = len(entries),
+            imported = imported,
+            skipped = len(entries) - imported,
+        )
+
+    async def export_daily_logs(self, user_id: UUID) -> RowStream:
+        """
+        Stream every daily log of the user's partner
+        """
+        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
+        if not partner:
+            raise PartnerNotFound(str(user_id))
+
+        return DailyLogRepository.stream_for_partner(
+            self.session,
+            partner.id,
+            batch_size = settings.EXPORT_BATCH_SIZE,
+        )
+
+    async def get_daily_log_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[DailyLogResponse], str | None]:
+        """
+        Get one keyset page of daily logs and the next page cursor
+        """
+        logs, next_cursor = await DailyLogRepository.get_page_for_user(
+            self.session,
+            user_id,
+            limit,
+            cursor,
+        )
+        if not logs and not await PartnerRepository.exists_for_user(
+                self.session, user_id):
+            raise PartnerNotFound(str(user_id))
+        return [DailyLogResponse.model_validate(log) for log in logs], next_cursor
+
     async def get_daily_logs(
         self,
         user_id: UUID,
@@ -70,14 +150,15 @@ class DailyLogService:
         """
         Get daily logs for user's partner
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        logs = await DailyLogRepository.get_by_partner_id(
+        logs = await DailyLogRepository.get_by_user_id(
             self.session,
-            partner_id,
+            user_id,
             skip = skip,
             limit = limit,
         )
+        if not logs and not await PartnerRepository.exists_for_user(
+                self.session, user_id):
+            raise PartnerNotFound(str(user_id))
         return [DailyLogResponse.model_validate(log) for log in logs]
 
     async def get_daily_log_by_date(
@@ -88,15 +169,13 @@ class DailyLogService:
         """
         Get daily log for a specific date
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await DailyLogRepository.get_by_partner_and_date(
+        log = await DailyLogRepository.get_by_user_and_date(
             self.session,
-            partner_id,
+            user_id,
             log_date,
         )
         if not log:
-            raise DailyLogNotFound(str(log_date))
+            await self._raise_not_found(user_id, log_date)
 
         return DailyLogResponse.model_validate(log)
 
@@ -109,14 +188,15 @@ class DailyLogService:
         """
         Get daily logs within a date range
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        logs = await DailyLogRepository.get_date_range(
+        logs = await DailyLogRepository.get_date_range_for_user(
             self.session,
-            partner_id,
+            user_id,
             start_date,
             end_date,
         )
+        if not logs and not await PartnerRepository.exists_for_user(
+                self.session, user_id):
+            raise PartnerNotFound(str(user_id))
         return [DailyLogResponse.model_validate(log) for log in logs]
 
     async def update_daily_log(
@@ -128,22 +208,16 @@ class DailyLogService:
         """
         Update a daily log entry by date
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await DailyLogRepository.get_by_partner_and_date(
-            self.session,
-            partner_id,
-            log_date,
-        )
-        if not log:
-            raise DailyLogNotFound(str(log_date))
-
         update_dict = data.model_dump(exclude_unset = True)
-        updated = await DailyLogRepository.update(
+        updated = await DailyLogRepository.update_for_user(
             self.session,
-            log,
+            user_id,
+            log_date,
             **update_dict,
         )
+        if not updated:
+            await self._raise_not_found(user_id, log_date)
+
         return DailyLogResponse.model_validate(updated)
 
     async def delete_daily_log(
@@ -154,14 +228,10 @@ class DailyLogService:
         """
         Delete a daily log entry by date
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await DailyLogRepository.get_by_partner_and_date(
+        deleted = await DailyLogRepository.delete_for_user(
             self.session,
-            partner_id,
+            user_id,
             log_date,
         )
-        if not log:
-            raise DailyLogNotFound(str(log_date))
-
-        await DailyLogRepository.delete(self.session, log)
+        if not deleted:
+            await self._raise_not_found(user_id, log_date)
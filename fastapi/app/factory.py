@@ -9,17 +9,19 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
 from config import settings, API_PREFIX
+from core.constants import NEXT_CURSOR_HEADER, READ_PRIMARY_UNTIL_HEADER
 from core.database import sessionmanager
 from core.exceptions import BaseAppException
+from core.hashing import hashing_executor
 from core.logging import configure_logging
-from core.rate_limit import limiter
+from core.redis_pool import redis_manager
 from middleware.correlation import CorrelationIdMiddleware
+from middleware.read_your_writes import ReadYourWritesMiddleware
 from core.common_schemas import AppInfoResponse
 from core.health_routes import router as health_router
+from core.jwks_routes import router as jwks_router
 from user.routes import router as user_router
 from auth.routes import router as auth_router
 from admin.routes import router as admin_router
@@ -28,6 +30,7 @@ from period_log.routes import router as period_log_router
 from daily_log.routes import router as daily_log_router
 from cycle.routes import router as cycle_router
 from it_was_never_real import register_psyop_handler
+from maintenance import create_scheduler
 
 
 @asynccontextmanager
@@ -36,8 +39,20 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     Application lifespan handler for startup and shutdown
     """
     configure_logging()
-    sessionmanager.init(str(settings.DATABASE_URL))
+    sessionmanager.init(
+        str(settings.DATABASE_URL),
+        [str(url) for url in settings.DATABASE_REPLICA_URLS],
+    )
+    if settings.REDIS_URL is not None:
+        redis_manager.init(str(settings.REDIS_URL))
+    await hashing_executor.start()
+    scheduler = create_scheduler()
+    if settings.MAINTENANCE_ENABLED:
+        scheduler.start()
     yield
+    await scheduler.stop()
+    hashing_executor.shutdown()
+    await redis_manager.close()
     await sessionmanager.close()
 
 
@@ -95,6 +110,7 @@ def create_app() -> FastAPI:
         redoc_url = "/redoc",
     )
 
+    app.add_middleware(ReadYourWritesMiddleware)
     app.add_middleware(CorrelationIdMiddleware)
     app.add_middleware(
         CORSMiddleware,
@@ -102,12 +118,7 @@ def create_app() -> FastAPI:
         allow_credentials = settings.CORS_ALLOW_CREDENTIALS,
         allow_methods = settings.CORS_ALLOW_METHODS,
         allow_headers = settings.CORS_ALLOW_HEADERS,
-    )
-
-    app.state.limiter = limiter
-    app.add_exception_handler(
-        RateLimitExceeded,
-        _rate_limit_exceeded_handler
+        expose_headers = [NEXT_CURSOR_HEADER, READ_PRIMARY_UNTIL_HEADER],
     )
 
     @app.exception_handler(BaseAppException)
@@ -115,12 +126,15 @@ def create_app() -> FastAPI:
         request: Request,
         exc: BaseAppException,
     ) -> JSONResponse:
+        retry_after = getattr(exc, "retry_after", None)
         return JSONResponse(
             status_code = exc.status_code,
             content = {
                 "detail": exc.message,
                 "type": exc.__class__.__name__,
             },
+            headers = {"Retry-After": str(retry_after)}
+            if retry_after is not None else None,
         )
 
     @app.get("/", response_model = AppInfoResponse, tags = ["root"])
@@ -133,6 +147,7 @@ def create_app() -> FastAPI:
         )
 
     app.include_router(health_router)
+    app.include_router(jwks_router)
     app.include_router(admin_router, prefix = API_PREFIX)
     app.include_router(auth_router, prefix = API_PREFIX)
     app.include_router(user_router, prefix = API_PREFIX)
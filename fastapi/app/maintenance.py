@@ -0,0 +1,64 @@
+"""
+ⒸAngelaMos | 2026
+maintenance.py
+
+Run with: python -m maintenance [--loop]
+"""
+
+import argparse
+import asyncio
+
+from config import settings
+from core.constants import MAINTENANCE_LOCK_KEY
+from core.database import sessionmanager
+from core.logging import configure_logging
+from core.maintenance import MaintenanceJob, MaintenanceScheduler
+from auth.maintenance import (
+    maintain_refresh_token_partitions,
+    purge_expired_refresh_tokens,
+)
+
+
+MAINTENANCE_JOBS: dict[str, MaintenanceJob] = {
+    "maintain_refresh_token_partitions": maintain_refresh_token_partitions,
+    "purge_expired_refresh_tokens": purge_expired_refresh_tokens,
+}
+
+
+def create_scheduler() -> MaintenanceScheduler:
+    """
+    Scheduler for every registered maintenance job
+    """
+    return MaintenanceScheduler(
+        jobs = MAINTENANCE_JOBS,
+        interval_seconds = settings.MAINTENANCE_INTERVAL_SECONDS,
+        lock_key = MAINTENANCE_LOCK_KEY,
+    )
+
+
+async def run(loop: bool) -> None:
+    """
+    Run the jobs once, or on the configured interval until cancelled
+    """
+    configure_logging()
+    sessionmanager.init(str(settings.DATABASE_URL))
+    scheduler = create_scheduler()
+    try:
+        if loop:
+            scheduler.start()
+            await asyncio.Event().wait()
+        else:
+            await scheduler.run_once()
+    finally:
+        await scheduler.stop()
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Run maintenance jobs")
+    parser.add_argument(
+        "--loop",
+        action = "store_true",
+        help = "keep running on MAINTENANCE_INTERVAL_SECONDS",
+    )
+    asyncio.run(run(parser.parse_args().loop))
@@ -0,0 +1,81 @@
+"""
+ⒸAngelaMos | 2026
+read_your_writes.py
+"""
+
+import math
+import time
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from config import settings
+from core.constants import (
+    READ_PRIMARY_UNTIL_COOKIE,
+    READ_PRIMARY_UNTIL_HEADER,
+)
+from core.database import sessionmanager
+
+
+RequestResponseEndpoint = Callable[[Request], Awaitable[Response]]
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _primary_until(request: Request, now: float) -> float:
+    """
+    Deadline the client was handed after its last write, 0 if none
+
+    Clients control the value, so it is capped at one lag window from
+    now and anything that is not a finite number is ignored
+    """
+    raw = request.headers.get(READ_PRIMARY_UNTIL_HEADER) or request.cookies.get(
+        READ_PRIMARY_UNTIL_COOKIE
+    )
+    try:
+        until = float(raw) if raw else 0.0
+    except ValueError:
+        return 0.0
+    if not math.isfinite(until):
+        return 0.0
+    return min(until, now + settings.DB_REPLICA_MAX_LAG_SECONDS)
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Keeps a client's reads on the primary right after it writes
+
+    A successful unsafe request hands the client a deadline
+    DB_REPLICA_MAX_LAG_SECONDS ahead, as a cookie for browsers and a
+    header other clients can echo back. Until it passes, its requests are
+    flagged to read from the primary so a lagging replica cannot hide
+    what it just wrote
+    """
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: RequestResponseEndpoint,
+    ) -> Response:
+        now = time.time()
+        request.state.read_from_primary = _primary_until(request, now) > now
+
+        response = await call_next(request)
+
+        if (sessionmanager.has_replicas and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            until = f"{time.time() + settings.DB_REPLICA_MAX_LAG_SECONDS:.3f}"
+            response.headers[READ_PRIMARY_UNTIL_HEADER] = until
+            response.set_cookie(
+                key = READ_PRIMARY_UNTIL_COOKIE,
+                value = until,
+                httponly = True,
+                secure = settings.ENVIRONMENT.value != "development",
+                samesite = "lax",
+                max_age = math.ceil(settings.DB_REPLICA_MAX_LAG_SECONDS),
+                path = "/",
+            )
+        return response
@@ -6,7 +6,7 @@ repository.py
 from datetime import date
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ScalarSelect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.base_repository import BaseRepository
@@ -33,6 +33,17 @@ class PartnerRepository(BaseRepository[Partner]):
         )
         return result.scalars().first()
 
+    @classmethod
+    def id_for_user(cls, user_id: UUID) -> ScalarSelect[UUID]:
+        """
+        Scalar subquery resolving a user's partner ID inside other statements
+        """
+        return (
+            select(Partner.id)
+            .where(Partner.user_id == user_id)
+            .scalar_subquery()
+        )
+
     @classmethod
     async def exists_for_user(
         cls,
@@ -5,7 +5,7 @@ routes.py
 
 from fastapi import APIRouter, status
 
-from core.dependencies import CurrentUser
+from core.dependencies import CurrentPrincipal
 from core.responses import AUTH_401, CONFLICT_409, NOT_FOUND_404
 from .dependencies import PartnerServiceDep
 from .schemas import PartnerCreate, PartnerResponse, PartnerUpdate
@@ -25,7 +25,7 @@ router = APIRouter(prefix = "/partners", tags = ["partners"])
 )
 async def create_partner(
     partner_service: PartnerServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     data: PartnerCreate,
 ) -> PartnerResponse:
     """
@@ -44,7 +44,7 @@ async def create_partner(
 )
 async def get_my_partner(
     partner_service: PartnerServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> PartnerResponse:
     """
     Get current user's partner profile
@@ -62,7 +62,7 @@ async def get_my_partner(
 )
 async def update_my_partner(
     partner_service: PartnerServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     data: PartnerUpdate,
 ) -> PartnerResponse:
     """
@@ -81,7 +81,7 @@ async def update_my_partner(
 )
 async def delete_my_partner(
     partner_service: PartnerServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> None:
     """
     Delete current user's partner profile
@@ -96,7 +96,7 @@ async def delete_my_partner(
 )
 async def check_partner_exists(
     partner_service: PartnerServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
 ) -> bool:
     """
     Check if current user has a partner profile
@@ -8,6 +8,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import PartnerAlreadyExists, PartnerNotFound
+from cycle.cache import invalidate_cycle_state
 from .Partner import Partner
 from .repository import PartnerRepository
 from .schemas import PartnerCreate, PartnerResponse, PartnerUpdate
@@ -89,6 +90,7 @@ class PartnerService:
             partner,
             **update_dict,
         )
+        await invalidate_cycle_state(self.session, partner.id)
         return PartnerResponse.model_validate(updated)
 
     async def delete_partner(
@@ -103,6 +105,7 @@ class PartnerService:
             raise PartnerNotFound(str(user_id))
 
         await PartnerRepository.delete(self.session, partner)
+        await invalidate_cycle_state(self.session, partner.id, user_id)
 
     async def has_partner(
         self,
@@ -7,7 +7,12 @@ from .PeriodLog import PeriodLog
 from .repository import PeriodLogRepository
 from .service import PeriodLogService
 from .schemas import PeriodLogCreate, PeriodLogResponse, PeriodLogUpdate
-from .dependencies import PeriodLogServiceDep, get_period_log_service
+from .dependencies import (
+    PeriodLogReadServiceDep,
+    PeriodLogServiceDep,
+    get_period_log_read_service,
+    get_period_log_service,
+)
 from .routes import router
 
 __all__ = [
@@ -17,7 +22,9 @@ __all__ = [
     "PeriodLogCreate",
     "PeriodLogResponse",
     "PeriodLogUpdate",
+    "PeriodLogReadServiceDep",
     "PeriodLogServiceDep",
+    "get_period_log_read_service",
     "get_period_log_service",
     "router",
 ]
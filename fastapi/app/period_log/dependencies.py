@@ -7,7 +7,7 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from core.dependencies import DBSession
+from core.dependencies import DBSession, ReadDBSession
 from .service import PeriodLogService
 
 
@@ -19,3 +19,16 @@ def get_period_log_service(db: DBSession) -> PeriodLogService:
 
 
 PeriodLogServiceDep = Annotated[PeriodLogService, Depends(get_period_log_service)]
+
+
+def get_period_log_read_service(db: ReadDBSession) -> PeriodLogService:
+    """
+    Dependency to inject a PeriodLogService for read only routes
+    """
+    return PeriodLogService(db)
+
+
+PeriodLogReadServiceDep = Annotated[
+    PeriodLogService,
+    Depends(get_period_log_read_service),
+]
@@ -3,17 +3,89 @@
 repository.py
 """
 
-from collections.abc import Sequence
-from datetime import date
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+import uuid6
+from sqlalchemy import (
+    Date,
+    Integer,
+    and_,
+    case,
+    delete,
+    false,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
 
 from core.base_repository import BaseRepository
+from core.enums import FlowIntensity
+from core.export import RowStream
+from partner.Partner import Partner
+from partner.repository import PartnerRepository
 from .PeriodLog import PeriodLog
 
 
+RECORDED_CYCLE_MIN_DAYS = 21
+RECORDED_CYCLE_MAX_DAYS = 45
+
+EXPORT_COLUMNS = (
+    PeriodLog.id,
+    PeriodLog.start_date,
+    PeriodLog.end_date,
+    PeriodLog.cycle_length,
+    PeriodLog.flow_intensity,
+    PeriodLog.is_predicted,
+    PeriodLog.notes,
+    PeriodLog.created_at,
+)
+
+
+class DaysBetween(FunctionElement[int]):
+    """
+    Whole days from the second date to the first
+    """
+    type = Integer()
+    inherit_cache = True
+    name = "days_between"
+
+
+@compiles(DaysBetween)
+def _days_between_default(
+    element: DaysBetween,
+    compiler: SQLCompiler,
+    **kw: Any,
+) -> str:
+    later, earlier = list(element.clauses)
+    return (
+        f"({compiler.process(later, **kw)} - "
+        f"{compiler.process(earlier, **kw)})"
+    )
+
+
+@compiles(DaysBetween, "sqlite")
+def _days_between_sqlite(
+    element: DaysBetween,
+    compiler: SQLCompiler,
+    **kw: Any,
+) -> str:
+    later, earlier = list(element.clauses)
+    return (
+        f"CAST(julianday({compiler.process(later, **kw)}) - "
+        f"julianday({compiler.process(earlier, **kw)}) AS INTEGER)"
+    )
+
+
 class PeriodLogRepository(BaseRepository[PeriodLog]):
     """
     Database operations for PeriodLog model
@@ -40,6 +112,328 @@ class PeriodLogRepository(BaseRepository[PeriodLog]):
         )
         return result.scalars().all()
 
+    @classmethod
+    async def get_by_user_id(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[PeriodLog]:
+        """
+        Get period logs for a user's partner, ordered by start_date descending
+        """
+        result = await session.execute(
+            select(PeriodLog)
+            .join(Partner, Partner.id == PeriodLog.partner_id)
+            .where(Partner.user_id == user_id)
+            .order_by(PeriodLog.start_date.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    @classmethod
+    async def get_page_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[PeriodLog], str | None]:
+        """
+        Period logs of a user's partner, newest first, keyset paginated on
+        (start_date, id)
+        """
+        return await cls.get_page(
+            session,
+            limit,
+            cursor,
+            keys = (PeriodLog.start_date, PeriodLog.id),
+            descending = True,
+            statement = select(PeriodLog)
+            .join(Partner, Partner.id == PeriodLog.partner_id)
+            .where(Partner.user_id == user_id),
+        )
+
+    @classmethod
+    async def get_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_id: UUID,
+    ) -> PeriodLog | None:
+        """
+        Get a period log by ID if it belongs to the user's partner
+        """
+        result = await session.execute(
+            select(PeriodLog)
+            .join(Partner, Partner.id == PeriodLog.partner_id)
+            .where(PeriodLog.id == log_id, Partner.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def create_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        start_date: date,
+        end_date: date | None = None,
+        flow_intensity: FlowIntensity | None = None,
+        notes: str | None = None,
+    ) -> PeriodLog | None:
+        """
+        Insert an actual period log for a user's partner in one statement
+
+        cycle_length is derived from the partner's latest log when that log
+        is actual and a plausible cycle earlier. Returns None when the user
+        has no partner or a log already starts on start_date
+        """
+        start = literal(start_date, Date)
+        days = DaysBetween(start, PeriodLog.start_date)
+        cycle_length = (
+            select(
+                case(
+                    (
+                        and_(
+                            PeriodLog.is_predicted == false(),
+                            days.between(
+                                RECORDED_CYCLE_MIN_DAYS,
+                                RECORDED_CYCLE_MAX_DAYS,
+                            ),
+                        ),
+                        days,
+                    ),
+                    else_ = None,
+                )
+            )
+            .where(PeriodLog.partner_id == Partner.id)
+            .order_by(PeriodLog.start_date.desc())
+            .limit(1)
+            .correlate(Partner)
+            .scalar_subquery()
+        )
+
+        source = select(
+            literal(uuid6.uuid7(), PeriodLog.id.type),
+            Partner.id,
+            start,
+            literal(end_date, Date),
+            cycle_length,
+            literal(flow_intensity, PeriodLog.flow_intensity.type),
+            false(),
+            literal(notes, PeriodLog.notes.type),
+        ).where(Partner.user_id == user_id)
+
+        statement = (
+            cls.insert_statement(session)
+            .from_select(
+                [
+                    PeriodLog.id,
+                    PeriodLog.partner_id,
+                    PeriodLog.start_date,
+                    PeriodLog.end_date,
+                    PeriodLog.cycle_length,
+                    PeriodLog.flow_intensity,
+                    PeriodLog.is_predicted,
+                    PeriodLog.notes,
+                ],
+                source,
+            )
+            .on_conflict_do_nothing(
+                index_elements = [PeriodLog.partner_id, PeriodLog.start_date]
+            )
+            .returning(PeriodLog)
+        )
+        result = await session.execute(statement)
+        return result.scalars().first()
+
+    @classmethod
+    async def record_period_start(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+        start_date: date,
+    ) -> None:
+        """
+        Drop predictions after a new actual period and move the partner's
+        last_period_start to it
+
+        Postgres runs both writes as one statement through a DML CTE
+        """
+        purge = delete(PeriodLog).where(
+            PeriodLog.partner_id == partner_id,
+            PeriodLog.is_predicted == true(),
+            PeriodLog.start_date > start_date,
+        )
+        touch = (
+            update(Partner)
+            .where(Partner.id == partner_id)
+            .values(last_period_start = start_date)
+        )
+
+        if session.get_bind().dialect.name == "postgresql":
+            await session.execute(touch.add_cte(purge.cte("purged")))
+            return
+
+        await session.execute(purge)
+        await session.execute(touch)
+
+    @classmethod
+    async def update_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_id: UUID,
+        **kwargs: Any,
+    ) -> PeriodLog | None:
+        """
+        Update a period log owned by the user's partner in one statement
+        """
+        if not kwargs:
+            return await cls.get_for_user(session, user_id, log_id)
+
+        result = await session.execute(
+            update(PeriodLog)
+            .where(
+                PeriodLog.id == log_id,
+                PeriodLog.partner_id == PartnerRepository.id_for_user(user_id),
+            )
+            .values(**kwargs)
+            .returning(PeriodLog)
+            .execution_options(populate_existing = True)
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def delete_for_user(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        log_id: UUID,
+    ) -> UUID | None:
+        """
+        Delete a period log owned by the user's partner
+
+        Returns the partner ID of the deleted log, None if nothing matched
+        """
+        result = await session.execute(
+            delete(PeriodLog)
+            .where(
+                PeriodLog.id == log_id,
+                PeriodLog.partner_id == PartnerRepository.id_for_user(user_id),
+            )
+            .returning(PeriodLog.partner_id)
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def get_actual_starts(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+    ) -> Sequence[tuple[UUID, date, int | None]]:
+        """
+        (id, start_date, cycle_length) of every actual log for a partner
+        """
+        result = await session.execute(
+            select(PeriodLog.id, PeriodLog.start_date, PeriodLog.cycle_length)
+            .where(
+                PeriodLog.partner_id == partner_id,
+                PeriodLog.is_predicted == false(),
+            )
+            .order_by(PeriodLog.start_date)
+        )
+        return [
+            (row.id, row.start_date, row.cycle_length) for row in result.all()
+        ]
+
+    @classmethod
+    async def insert_many(
+        cls,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+    ) -> list[tuple[UUID, date]]:
+        """
+        Insert rows as one executemany, skipping existing start dates
+
+        Returns (id, start_date) of the rows actually inserted
+        """
+        if not rows:
+            return []
+        result = await session.execute(
+            cls.insert_statement(session)
+            .on_conflict_do_nothing(
+                index_elements = [PeriodLog.partner_id, PeriodLog.start_date]
+            )
+            .returning(PeriodLog.id, PeriodLog.start_date),
+            rows,
+        )
+        return [(row.id, row.start_date) for row in result.all()]
+
+    @classmethod
+    async def update_cycle_lengths(
+        cls,
+        session: AsyncSession,
+        cycle_lengths: Sequence[tuple[UUID, int | None]],
+    ) -> None:
+        """
+        Set cycle_length on many logs by ID as one executemany
+        """
+        if not cycle_lengths:
+            return
+        await session.execute(
+            update(PeriodLog),
+            [
+                {
+                    "id": log_id,
+                    "cycle_length": cycle_length
+                } for log_id, cycle_length in cycle_lengths
+            ],
+        )
+
+    @classmethod
+    def stream_for_partner(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+        batch_size: int,
+    ) -> RowStream:
+        """
+        Every log of a partner as plain rows from a server side cursor,
+        oldest first
+        """
+        async def batches() -> AsyncIterator[Sequence[Any]]:
+            result = await session.stream(
+                select(*EXPORT_COLUMNS)
+                .where(PeriodLog.partner_id == partner_id)
+                .order_by(PeriodLog.start_date)
+                .execution_options(yield_per = batch_size)
+            )
+            async for partition in result.partitions():
+                yield partition
+
+        return RowStream(
+            [column.key for column in EXPORT_COLUMNS],
+            batches(),
+        )
+
+    @classmethod
+    async def get_first_start(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+    ) -> date | None:
+        """
+        Earliest period start logged for a partner
+        """
+        result = await session.execute(
+            select(func.min(PeriodLog.start_date))
+            .where(PeriodLog.partner_id == partner_id)
+        )
+        return result.scalar_one_or_none()
+
     @classmethod
     async def get_by_partner_and_date(
         cls,
@@ -76,6 +470,36 @@ class PeriodLogRepository(BaseRepository[PeriodLog]):
         )
         return result.scalars().first()
 
+    @classmethod
+    async def get_overlapping_range(
+        cls,
+        session: AsyncSession,
+        partner_id: UUID,
+        start_date: date,
+        end_date: date,
+        open_period_days: int,
+    ) -> Sequence[PeriodLog]:
+        """
+        Get period logs whose span touches a date range
+
+        Logs without an end_date are assumed to last open_period_days
+        """
+        result = await session.execute(
+            select(PeriodLog)
+            .where(
+                PeriodLog.partner_id == partner_id,
+                PeriodLog.start_date <= end_date,
+                or_(
+                    PeriodLog.end_date >= start_date,
+                    PeriodLog.start_date >= start_date - timedelta(
+                        days = open_period_days
+                    ),
+                ),
+            )
+            .order_by(PeriodLog.start_date.desc())
+        )
+        return result.scalars().all()
+
     @classmethod
     async def get_actual_logs(
         cls,
@@ -107,8 +531,6 @@ class PeriodLogRepository(BaseRepository[PeriodLog]):
         """
         Delete predicted period logs after a given date (cleanup after new actual log)
         """
-        from sqlalchemy import delete
-
         result = await session.execute(
             delete(PeriodLog)
             .where(
@@ -5,11 +5,17 @@ routes.py
 
 from uuid import UUID
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from core.dependencies import CurrentUser
+from core.bulk import IMPORT_OPENAPI_EXTRA, read_import_entries
+from core.common_schemas import ImportResponse
+from core.constants import NEXT_CURSOR_HEADER
+from core.dependencies import CurrentPrincipal
+from core.enums import ExportFormat
+from core.export import export_response
 from core.responses import AUTH_401, CONFLICT_409, NOT_FOUND_404
-from .dependencies import PeriodLogServiceDep
+from .dependencies import PeriodLogReadServiceDep, PeriodLogServiceDep
 from .schemas import PeriodLogCreate, PeriodLogResponse, PeriodLogUpdate
 
 
@@ -28,7 +34,7 @@ router = APIRouter(prefix = "/partners/me/periods", tags = ["periods"])
 )
 async def create_period_log(
     period_log_service: PeriodLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     data: PeriodLogCreate,
 ) -> PeriodLogResponse:
     """
@@ -37,6 +43,50 @@ async def create_period_log(
     return await period_log_service.create_period_log(current_user.id, data)
 
 
+@router.post(
+    "/import",
+    response_model = ImportResponse,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+    openapi_extra = IMPORT_OPENAPI_EXTRA,
+)
+async def import_period_logs(
+    request: Request,
+    period_log_service: PeriodLogServiceDep,
+    current_user: CurrentPrincipal,
+) -> ImportResponse:
+    """
+    Bulk import historical period logs from a JSON array or NDJSON body
+    """
+    entries = await read_import_entries(request, PeriodLogCreate)
+    return await period_log_service.import_period_logs(current_user.id, entries)
+
+
+@router.get(
+    "/export",
+    response_class = StreamingResponse,
+    responses = {
+        **AUTH_401,
+        **NOT_FOUND_404
+    },
+)
+async def export_period_logs(
+    period_log_service: PeriodLogReadServiceDep,
+    current_user: CurrentPrincipal,
+    export_format: ExportFormat = Query(
+        default = ExportFormat.NDJSON,
+        alias = "format",
+    ),
+) -> StreamingResponse:
+    """
+    Stream the full history as NDJSON or CSV
+    """
+    stream = await period_log_service.export_period_logs(current_user.id)
+    return export_response(stream, export_format, "period-logs")
+
+
 @router.get(
     "",
     response_model = list[PeriodLogResponse],
@@ -46,20 +96,35 @@ async def create_period_log(
     },
 )
 async def get_period_logs(
-    period_log_service: PeriodLogServiceDep,
-    current_user: CurrentUser,
-    skip: int = Query(default = 0, ge = 0),
+    response: Response,
+    period_log_service: PeriodLogReadServiceDep,
+    current_user: CurrentPrincipal,
+    skip: int = Query(default = 0, ge = 0, deprecated = True),
     limit: int = Query(default = 20, ge = 1, le = 100),
+    cursor: str | None = Query(
+        default = None,
+        description = f"Opaque cursor from the {NEXT_CURSOR_HEADER} header",
+    ),
 ) -> list[PeriodLogResponse]:
     """
     Get period log history
     """
-    logs = await period_log_service.get_period_logs(
+    if skip:
+        logs = await period_log_service.get_period_logs(
+            current_user.id,
+            skip = skip,
+            limit = limit,
+        )
+        return list(logs)
+
+    page, next_cursor = await period_log_service.get_period_log_page(
         current_user.id,
-        skip = skip,
-        limit = limit,
+        limit,
+        cursor,
     )
-    return list(logs)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
 
 
 @router.get(
@@ -71,8 +136,8 @@ async def get_period_logs(
     },
 )
 async def get_period_log(
-    period_log_service: PeriodLogServiceDep,
-    current_user: CurrentUser,
+    period_log_service: PeriodLogReadServiceDep,
+    current_user: CurrentPrincipal,
     log_id: UUID,
 ) -> PeriodLogResponse:
     """
@@ -91,7 +156,7 @@ async def get_period_log(
 )
 async def update_period_log(
     period_log_service: PeriodLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     log_id: UUID,
     data: PeriodLogUpdate,
 ) -> PeriodLogResponse:
@@ -111,7 +176,7 @@ async def update_period_log(
 )
 async def delete_period_log(
     period_log_service: PeriodLogServiceDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     log_id: UUID,
 ) -> None:
     """
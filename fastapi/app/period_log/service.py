@@ -3,18 +3,68 @@
 service.py
 """
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from datetime import date
+from typing import NoReturn
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
+from core.bulk import chunked
+from core.common_schemas import ImportResponse
+from core.export import RowStream
 from core.exceptions import PeriodLogNotFound, PeriodLogAlreadyExists, PartnerNotFound
+from cycle.cache import invalidate_cycle_state
 from partner.repository import PartnerRepository
-from .PeriodLog import PeriodLog
-from .repository import PeriodLogRepository
+from .repository import (
+    RECORDED_CYCLE_MAX_DAYS,
+    RECORDED_CYCLE_MIN_DAYS,
+    PeriodLogRepository,
+)
 from .schemas import PeriodLogCreate, PeriodLogResponse, PeriodLogUpdate
 
 
+def derive_cycle_lengths(
+    existing: Iterable[tuple[UUID, date, int | None]],
+    new_starts: Iterable[date],
+) -> tuple[dict[date, int | None], list[tuple[UUID, int | None]]]:
+    """
+    Cycle lengths for new period starts in one sorted pass
+
+    Each start's cycle_length is the gap to the previous actual start when
+    it is a plausible cycle. Existing logs that directly follow a new start
+    are recomputed too, returned as (id, cycle_length) when they change
+    """
+    stored = {
+        start: (log_id, cycle_length)
+        for log_id, start, cycle_length in existing
+    }
+    lengths: dict[date, int | None] = {}
+    changed: list[tuple[UUID, int | None]] = []
+
+    previous: date | None = None
+    previous_is_new = False
+    for start in sorted(stored.keys() | set(new_starts)):
+        cycle_length = None
+        if previous is not None:
+            days = (start - previous).days
+            if RECORDED_CYCLE_MIN_DAYS <= days <= RECORDED_CYCLE_MAX_DAYS:
+                cycle_length = days
+
+        if start in stored:
+            log_id, current = stored[start]
+            if previous_is_new and current != cycle_length:
+                changed.append((log_id, cycle_length))
+            previous_is_new = False
+        else:
+            lengths[start] = cycle_length
+            previous_is_new = True
+        previous = start
+
+    return lengths, changed
+
+
 class PeriodLogService:
     """
     Business logic for period log operations
@@ -22,14 +72,13 @@ class PeriodLogService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def _get_partner_id(self, user_id: UUID) -> UUID:
+    async def _raise_not_found(self, user_id: UUID, log_id: UUID) -> NoReturn:
         """
-        Get partner ID for user, raise if not found
+        Raise the error explaining why a user scoped lookup matched nothing
         """
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if not partner:
+        if not await PartnerRepository.exists_for_user(self.session, user_id):
             raise PartnerNotFound(str(user_id))
-        return partner.id
+        raise PeriodLogNotFound(str(log_id))
 
     async def create_period_log(
         self,
@@ -39,52 +88,152 @@ class PeriodLogService:
         """
         Create a new period log entry
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        existing = await PeriodLogRepository.get_by_partner_and_date(
+        period_log = await PeriodLogRepository.create_for_user(
             self.session,
-            partner_id,
-            data.start_date,
+            user_id,
+            start_date = data.start_date,
+            end_date = data.end_date,
+            flow_intensity = data.flow_intensity,
+            notes = data.notes,
         )
-        if existing:
+        if period_log is None:
+            if not await PartnerRepository.exists_for_user(self.session,
+                                                           user_id):
+                raise PartnerNotFound(str(user_id))
             raise PeriodLogAlreadyExists(str(data.start_date))
 
-        previous_log = await PeriodLogRepository.get_latest_for_partner(
+        await PeriodLogRepository.record_period_start(
             self.session,
-            partner_id,
+            period_log.partner_id,
+            data.start_date,
         )
-        cycle_length = None
-        if previous_log and not previous_log.is_predicted:
-            days_diff = (data.start_date - previous_log.start_date).days
-            if 21 <= days_diff <= 45:
-                cycle_length = days_diff
 
-        await PeriodLogRepository.delete_predicted_after_date(
+        await invalidate_cycle_state(self.session, period_log.partner_id)
+        return PeriodLogResponse.model_validate(period_log)
+
+    async def import_period_logs(
+        self,
+        user_id: UUID,
+        entries: Sequence[PeriodLogCreate],
+    ) -> ImportResponse:
+        """
+        Bulk import historical period logs
+
+        Entries whose start date is already logged, or repeated within the
+        import, are skipped. New rows are inserted in executemany batches.
+        Rows the insert skips on conflict, such as a predicted log on the
+        same date, do not count, lengths and the partner follow only the
+        rows it returned
+        """
+        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
+        if not partner:
+            raise PartnerNotFound(str(user_id))
+
+        existing = await PeriodLogRepository.get_actual_starts(
             self.session,
-            partner_id,
-            data.start_date,
+            partner.id,
         )
+        known = {start for _, start, _ in existing}
+        fresh: dict[date, PeriodLogCreate] = {}
+        for entry in entries:
+            if entry.start_date not in known:
+                fresh.setdefault(entry.start_date, entry)
+
+        if not fresh:
+            return ImportResponse(
+                received = len(entries),
+                imported = 0,
+                skipped = len(entries),
+            )
+
+        cycle_lengths, _ = derive_cycle_lengths(existing, fresh)
+        rows = [
+            {
+                "partner_id": partner.id,
+                "start_date": start,
+                "end_date": fresh[start].end_date,
+                "flow_intensity": fresh[start].flow_intensity,
+                "notes": fresh[start].notes,
+                "cycle_length": cycle_lengths[start],
+                "is_predicted": False,
+            } for start in sorted(fresh)
+        ]
+
+        inserted: dict[date, UUID] = {}
+        for batch in chunked(rows, settings.IMPORT_BATCH_SIZE):
+            for log_id, start in await PeriodLogRepository.insert_many(
+                    self.session, batch):
+                inserted[start] = log_id
+        imported = len(inserted)
+        if not inserted:
+            return ImportResponse(
+                received = len(entries),
+                imported = 0,
+                skipped = len(entries),
+            )
+
+        inserted_lengths, changed = derive_cycle_lengths(existing, inserted)
+        changed += [
+            (inserted[start], cycle_length)
+            for start, cycle_length in inserted_lengths.items()
+            if cycle_length != cycle_lengths[start]
+        ]
+        await PeriodLogRepository.update_cycle_lengths(self.session, changed)
 
-        period_log = await PeriodLogRepository.create(
+        await PeriodLogRepository.delete_predicted_after_date(
             self.session,
-            partner_id = partner_id,
-            start_date = data.start_date,
-            end_date = data.end_date,
-            flow_intensity = data.flow_intensity,
-            notes = data.notes,
-            cycle_length = cycle_length,
-            is_predicted = False,
+            partner.id,
+            min(inserted),
         )
-
-        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
-        if partner:
+        latest = max(inserted)
+        current = partner.last_period_start
+        if current is None or latest > current:
             await PartnerRepository.update_last_period(
                 self.session,
                 partner,
-                data.start_date,
+                latest,
             )
 
-        return PeriodLogResponse.model_validate(period_log)
+        await invalidate_cycle_state(self.session, partner.id)
+        return ImportResponse(
+            received = len(entries),
+            imported = imported,
+            skipped = len(entries) - imported,
+        )
+
+    async def export_period_logs(self, user_id: UUID) -> RowStream:
+        """
+        Stream every period log of the user's partner
+        """
+        partner = await PartnerRepository.get_by_user_id(self.session, user_id)
+        if not partner:
+            raise PartnerNotFound(str(user_id))
+
+        return PeriodLogRepository.stream_for_partner(
+            self.session,
+            partner.id,
+            batch_size = settings.EXPORT_BATCH_SIZE,
+        )
+
+    async def get_period_log_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[list[PeriodLogResponse], str | None]:
+        """
+        Get one keyset page of period logs and the next page cursor
+        """
+        logs, next_cursor = await PeriodLogRepository.get_page_for_user(
+            self.session,
+            user_id,
+            limit,
+            cursor,
+        )
+        if not logs and not await PartnerRepository.exists_for_user(
+                self.session, user_id):
+            raise PartnerNotFound(str(user_id))
+        return [PeriodLogResponse.model_validate(log) for log in logs], next_cursor
 
     async def get_period_logs(
         self,
@@ -95,14 +244,15 @@ class PeriodLogService:
         """
         Get period logs for user's partner
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        logs = await PeriodLogRepository.get_by_partner_id(
+        logs = await PeriodLogRepository.get_by_user_id(
             self.session,
-            partner_id,
+            user_id,
             skip = skip,
             limit = limit,
         )
+        if not logs and not await PartnerRepository.exists_for_user(
+                self.session, user_id):
+            raise PartnerNotFound(str(user_id))
         return [PeriodLogResponse.model_validate(log) for log in logs]
 
     async def get_period_log(
@@ -113,11 +263,13 @@ class PeriodLogService:
         """
         Get a specific period log by ID
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await PeriodLogRepository.get_by_id(self.session, log_id)
-        if not log or log.partner_id != partner_id:
-            raise PeriodLogNotFound(str(log_id))
+        log = await PeriodLogRepository.get_for_user(
+            self.session,
+            user_id,
+            log_id,
+        )
+        if not log:
+            await self._raise_not_found(user_id, log_id)
 
         return PeriodLogResponse.model_validate(log)
 
@@ -130,18 +282,17 @@ class PeriodLogService:
         """
         Update a period log entry
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await PeriodLogRepository.get_by_id(self.session, log_id)
-        if not log or log.partner_id != partner_id:
-            raise PeriodLogNotFound(str(log_id))
-
         update_dict = data.model_dump(exclude_unset = True)
-        updated = await PeriodLogRepository.update(
+        updated = await PeriodLogRepository.update_for_user(
             self.session,
-            log,
+            user_id,
+            log_id,
             **update_dict,
         )
+        if not updated:
+            await self._raise_not_found(user_id, log_id)
+
+        await invalidate_cycle_state(self.session, updated.partner_id)
         return PeriodLogResponse.model_validate(updated)
 
     async def delete_period_log(
@@ -152,10 +303,12 @@ class PeriodLogService:
         """
         Delete a period log entry
         """
-        partner_id = await self._get_partner_id(user_id)
-
-        log = await PeriodLogRepository.get_by_id(self.session, log_id)
-        if not log or log.partner_id != partner_id:
-            raise PeriodLogNotFound(str(log_id))
+        partner_id = await PeriodLogRepository.delete_for_user(
+            self.session,
+            user_id,
+            log_id,
+        )
+        if not partner_id:
+            await self._raise_not_found(user_id, log_id)
 
-        await PeriodLogRepository.delete(self.session, log)
+        await invalidate_cycle_state(self.session, partner_id)
@@ -0,0 +1,116 @@
+"""
+ⒸAngelaMos | 2026
+serve.py
+
+Run with: python -m serve
+"""
+
+import gc
+from typing import Any, ClassVar
+
+from fastapi import FastAPI
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+from uvicorn.workers import UvicornWorker
+
+from config import settings
+from core.workers import worker_count
+
+
+# Seconds reserved after uvicorn stops waiting on requests for the
+# lifespan shutdown to close database and Redis pools before gunicorn
+# kills the worker
+SHUTDOWN_MARGIN_SECONDS = 5
+
+
+class AppWorker(UvicornWorker):
+    """
+    Uvicorn worker on the configured event loop and HTTP parser
+
+    On SIGTERM uvicorn stops accepting connections and waits for in
+    flight requests, so their sessions commit, then runs the lifespan
+    shutdown that disposes the pools
+    """
+    # uvicorn annotates it without ClassVar though it is only read off the class
+    CONFIG_KWARGS: ClassVar[dict[str, Any]] = {  # type: ignore[misc]
+        "loop": settings.SERVER_LOOP,
+        "http": settings.SERVER_HTTP,
+        "timeout_graceful_shutdown": max(
+            settings.SERVER_GRACEFUL_TIMEOUT - SHUTDOWN_MARGIN_SECONDS,
+            1,
+        ),
+    }
+
+
+def pre_fork(_server: Arbiter, _worker: Worker) -> None:
+    """
+    Move everything the master loaded out of the collector's reach
+
+    Frozen objects are never scanned, so collections in the workers do not
+    write to their headers and the preloaded pages stay shared
+    """
+    gc.freeze()
+
+
+def post_fork(_server: Arbiter, _worker: Worker) -> None:
+    gc.enable()
+
+
+def gunicorn_options() -> dict[str, Any]:
+    """
+    Gunicorn settings derived from Settings
+    """
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": worker_count(),
+        "worker_class": AppWorker,
+        "preload_app": settings.SERVER_PRELOAD,
+        "backlog": settings.SERVER_BACKLOG,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "timeout": settings.SERVER_TIMEOUT,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "accesslog": "-",
+        "errorlog": "-",
+        "pre_fork": pre_fork,
+        "post_fork": post_fork,
+    }
+
+
+class Server(BaseApplication):  # type: ignore[misc]
+    """
+    Gunicorn arbiter serving the app with AppWorker processes
+
+    With preload the master builds the app once with the collector off,
+    so workers fork from a fully imported process instead of importing
+    everything again on every recycle
+    """
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> FastAPI:
+        # Imported here so a preloading master has the collector off
+        # before the app's modules are loaded
+        if self.cfg.preload_app:
+            gc.disable()
+        from factory import create_app
+
+        return create_app()
+
+
+def main() -> None:
+    """
+    Serve the app with gunicorn until SIGTERM drains it
+    """
+    Server(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    main()
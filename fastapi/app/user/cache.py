@@ -0,0 +1,113 @@
+"""
+ⒸAngelaMos | 2026
+cache.py
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings, UserRole
+from core.cache import TieredCache, VersionCounter
+from core.database import run_after_commit
+
+if TYPE_CHECKING:
+    from .User import User
+
+
+class UserPrincipal(BaseModel):
+    """
+    Fields needed to authorize a request for a user
+    """
+    id: UUID
+    token_version: int
+    is_active: bool
+    role: UserRole
+
+    @classmethod
+    def from_user(cls, user: User) -> UserPrincipal:
+        """
+        Build a principal from a user row
+        """
+        return cls(
+            id = user.id,
+            token_version = user.token_version,
+            is_active = user.is_active,
+            role = user.role,
+        )
+
+
+class UserPrincipalCache:
+    """
+    User principals keyed by user id and version
+
+    Any write to a user's token version, active flag or role bumps the
+    version so principals loaded from older rows become unreachable
+    """
+    def __init__(self) -> None:
+        ttl = settings.USER_CACHE_TTL_SECONDS
+        self._principals: TieredCache[UserPrincipal] = TieredCache(
+            namespace = "user:principal",
+            ttl_seconds = ttl,
+            encode = UserPrincipal.model_dump_json,
+            decode = UserPrincipal.model_validate_json,
+        )
+        self._versions = VersionCounter("user:version", ttl_seconds = ttl * 2)
+
+    async def get(self, user_id: UUID) -> UserPrincipal | None:
+        """
+        Cached principal for a user, None on a miss
+        """
+        version = await self._versions.get(str(user_id))
+        return await self._principals.get(f"{user_id}:{version}")
+
+    async def version(self, user_id: UUID) -> int:
+        """
+        Version to read before loading the user row
+        """
+        return await self._versions.get(str(user_id))
+
+    async def set(self, principal: UserPrincipal, version: int) -> None:
+        """
+        Store a principal loaded under a version
+        """
+        if version < 0:
+            return
+        await self._principals.set(f"{principal.id}:{version}", principal)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """
+        Drop the current principal and move the user to a new version
+        """
+        version = await self._versions.get(str(user_id))
+        await self._principals.delete(f"{user_id}:{version}")
+        await self._versions.bump(str(user_id))
+
+    def clear_local(self) -> None:
+        """
+        Drop every in process entry
+        """
+        self._principals.clear_local()
+        self._versions.clear_local()
+
+
+user_principal_cache = UserPrincipalCache()
+
+
+async def invalidate_user_principal(
+    session: AsyncSession,
+    user_id: UUID,
+) -> None:
+    """
+    Invalidate now and again after the session commits
+    """
+    await user_principal_cache.invalidate(user_id)
+
+    async def invalidate_after_commit() -> None:
+        await user_principal_cache.invalidate(user_id)
+
+    run_after_commit(session, invalidate_after_commit)
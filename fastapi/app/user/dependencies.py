@@ -7,7 +7,7 @@ from typing import Annotated
 
 from fastapi import Depends
 
-from core.dependencies import DBSession
+from core.dependencies import DBSession, ReadDBSession
 from .service import UserService
 
 
@@ -19,3 +19,16 @@ def get_user_service(db: DBSession) -> UserService:
 
 
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+
+
+def get_user_read_service(db: ReadDBSession) -> UserService:
+    """
+    Dependency to inject a UserService for read only routes
+    """
+    return UserService(db)
+
+
+UserReadServiceDep = Annotated[
+    UserService,
+    Depends(get_user_read_service),
+]
@@ -7,9 +7,12 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import UserRole
+from config import settings, UserRole
 from .User import User
+from .cache import invalidate_user_principal
 from core.base_repository import BaseRepository
+from core.cache import TieredCache
+from core.revocation import record_token_version
 
 
 class UserRepository(BaseRepository[User]):
@@ -17,6 +20,12 @@ class UserRepository(BaseRepository[User]):
     Repository for User model database operations
     """
     model = User
+    count_cache = TieredCache(
+        namespace = "count",
+        ttl_seconds = settings.COUNT_CACHE_TTL_SECONDS,
+        encode = str,
+        decode = int,
+    )
 
     @classmethod
     async def get_by_email(
@@ -78,6 +87,7 @@ class UserRepository(BaseRepository[User]):
         session.add(user)
         await session.flush()
         await session.refresh(user)
+        await cls.invalidate_count(session)
         return user
 
     @classmethod
@@ -94,6 +104,8 @@ class UserRepository(BaseRepository[User]):
         user.increment_token_version()
         await session.flush()
         await session.refresh(user)
+        await invalidate_user_principal(session, user.id)
+        record_token_version(session, user.id, user.token_version)
         return user
 
     @classmethod
@@ -108,4 +120,6 @@ class UserRepository(BaseRepository[User]):
         user.increment_token_version()
         await session.flush()
         await session.refresh(user)
+        await invalidate_user_principal(session, user.id)
+        record_token_version(session, user.id, user.token_version)
         return user
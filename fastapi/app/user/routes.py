@@ -10,11 +10,15 @@ from fastapi import (
     status,
 )
 
-from core.dependencies import CurrentUser
+from core.dependencies import (
+    CurrentPrincipal,
+    CurrentUser,
+)
 from core.responses import (
     AUTH_401,
     CONFLICT_409,
     NOT_FOUND_404,
+    UNAVAILABLE_503,
 )
 from .schemas import (
     UserCreate,
@@ -31,7 +35,10 @@ router = APIRouter(prefix = "/users", tags = ["users"])
     "",
     response_model = UserResponse,
     status_code = status.HTTP_201_CREATED,
-    responses = {**CONFLICT_409},
+    responses = {
+        **CONFLICT_409,
+        **UNAVAILABLE_503
+    },
 )
 async def create_user(
     user_service: UserServiceDep,
@@ -54,7 +61,7 @@ async def create_user(
 async def get_user(
     user_service: UserServiceDep,
     user_id: UUID,
-    _: CurrentUser,
+    _: CurrentPrincipal,
 ) -> UserResponse:
     """
     Get user by ID
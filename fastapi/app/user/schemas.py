@@ -10,6 +10,7 @@ from pydantic import (
 )
 
 from config import (
+    CountStrategy,
     UserRole,
     FULL_NAME_MAX_LENGTH,
     PASSWORD_MAX_LENGTH,
@@ -105,5 +106,7 @@ class UserListResponse(BaseSchema):
     """
     items: list[UserResponse]
     total: int
-    page: int
+    count_strategy: CountStrategy
+    page: int | None
     size: int
+    next_cursor: str | None = None
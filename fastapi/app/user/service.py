@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
-from config import settings, UserRole
+from config import settings, CountStrategy, UserRole
 from core.exceptions import (
     EmailAlreadyExists,
     InvalidCredentials,
@@ -27,6 +27,7 @@ from .schemas import (
     UserUpdateAdmin,
 )
 from .User import User
+from .cache import invalidate_user_principal
 from .repository import UserRepository
 
 
@@ -131,28 +132,47 @@ class UserService:
             user,
             is_active = False
         )
+        await invalidate_user_principal(self.session, user.id)
         return UserResponse.model_validate(updated)
 
     async def list_users(
         self,
-        page: int,
+        page: int | None,
         size: int,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None,
     ) -> UserListResponse:
         """
         List users with pagination
+
+        Without a page number users are keyset paginated by id, which is
+        time ordered, and next_cursor points at the following page. The
+        total uses USER_COUNT_STRATEGY unless a strategy is given
         """
-        skip = (page - 1) * size
-        users = await UserRepository.get_multi(
+        next_cursor = None
+        if page is not None:
+            users = await UserRepository.get_multi(
+                self.session,
+                skip = (page - 1) * size,
+                limit = size
+            )
+        else:
+            users, next_cursor = await UserRepository.get_page(
+                self.session,
+                size,
+                cursor,
+            )
+        total, used_strategy = await UserRepository.count_with(
             self.session,
-            skip = skip,
-            limit = size
+            count_strategy or settings.USER_COUNT_STRATEGY,
         )
-        total = await UserRepository.count(self.session)
         return UserListResponse(
             items = [UserResponse.model_validate(u) for u in users],
             total = total,
+            count_strategy = used_strategy,
             page = page,
             size = size,
+            next_cursor = next_cursor,
         )
 
     async def admin_create_user(
@@ -205,6 +225,7 @@ class UserService:
             user,
             **update_dict
         )
+        await invalidate_user_principal(self.session, user_id)
         return UserResponse.model_validate(updated_user)
 
     async def admin_delete_user(
@@ -219,3 +240,4 @@ class UserService:
             raise UserNotFound(str(user_id))
 
         await UserRepository.delete(self.session, user)
+        await invalidate_user_principal(self.session, user_id)
@@ -14,6 +14,7 @@ import hashlib
 import secrets
 from datetime import (
     UTC,
+    date,
     datetime,
     timedelta,
 )
@@ -33,15 +34,26 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.pool import StaticPool
 
 from core.security import (
+    access_token_cache,
     hash_password,
     create_access_token,
 )
 from config import UserRole
-from core.database import get_db_session
+from core import dependencies, revocation
+from core.database import get_db_session, get_read_db_session
+from core.rate_limit import SharedWindowStore, rate_limiter
+from core.revocation import RedisRevocationStore
+from cycle.cache import cycle_state_cache
+from user.cache import user_principal_cache
+from user.repository import UserRepository
+from auth import service as auth_service
 
 from core.Base import Base
 from user.User import User
 from auth.RefreshToken import RefreshToken
+from partner.Partner import Partner
+from period_log.PeriodLog import PeriodLog
+from daily_log.DailyLog import DailyLog
 
 
 @pytest_asyncio.fixture(scope = "session", loop_scope = "session")
@@ -96,6 +108,7 @@ async def client(db_session: AsyncSession) -> AsyncIterator[AsyncClient]:
         yield db_session
 
     app.dependency_overrides[get_db_session] = override_get_db
+    app.dependency_overrides[get_read_db_session] = override_get_db
 
     async with AsyncClient(
             transport = ASGITransport(app = app),
@@ -175,7 +188,7 @@ class RefreshTokenFactory:
     ) -> tuple[RefreshToken,
                str]:
         raw_token = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        token_hash = hashlib.sha256(raw_token.encode()).digest()
 
         token = RefreshToken(
             user_id = user.id,
@@ -190,6 +203,34 @@ class RefreshTokenFactory:
         return token, raw_token
 
 
+class PartnerFactory:
+    """
+    Factory for creating test partner profiles
+    """
+    @classmethod
+    async def create(
+        cls,
+        session: AsyncSession,
+        user: User,
+        *,
+        name: str = "Test Partner",
+        average_cycle_length: int = 28,
+        average_period_length: int = 5,
+        last_period_start: date | None = None,
+    ) -> Partner:
+        partner = Partner(
+            user_id = user.id,
+            name = name,
+            average_cycle_length = average_cycle_length,
+            average_period_length = average_period_length,
+            last_period_start = last_period_start,
+        )
+        session.add(partner)
+        await session.flush()
+        await session.refresh(partner)
+        return partner
+
+
 @pytest.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """
@@ -222,6 +263,14 @@ async def inactive_user(db_session: AsyncSession) -> User:
     )
 
 
+@pytest.fixture
+async def test_partner(db_session: AsyncSession, test_user: User) -> Partner:
+    """
+    Partner profile for test_user
+    """
+    return await PartnerFactory.create(db_session, test_user)
+
+
 @pytest.fixture
 def access_token(test_user: User) -> str:
     """
@@ -282,6 +331,54 @@ async def revoked_refresh_token_pair(
     )
 
 
+class FakeRedis:
+    """
+    In memory stand in for the few Redis commands the revocation store uses
+    """
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: object, **_options):
+        self.data[key] = str(value)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    def register_script(self, _script: str):
+        async def set_max(keys: list[str], args: list[object]) -> int:
+            version = int(str(args[0]))
+            if int(self.data.get(keys[0], -1)) < version:
+                self.data[keys[0]] = str(version)
+            return 1
+
+        return set_max
+
+
+@pytest.fixture
+def redis_revocation_store(monkeypatch) -> RedisRevocationStore:
+    """
+    Redis revocation store on a fake client, used by every auth check
+    """
+    fake = FakeRedis()
+    store = RedisRevocationStore(ttl_seconds = 60, client = lambda: fake)
+    for module in (revocation, dependencies, auth_service):
+        monkeypatch.setattr(module, "revocation_store", store)
+    return store
+
+
+@pytest.fixture(scope = "session", autouse = True)
+def rate_limit_store(tmp_path_factory: pytest.TempPathFactory):
+    """
+    Keep fallback rate limit counters out of the host wide file
+    """
+    rate_limiter.fallback = SharedWindowStore(
+        tmp_path_factory.mktemp("rate_limit") / "rate_limit.sqlite3"
+    )
+
+
 @pytest.fixture(autouse = True)
 def reset_factories():
     """
@@ -289,3 +386,16 @@ def reset_factories():
     """
     yield
     UserFactory.reset()
+
+
+@pytest.fixture(autouse = True)
+def clear_caches():
+    """
+    Drop in process cache entries between tests
+    """
+    yield
+    cycle_state_cache.clear_local()
+    user_principal_cache.clear_local()
+    UserRepository.count_cache.clear_local()
+    access_token_cache.clear()
+    rate_limiter.reset()
@@ -147,6 +147,31 @@ async def test_admin_update_user(
     assert data["id"] == str(test_user.id)
 
 
+@pytest.mark.asyncio
+async def test_admin_deactivate_user_rejects_cached_token(
+    client: AsyncClient,
+    admin_auth_headers: dict[str, str],
+    auth_headers: dict[str, str],
+    test_user: User,
+):
+    """
+    Deactivating a user blocks tokens already resolved from cache
+    """
+    url_user = f"/v1/users/{test_user.id}"
+    response = await client.get(url_user, headers = auth_headers)
+    assert response.status_code == 200
+
+    response = await client.patch(
+        url_admin_user_by_id(str(test_user.id)),
+        headers = admin_auth_headers,
+        json = {"is_active": False},
+    )
+    assert response.status_code == 200
+
+    response = await client.get(url_user, headers = auth_headers)
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_admin_update_user_not_found(
     client: AsyncClient,
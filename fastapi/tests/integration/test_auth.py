@@ -3,11 +3,21 @@
 test_auth.py
 """
 
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from user.User import User
 from auth.RefreshToken import RefreshToken
+from auth.repository import RefreshTokenRepository
+from config import settings
+from core.hashing import hashing_executor
+from core.rate_limit import parse_limits, rate_limiter
+from core.revocation import RedisRevocationStore
 
 
 URL_LOGIN = "/v1/auth/login"
@@ -16,6 +26,7 @@ URL_LOGOUT = "/v1/auth/logout"
 URL_LOGOUT_ALL = "/v1/auth/logout-all"
 URL_ME = "/v1/auth/me"
 URL_CHANGE_PASSWORD = "/v1/auth/change-password"
+URL_JWKS = "/.well-known/jwks.json"
 
 
 @pytest.mark.asyncio
@@ -116,6 +127,95 @@ async def test_refresh_token_success(
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_family(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    refresh_token_pair: tuple[RefreshToken,
+                              str],
+):
+    """
+    Rotating one token twice fails and revokes its successor too
+    """
+    stored, raw_token = refresh_token_pair
+
+    first = await client.post(
+        URL_REFRESH,
+        cookies = {"refresh_token": raw_token},
+    )
+    assert first.status_code == 200
+    successor = first.cookies["refresh_token"]
+
+    replay = await client.post(
+        URL_REFRESH,
+        cookies = {"refresh_token": raw_token},
+    )
+    assert replay.status_code == 401
+
+    family = await db_session.scalars(
+        select(RefreshToken).where(
+            RefreshToken.family_id == stored.family_id
+        ).execution_options(populate_existing = True)
+    )
+    tokens = family.all()
+    assert len(tokens) == 2
+    assert all(token.is_revoked for token in tokens)
+
+    after = await client.post(
+        URL_REFRESH,
+        cookies = {"refresh_token": successor},
+    )
+    assert after.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_family_revoked_in_store(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    refresh_token_pair: tuple[RefreshToken,
+                              str],
+    redis_revocation_store: RedisRevocationStore,
+):
+    """
+    A family the store knows is revoked cannot be extended
+    """
+    stored, raw_token = refresh_token_pair
+    await redis_revocation_store.revoke_family(stored.family_id)
+
+    response = await client.post(
+        URL_REFRESH,
+        cookies = {"refresh_token": raw_token},
+    )
+
+    assert response.status_code == 401
+    family = await db_session.scalars(
+        select(RefreshToken).where(
+            RefreshToken.family_id == stored.family_id
+        ).execution_options(populate_existing = True)
+    )
+    assert all(token.is_revoked for token in family.all())
+
+
+@pytest.mark.asyncio
+async def test_access_token_below_store_version_rejected(
+    client: AsyncClient,
+    test_user: User,
+    auth_headers: dict[str, str],
+    redis_revocation_store: RedisRevocationStore,
+):
+    """
+    Tokens older than the stored version are rejected
+    """
+    await redis_revocation_store.set_token_version(
+        test_user.id,
+        test_user.token_version + 1,
+    )
+
+    response = await client.get(URL_ME, headers = auth_headers)
+
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_refresh_token_missing_returns_401(client: AsyncClient):
     """
@@ -213,6 +313,27 @@ async def test_logout_all(
     assert "revoked_sessions" in data
 
 
+@pytest.mark.asyncio
+async def test_logout_all_revokes_cached_access_token(
+    client: AsyncClient,
+    test_user: User,
+    auth_headers: dict[str,
+                       str],
+):
+    """
+    Access tokens stop working after logout all even once cached
+    """
+    url_user = f"/v1/users/{test_user.id}"
+    response = await client.get(url_user, headers = auth_headers)
+    assert response.status_code == 200
+
+    response = await client.post(URL_LOGOUT_ALL, headers = auth_headers)
+    assert response.status_code == 200
+
+    response = await client.get(url_user, headers = auth_headers)
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_get_current_user(
     client: AsyncClient,
@@ -286,3 +407,117 @@ async def test_change_password_wrong_current(
     )
 
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_cleanup_expired_deletes_in_batches(
+    db_session: AsyncSession,
+    test_user: User,
+    refresh_token_pair: tuple[RefreshToken,
+                              str],
+):
+    """
+    Expired tokens are purged across several batches, live ones stay
+    """
+    db_session.add_all([
+        RefreshToken(
+            user_id = test_user.id,
+            token_hash = f"expired-{i}".encode(),
+            family_id = uuid4(),
+            expires_at = datetime.now(UTC) - timedelta(days = i + 1),
+        ) for i in range(5)
+    ])
+    await db_session.flush()
+
+    deleted = await RefreshTokenRepository.cleanup_expired(
+        db_session,
+        batch_size = 2,
+    )
+
+    assert deleted == 5
+    remaining = await db_session.scalar(
+        select(func.count()).select_from(RefreshToken)
+    )
+    assert remaining == 1
+
+
+@pytest.mark.asyncio
+async def test_partition_maintenance_is_noop_off_postgres(
+    db_session: AsyncSession,
+    refresh_token_pair: tuple[RefreshToken,
+                              str],
+):
+    """
+    Unpartitioned databases neither create nor drop partitions
+    """
+    created = await RefreshTokenRepository.create_partitions(db_session, 2)
+    dropped = await RefreshTokenRepository.drop_expired_partitions(
+        db_session,
+        datetime.now(UTC) + timedelta(days = 365),
+    )
+
+    assert (created, dropped) == (0, 0)
+    remaining = await db_session.scalar(
+        select(func.count()).select_from(RefreshToken)
+    )
+    assert remaining == 1
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_after_budget_spent(
+    client: AsyncClient,
+    test_user: User,
+):
+    """
+    Logins beyond RATE_LIMIT_AUTH answer 429 with Retry-After
+    """
+    limits = parse_limits(settings.RATE_LIMIT_AUTH)
+    for _ in range(limits[0].amount):
+        await rate_limiter.hit("login:127.0.0.1", limits)
+
+    response = await client.post(
+        URL_LOGIN,
+        data = {
+            "username": test_user.email,
+            "password": "TestPass123",
+        },
+    )
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_login_sheds_load_when_hashing_pool_is_full(
+    client: AsyncClient,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    A saturated hashing pool answers 503 with Retry-After
+    """
+    monkeypatch.setattr(hashing_executor, "max_workers", 0)
+    monkeypatch.setattr(hashing_executor, "max_waiting", 0)
+
+    response = await client.post(
+        URL_LOGIN,
+        data = {
+            "username": test_user.email,
+            "password": "TestPass123",
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"].isdigit()
+
+
+@pytest.mark.asyncio
+async def test_jwks_is_empty_and_cacheable_for_hmac(client: AsyncClient):
+    """
+    HMAC signing publishes no keys, the set is still served with caching
+    """
+    response = await client.get(URL_JWKS)
+
+    assert response.status_code == 200
+    assert response.json() == {"keys": []}
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
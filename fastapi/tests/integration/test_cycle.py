@@ -0,0 +1,237 @@
+"""
+©AngelaMos | 2026
+test_cycle.py
+"""
+
+import json
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from partner.Partner import Partner
+from period_log.PeriodLog import PeriodLog
+
+
+URL_CURRENT = "/v1/partners/me/cycle/current"
+URL_CALENDAR = "/v1/partners/me/cycle/calendar"
+URL_CALENDAR_RANGE = "/v1/partners/me/cycle/calendar/range"
+URL_CALENDAR_EXPORT = "/v1/partners/me/cycle/calendar/export"
+URL_PERIODS = "/v1/partners/me/periods"
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_returns_consecutive_months(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Range calendar returns every month across a year boundary
+    """
+    response = await client.get(
+        URL_CALENDAR_RANGE,
+        headers = auth_headers,
+        params = {
+            "start": "2025-11",
+            "months": 3
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(m["year"], m["month"]) for m in data["months"]] == [
+        (2025, 11),
+        (2025, 12),
+        (2026, 1),
+    ]
+    assert [len(m["days"]) for m in data["months"]] == [30, 31, 31]
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_matches_single_month(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Each month in a range equals the single month calendar
+    """
+    test_partner.last_period_start = date(2026, 1, 10)
+    db_session.add(
+        PeriodLog(
+            partner_id = test_partner.id,
+            start_date = date(2026, 1, 10),
+            end_date = date(2026, 1, 14),
+        )
+    )
+    await db_session.flush()
+
+    range_response = await client.get(
+        URL_CALENDAR_RANGE,
+        headers = auth_headers,
+        params = {
+            "start": "2026-01",
+            "months": 2
+        },
+    )
+    month_response = await client.get(
+        URL_CALENDAR,
+        headers = auth_headers,
+        params = {
+            "year": 2026,
+            "month": 2
+        },
+    )
+
+    assert range_response.status_code == 200
+    assert month_response.status_code == 200
+    january, february = range_response.json()["months"]
+    assert february == month_response.json()
+    assert sum(day["is_period"] for day in january["days"]) == 5
+    assert any(day["is_predicted_period"] for day in february["days"])
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_rejects_invalid_start(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Malformed start month returns 422
+    """
+    response = await client.get(
+        URL_CALENDAR_RANGE,
+        headers = auth_headers,
+        params = {"start": "2026-13"},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_rejects_window_past_last_date(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    A window running past 9999-12 returns 422, one ending there works
+    """
+    response = await client.get(
+        URL_CALENDAR_RANGE,
+        headers = auth_headers,
+        params = {"start": "9999-12", "months": 24},
+    )
+    assert response.status_code == 422
+
+    response = await client.get(
+        URL_CALENDAR_RANGE,
+        headers = auth_headers,
+        params = {"start": "9999-11", "months": 2},
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_calendar_range_requires_partner(
+    client: AsyncClient,
+    auth_headers: dict[str, str],
+):
+    """
+    Users without a partner profile get 404
+    """
+    response = await client.get(URL_CALENDAR_RANGE, headers = auth_headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_current_status_reflects_new_period_log(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Logging a period invalidates the cached cycle state
+    """
+    before = await client.get(URL_CURRENT, headers = auth_headers)
+    assert before.status_code == 200
+    assert before.json()["last_period_start"] is None
+
+    created = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = {"start_date": date.today().isoformat()},
+    )
+    assert created.status_code == 201
+
+    after = await client.get(URL_CURRENT, headers = auth_headers)
+    assert after.status_code == 200
+    assert after.json()["last_period_start"] == date.today().isoformat()
+    assert after.json()["current_day"] == 1
+
+
+@pytest.mark.asyncio
+async def test_calendar_export_matches_range(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Calendar export defaults to the first logged period and streams days
+    """
+    test_partner.last_period_start = date(2026, 1, 10)
+    db_session.add(
+        PeriodLog(
+            partner_id = test_partner.id,
+            start_date = date(2026, 1, 10),
+            end_date = date(2026, 1, 14),
+        )
+    )
+    await db_session.flush()
+
+    response = await client.get(
+        URL_CALENDAR_EXPORT,
+        headers = auth_headers,
+        params = {"end": "2026-02-28"},
+    )
+
+    assert response.status_code == 200
+    days = [json.loads(line) for line in response.text.splitlines()]
+    assert days[0] == {
+        "date": "2026-01-10",
+        "cycle_day": 1,
+        "phase": "menstrual",
+        "is_period": True,
+        "is_predicted_period": False,
+    }
+    assert days[-1]["date"] == "2026-02-28"
+    assert len(days) == 50
+    assert sum(day["is_period"] for day in days) == 5
+    assert days[28]["is_predicted_period"] is True
+
+
+@pytest.mark.asyncio
+async def test_calendar_export_rejects_inverted_range(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    start after end returns 422
+    """
+    response = await client.get(
+        URL_CALENDAR_EXPORT,
+        headers = auth_headers,
+        params = {
+            "start": "2026-03-01",
+            "end": "2026-02-01"
+        },
+    )
+
+    assert response.status_code == 422
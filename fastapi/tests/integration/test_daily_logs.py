@@ -0,0 +1,167 @@
+"""
+©AngelaMos | 2026
+test_daily_logs.py
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from partner.Partner import Partner
+from user.User import User
+
+
+URL_DAILY = "/v1/partners/me/daily-logs"
+
+
+def url_daily(log_date: str) -> str:
+    return f"{URL_DAILY}/{log_date}"
+
+
+@pytest.mark.asyncio
+async def test_daily_log_lifecycle(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Daily log can be created once, read, updated and deleted by date
+    """
+    payload = {
+        "log_date": "2026-02-01",
+        "energy_level": 3,
+        "symptoms": ["cramps"],
+    }
+    created = await client.post(
+        URL_DAILY,
+        headers = auth_headers,
+        json = payload,
+    )
+    duplicate = await client.post(
+        URL_DAILY,
+        headers = auth_headers,
+        json = payload,
+    )
+
+    assert created.status_code == 201
+    assert created.json()["symptoms"] == ["cramps"]
+    assert duplicate.status_code == 409
+
+    updated = await client.patch(
+        url_daily("2026-02-01"),
+        headers = auth_headers,
+        json = {"energy_level": 5},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["energy_level"] == 5
+    assert updated.json()["symptoms"] == ["cramps"]
+
+    url = url_daily("2026-02-01")
+    deleted = await client.delete(url, headers = auth_headers)
+    assert deleted.status_code == 204
+
+    missing = await client.get(url, headers = auth_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_daily_logs_require_partner(
+    client: AsyncClient,
+    test_user: User,
+    auth_headers: dict[str, str],
+):
+    """
+    Users without a partner profile get 404
+    """
+    listed = await client.get(URL_DAILY, headers = auth_headers)
+    fetched = await client.get(
+        url_daily("2026-02-01"),
+        headers = auth_headers,
+    )
+
+    assert listed.status_code == 404
+    assert fetched.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_daily_logs(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Import skips dates already logged or repeated in the payload
+    """
+    await client.post(
+        URL_DAILY,
+        headers = auth_headers,
+        json = {"log_date": "2026-01-02"},
+    )
+
+    response = await client.post(
+        f"{URL_DAILY}/import",
+        headers = auth_headers,
+        json = [
+            {"log_date": "2026-01-01", "symptoms": ["cramps"]},
+            {"log_date": "2026-01-02"},
+            {"log_date": "2026-01-03", "energy_level": 4},
+            {"log_date": "2026-01-03"},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"received": 4, "imported": 2, "skipped": 2}
+
+    logs = (await client.get(URL_DAILY, headers = auth_headers)).json()
+    assert [log["log_date"] for log in logs] == [
+        "2026-01-03",
+        "2026-01-02",
+        "2026-01-01",
+    ]
+    assert logs[0]["energy_level"] == 4
+    assert logs[2]["symptoms"] == ["cramps"]
+
+
+@pytest.mark.asyncio
+async def test_export_daily_logs_csv(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    CSV export joins symptom lists into one cell
+    """
+    await client.post(
+        URL_DAILY,
+        headers = auth_headers,
+        json = {
+            "log_date": "2026-01-01",
+            "mood": "good",
+            "symptoms": ["cramps", "fatigue"],
+        },
+    )
+
+    response = await client.get(
+        f"{URL_DAILY}/export",
+        headers = auth_headers,
+        params = {"format": "csv"},
+    )
+
+    assert response.status_code == 200
+    header, row = response.text.splitlines()
+    assert header.split(",")[: 3] == ["id", "log_date", "mood"]
+    assert "2026-01-01,good" in row
+    assert "cramps;fatigue" in row
+
+
+@pytest.mark.asyncio
+async def test_export_daily_logs_requires_partner(
+    client: AsyncClient,
+    test_user: User,
+    auth_headers: dict[str, str],
+):
+    """
+    Export without a partner profile returns 404 before streaming
+    """
+    response = await client.get(f"{URL_DAILY}/export", headers = auth_headers)
+
+    assert response.status_code == 404
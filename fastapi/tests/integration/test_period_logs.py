@@ -0,0 +1,427 @@
+"""
+©AngelaMos | 2026
+test_period_logs.py
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from partner.Partner import Partner
+from period_log.PeriodLog import PeriodLog
+from user.User import User
+
+
+URL_PERIODS = "/v1/partners/me/periods"
+URL_IMPORT = f"{URL_PERIODS}/import"
+
+
+def url_period(log_id: str) -> str:
+    return f"{URL_PERIODS}/{log_id}"
+
+
+@pytest.mark.asyncio
+async def test_create_period_log_records_cycle(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    New period derives cycle length and clears later predictions
+    """
+    db_session.add(
+        PeriodLog(partner_id = test_partner.id, start_date = date(2026, 1, 1))
+    )
+    await db_session.flush()
+
+    response = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = {"start_date": "2026-01-29"},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["cycle_length"] == 28
+    assert response.json()["is_predicted"] is False
+
+    db_session.add(
+        PeriodLog(
+            partner_id = test_partner.id,
+            start_date = date(2026, 3, 1),
+            is_predicted = True,
+        )
+    )
+    await db_session.flush()
+
+    response = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = {"start_date": "2026-02-26"},
+    )
+    assert response.status_code == 201
+
+    logs = (await client.get(URL_PERIODS, headers = auth_headers)).json()
+    assert [log["start_date"] for log in logs] == [
+        "2026-02-26",
+        "2026-01-29",
+        "2026-01-01",
+    ]
+
+    partner = await db_session.get(Partner, test_partner.id)
+    assert partner is not None
+    assert partner.last_period_start == date(2026, 2, 26)
+
+
+@pytest.mark.asyncio
+async def test_create_period_log_duplicate_start(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Second log on the same start date returns 409
+    """
+    payload = {"start_date": "2026-02-01"}
+    first = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = payload,
+    )
+    second = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = payload,
+    )
+
+    assert first.status_code == 201
+    assert first.json()["cycle_length"] is None
+    assert second.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_period_logs_require_partner(
+    client: AsyncClient,
+    test_user: User,
+    auth_headers: dict[str, str],
+):
+    """
+    Users without a partner profile get 404 on reads and writes
+    """
+    created = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = {"start_date": "2026-02-01"},
+    )
+    listed = await client.get(URL_PERIODS, headers = auth_headers)
+
+    assert created.status_code == 404
+    assert listed.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_period_log_update_and_delete(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Owner can update and delete a log, after which it is gone
+    """
+    created = await client.post(
+        URL_PERIODS,
+        headers = auth_headers,
+        json = {"start_date": "2026-02-01"},
+    )
+    log_id = created.json()["id"]
+
+    updated = await client.patch(
+        url_period(log_id),
+        headers = auth_headers,
+        json = {"end_date": "2026-02-05"},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["end_date"] == "2026-02-05"
+
+    deleted = await client.delete(url_period(log_id), headers = auth_headers)
+    assert deleted.status_code == 204
+
+    missing = await client.get(url_period(log_id), headers = auth_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_period_log_hidden_from_other_users(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    admin_user: User,
+    admin_auth_headers: dict[str, str],
+):
+    """
+    Logs of another user's partner are not found
+    """
+    log = PeriodLog(partner_id = test_partner.id, start_date = date(2026, 1, 1))
+    db_session.add_all([log, Partner(user_id = admin_user.id, name = "Other")])
+    await db_session.flush()
+
+    url = url_period(str(log.id))
+    fetched = await client.get(url, headers = admin_auth_headers)
+    updated = await client.patch(
+        url,
+        headers = admin_auth_headers,
+        json = {"notes": "x"},
+    )
+    deleted = await client.delete(url, headers = admin_auth_headers)
+
+    assert fetched.status_code == 404
+    assert updated.status_code == 404
+    assert deleted.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_period_logs_json_array(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Import derives cycle lengths across new and existing logs
+    """
+    existing = PeriodLog(
+        partner_id = test_partner.id,
+        start_date = date(2026, 3, 1),
+    )
+    db_session.add(existing)
+    await db_session.flush()
+
+    response = await client.post(
+        URL_IMPORT,
+        headers = auth_headers,
+        json = [
+            {"start_date": "2026-02-01", "end_date": "2026-02-05"},
+            {"start_date": "2026-01-04"},
+            {"start_date": "2026-01-04"},
+            {"start_date": "2026-03-01"},
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"received": 4, "imported": 2, "skipped": 2}
+
+    logs = (await client.get(URL_PERIODS, headers = auth_headers)).json()
+    assert [(log["start_date"], log["cycle_length"]) for log in logs] == [
+        ("2026-03-01", 28),
+        ("2026-02-01", 28),
+        ("2026-01-04", None),
+    ]
+
+    partner = await db_session.get(Partner, test_partner.id)
+    assert partner is not None
+    assert partner.last_period_start == date(2026, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_import_period_logs_ndjson(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    NDJSON bodies import one entry per line
+    """
+    body = '{"start_date": "2025-12-01"}\n\n{"start_date": "2025-12-30"}\n'
+
+    response = await client.post(
+        URL_IMPORT,
+        headers = {
+            **auth_headers,
+            "Content-Type": "application/x-ndjson",
+        },
+        content = body,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_period_logs_reports_every_invalid_entry(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Invalid entries are reported by position and nothing is imported
+    """
+    body = (
+        '{"start_date": "2025-12-01"}\n'
+        '{"start_date": "not-a-date"}\n'
+        '{"start_date": "2025-12-10", "end_date": "2025-12-01"}\n'
+    )
+
+    response = await client.post(
+        URL_IMPORT,
+        headers = {
+            **auth_headers,
+            "Content-Type": "application/x-ndjson",
+        },
+        content = body,
+    )
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    locations = {tuple(error["loc"][: 2]) for error in errors}
+    assert locations == {("body", 1), ("body", 2)}
+
+    logs = await client.get(URL_PERIODS, headers = auth_headers)
+    assert logs.json() == []
+
+
+@pytest.mark.asyncio
+async def test_import_period_logs_ignores_rows_skipped_on_conflict(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    An entry colliding with a predicted log does not shape cycle lengths
+    """
+    db_session.add_all([
+        PeriodLog(partner_id = test_partner.id,
+                  start_date = date(2026, 1, 4)),
+        PeriodLog(
+            partner_id = test_partner.id,
+            start_date = date(2026, 1, 31),
+            is_predicted = True,
+        ),
+    ])
+    await db_session.flush()
+
+    response = await client.post(
+        URL_IMPORT,
+        headers = auth_headers,
+        json = [{"start_date": "2026-01-31"}, {"start_date": "2026-02-28"}],
+    )
+
+    assert response.json() == {"received": 2, "imported": 1, "skipped": 1}
+    logs = (await client.get(URL_PERIODS, headers = auth_headers)).json()
+    assert [(log["start_date"], log["cycle_length"]) for log in logs] == [
+        ("2026-02-28", None),
+        ("2026-01-31", None),
+        ("2026-01-04", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_period_logs_rejects_oversized_body(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Bodies past IMPORT_MAX_BODY_BYTES are refused before parsing
+    """
+    monkeypatch.setattr(settings, "IMPORT_MAX_BODY_BYTES", 1024)
+
+    response = await client.post(
+        URL_IMPORT,
+        headers = auth_headers,
+        json = [{"start_date": "2026-01-04", "notes": "x" * 1024}],
+    )
+
+    assert response.status_code == 422
+    logs = await client.get(URL_PERIODS, headers = auth_headers)
+    assert logs.json() == []
+
+
+@pytest.mark.asyncio
+async def test_export_period_logs(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Export streams every log as NDJSON or CSV, oldest first
+    """
+    await client.post(
+        URL_IMPORT,
+        headers = auth_headers,
+        json = [
+            {"start_date": "2026-01-29", "flow_intensity": "heavy"},
+            {"start_date": "2026-01-01", "notes": "a, b"},
+        ],
+    )
+
+    ndjson = await client.get(f"{URL_PERIODS}/export", headers = auth_headers)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["start_date"] for row in rows] == ["2026-01-01", "2026-01-29"]
+    assert rows[1]["flow_intensity"] == "heavy"
+    assert rows[1]["cycle_length"] == 28
+
+    exported = await client.get(
+        f"{URL_PERIODS}/export",
+        headers = auth_headers,
+        params = {"format": "csv"},
+    )
+    assert exported.status_code == 200
+    assert "attachment" in exported.headers["content-disposition"]
+    reader = list(csv.DictReader(io.StringIO(exported.text)))
+    assert [row["start_date"] for row in reader] == ["2026-01-01", "2026-01-29"]
+    assert reader[0]["notes"] == "a, b"
+    assert reader[0]["end_date"] == ""
+
+
+@pytest.mark.asyncio
+async def test_period_logs_cursor_pagination(
+    client: AsyncClient,
+    test_partner: Partner,
+    auth_headers: dict[str, str],
+):
+    """
+    Cursor pages follow the newest first order without overlap
+    """
+    await client.post(
+        URL_IMPORT,
+        headers = auth_headers,
+        json = [
+            {"start_date": f"2025-{month:02d}-01"} for month in range(1, 6)
+        ],
+    )
+
+    first = await client.get(
+        URL_PERIODS,
+        headers = auth_headers,
+        params = {"limit": 3},
+    )
+    cursor = first.headers["x-next-cursor"]
+    second = await client.get(
+        URL_PERIODS,
+        headers = auth_headers,
+        params = {
+            "limit": 3,
+            "cursor": cursor
+        },
+    )
+
+    assert [log["start_date"] for log in first.json()] == [
+        "2025-05-01",
+        "2025-04-01",
+        "2025-03-01",
+    ]
+    assert [log["start_date"] for log in second.json()] == [
+        "2025-02-01",
+        "2025-01-01",
+    ]
+    assert "x-next-cursor" not in second.headers
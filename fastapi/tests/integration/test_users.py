@@ -5,6 +5,7 @@ test_users.py
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from user.User import User
 
@@ -238,3 +239,128 @@ async def test_list_users_pagination(
     data = response.json()
     assert data["page"] == 1
     assert data["size"] == 5
+
+
+@pytest.mark.asyncio
+async def test_list_users_cursor_pagination(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_user: User,
+    admin_auth_headers: dict[str,
+                             str],
+):
+    """
+    Following next_cursor walks every user exactly once in id order
+    """
+    db_session.add_all([
+        User(email = f"cursor{i}@test.com",
+             hashed_password = "unused") for i in range(4)
+    ])
+    await db_session.flush()
+
+    seen: list[str] = []
+    cursor = None
+    for _ in range(10):
+        params: dict[str, str | int] = {"size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(
+            URL_ADMIN_USERS,
+            headers = admin_auth_headers,
+            params = params,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["page"] is None
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        assert response.headers.get("x-next-cursor") == cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(
+    client: AsyncClient,
+    admin_user: User,
+    admin_auth_headers: dict[str,
+                             str],
+):
+    """
+    Malformed cursor returns 422
+    """
+    response = await client.get(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        params = {"cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_users_cached_count_invalidated_on_create(
+    client: AsyncClient,
+    admin_user: User,
+    admin_auth_headers: dict[str,
+                             str],
+):
+    """
+    Cached totals are served until a user is created
+    """
+    first = await client.get(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        params = {"count": "cached"},
+    )
+    second = await client.get(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        params = {"count": "cached"},
+    )
+
+    assert first.json()["count_strategy"] == "exact"
+    assert second.json()["count_strategy"] == "cached"
+    assert second.json()["total"] == first.json()["total"]
+
+    created = await client.post(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        json = {
+            "email": "counted@example.com",
+            "password": "SecurePass123!",
+        },
+    )
+    assert created.status_code == 201
+
+    after = await client.get(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        params = {"count": "cached"},
+    )
+    assert after.json()["count_strategy"] == "exact"
+    assert after.json()["total"] == first.json()["total"] + 1
+
+
+@pytest.mark.asyncio
+async def test_list_users_estimated_count_falls_back_to_exact(
+    client: AsyncClient,
+    admin_user: User,
+    admin_auth_headers: dict[str,
+                             str],
+):
+    """
+    Without planner statistics the estimate falls back to an exact count
+    """
+    response = await client.get(
+        URL_ADMIN_USERS,
+        headers = admin_auth_headers,
+        params = {"count": "estimated"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["count_strategy"] == "exact"
+    assert response.json()["total"] == 1
@@ -0,0 +1,32 @@
+"""
+©AngelaMos | 2026
+test_cache.py
+"""
+
+import pytest
+
+from config import settings
+from core.cache import VersionCounter
+
+
+@pytest.mark.asyncio
+async def test_fallback_versions_are_bounded_and_never_reused(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Without Redis, evicted keys come back on a version never handed out
+    """
+    monkeypatch.setattr(settings, "CACHE_LOCAL_MAX_ENTRIES", 2)
+    versions = VersionCounter("test:version", ttl_seconds = 60)
+
+    seen = {await versions.get("a")}
+    seen.add(await versions.bump("a"))
+    assert await versions.get("a") in seen
+
+    await versions.get("b")
+    await versions.get("c")
+    assert len(versions._fallback) == 2
+
+    versions.clear_local()
+    assert await versions.get("a") not in seen
+    assert min(seen) >= 0
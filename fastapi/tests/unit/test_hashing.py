@@ -0,0 +1,138 @@
+"""
+©AngelaMos | 2026
+test_hashing.py
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from core.exceptions import HashingCapacityExceeded, HashingUnavailable
+from core.hashing import (
+    HashingExecutor,
+    hash_secret,
+    verify_and_update_secret,
+)
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_beyond_workers_and_queue():
+    """
+    Calls past max_workers + max_waiting fail fast and are counted
+    """
+    executor = HashingExecutor(max_workers = 1, max_waiting = 1)
+    release = threading.Event()
+    try:
+        running = [
+            asyncio.create_task(executor.run(release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        assert executor.stats().queue_depth == 1
+        with pytest.raises(HashingCapacityExceeded) as exc_info:
+            await executor.run(release.wait)
+        assert exc_info.value.retry_after is not None
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats.in_flight == 0
+    assert stats.completed == 2
+    assert stats.rejected == 1
+    assert stats.latency_seconds_max > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_keep_their_slot_until_the_hash_ends():
+    """
+    A caller that goes away does not free the slot its hash still holds
+    """
+    executor = HashingExecutor(max_workers = 1, max_waiting = 0)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+        assert executor.stats().in_flight == 1
+        with pytest.raises(HashingCapacityExceeded):
+            await executor.run(release.wait)
+
+        release.set()
+        for _ in range(100):
+            if executor.stats().in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await executor.run(release.wait) is True
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert executor.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_process_backend_hashes_in_worker_processes():
+    """
+    Hashes made by pre started worker processes verify in the API process
+    """
+    executor = HashingExecutor(
+        max_workers = 1,
+        max_waiting = 0,
+        backend = "process",
+    )
+    try:
+        await executor.start()
+        hashed = await executor.run(hash_secret, "ValidPass123")
+        valid, rehashed = await executor.run(
+            verify_and_update_secret,
+            "ValidPass123",
+            hashed,
+        )
+    finally:
+        executor.shutdown()
+
+    assert valid is True
+    assert rehashed is None
+    assert verify_and_update_secret("ValidPass123", hashed) == (True, None)
+    assert executor.stats().backend == "process"
+
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_is_rebuilt():
+    """
+    A dead worker process answers 503 once and the next call gets a new pool
+    """
+    executor = HashingExecutor(
+        max_workers = 1,
+        max_waiting = 0,
+        backend = "process",
+    )
+    try:
+        with pytest.raises(HashingUnavailable) as exc_info:
+            await executor.run(os._exit, 1)
+        assert exc_info.value.status_code == 503
+
+        hashed = await executor.run(hash_secret, "ValidPass123")
+    finally:
+        executor.shutdown()
+
+    assert verify_and_update_secret("ValidPass123", hashed) == (True, None)
+
+
+def test_invalid_hash_fails_like_a_wrong_password():
+    """
+    Stored values that are not Argon2 hashes do not raise
+    """
+    assert verify_and_update_secret("ValidPass123", "not-a-hash") == (
+        False,
+        None,
+    )
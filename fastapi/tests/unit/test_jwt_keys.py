@@ -0,0 +1,91 @@
+"""
+©AngelaMos | 2026
+test_jwt_keys.py
+"""
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from core.jwt_keys import KeyRing
+
+
+PrivateKey = ed25519.Ed25519PrivateKey | ec.EllipticCurvePrivateKey
+
+def private_pem(key: PrivateKey) -> str:
+    return key.private_bytes(
+        Encoding.PEM,
+        PrivateFormat.PKCS8,
+        NoEncryption(),
+    ).decode()
+
+
+def public_pem(key: PrivateKey) -> str:
+    return key.public_key().public_bytes(
+        Encoding.PEM,
+        PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+
+@pytest.mark.parametrize(
+    ("algorithm", "key"),
+    [
+        ("EdDSA", ed25519.Ed25519PrivateKey.generate()),
+        ("ES256", ec.generate_private_key(ec.SECP256R1())),
+    ],
+)
+def test_asymmetric_ring_round_trip_and_jwks(algorithm, key):
+    """
+    Tokens carry the kid published in the JWKS and verify with it
+    """
+    ring = KeyRing(algorithm, private_pem(key))
+    token = ring.encode({"sub": "user"})
+
+    assert jwt.get_unverified_header(token)["kid"] == ring.key_id
+    assert ring.decode(token) == {"sub": "user"}
+
+    [jwk] = ring.jwks()["keys"]
+    assert jwk["kid"] == ring.key_id
+    assert jwk["alg"] == algorithm
+    assert "d" not in jwk
+    public_key = jwt.PyJWK(jwk).key
+    assert jwt.decode(token, public_key, algorithms = [algorithm]) == {
+        "sub": "user"
+    }
+
+
+def test_rotated_ring_accepts_retired_keys():
+    """
+    Tokens signed before a rotation verify until the old key is dropped
+    """
+    old_key = ed25519.Ed25519PrivateKey.generate()
+    new_key = ed25519.Ed25519PrivateKey.generate()
+    old_ring = KeyRing("EdDSA", private_pem(old_key), key_id = "2026-01")
+    old_token = old_ring.encode({"sub": "user"})
+
+    rotated = KeyRing(
+        "EdDSA",
+        private_pem(new_key),
+        key_id = "2026-02",
+        verification_keys = {"2026-01": public_pem(old_key)},
+    )
+    assert rotated.decode(old_token) == {"sub": "user"}
+    assert [k["kid"] for k in rotated.jwks()["keys"]] == ["2026-02", "2026-01"]
+
+    dropped = KeyRing("EdDSA", private_pem(new_key), key_id = "2026-02")
+    with pytest.raises(jwt.InvalidTokenError):
+        dropped.decode(old_token)
+
+
+def test_ring_rejects_mismatched_key():
+    """
+    The private key must match the configured algorithm
+    """
+    with pytest.raises(ValueError):
+        KeyRing("ES256", private_pem(ed25519.Ed25519PrivateKey.generate()))
@@ -0,0 +1,97 @@
+"""
+©AngelaMos | 2026
+test_maintenance.py
+"""
+
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from auth.RefreshToken import (
+    is_partition_name,
+    month_start,
+    next_month,
+    partition_name,
+)
+from auth.repository import partition_table
+from core import maintenance
+from core.maintenance import MaintenanceScheduler
+
+
+def elect(won: bool):
+    @contextlib.asynccontextmanager
+    async def leader_lock(key: int) -> AsyncIterator[bool]:
+        yield won
+
+    return leader_lock
+
+
+async def purged() -> int:
+    return 3
+
+
+async def broken() -> int:
+    raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_run_once_isolates_failing_jobs(monkeypatch):
+    """
+    A failing job is skipped and the rest still report results
+    """
+    monkeypatch.setattr(maintenance, "leader_lock", elect(True))
+    scheduler = MaintenanceScheduler(
+        jobs = {
+            "broken": broken,
+            "purge": purged
+        },
+        interval_seconds = 60,
+        lock_key = 1,
+    )
+
+    assert await scheduler.run_once() == {"purge": 3}
+
+
+@pytest.mark.asyncio
+async def test_run_once_skips_when_not_leader(monkeypatch):
+    """
+    Processes that lose the election run nothing
+    """
+    monkeypatch.setattr(maintenance, "leader_lock", elect(False))
+    scheduler = MaintenanceScheduler(
+        jobs = {"purge": purged},
+        interval_seconds = 60,
+        lock_key = 1,
+    )
+
+    assert await scheduler.run_once() is None
+
+
+def test_partition_months_roll_over_the_year():
+    """
+    Partitions are named and bounded by UTC month
+    """
+    moment = datetime(2027, 1, 1, 0, 30, tzinfo = timezone(timedelta(hours = 1)))
+    start = month_start(moment)
+
+    assert start == datetime(2026, 12, 1, tzinfo = UTC)
+    assert next_month(start) == datetime(2027, 1, 1, tzinfo = UTC)
+    assert partition_name(start) == "refresh_tokens_p2026_12"
+    assert is_partition_name(partition_name(start))
+    assert is_partition_name("refresh_tokens_default")
+    assert not is_partition_name("refresh_tokens")
+
+
+def test_partition_table_only_quotes_partition_names():
+    """
+    Raw partition DDL never sees a name outside the naming scheme
+    """
+    assert partition_table("refresh_tokens_p2026_12") == (
+        '"refresh_tokens_p2026_12"'
+    )
+    with pytest.raises(ValueError):
+        partition_table('refresh_tokens_p2026_12"; DROP TABLE users; --')
+    with pytest.raises(ValueError):
+        partition_table("refresh_tokens_p2026_12\n")
@@ -0,0 +1,89 @@
+"""
+©AngelaMos | 2026
+test_rate_limit.py
+"""
+
+import sqlite3
+
+import pytest
+
+from core.rate_limit import (
+    FALLBACK_BUSY_RETRY_SECONDS,
+    RateLimiter,
+    RateLimitItem,
+    SharedWindowStore,
+    parse_limits,
+)
+
+
+def test_parse_limits_accepts_several_windows():
+    """
+    Limits separated by semicolons become one item each
+    """
+    assert parse_limits("5/second; 100 per 2 hours") == (
+        RateLimitItem(5, 1),
+        RateLimitItem(100, 7200),
+    )
+    with pytest.raises(ValueError):
+        parse_limits("0/minute")
+
+
+@pytest.mark.asyncio
+async def test_workers_on_one_host_share_a_budget(tmp_path):
+    """
+    Two limiters on the same fallback file enforce a single limit
+    """
+    path = tmp_path / "rate_limit.sqlite3"
+    first = RateLimiter(SharedWindowStore(path))
+    second = RateLimiter(SharedWindowStore(path))
+    limits = parse_limits("3/minute")
+
+    results = [
+        await limiter.hit("login:203.0.113.7", limits)
+        for limiter in (first, second, first, second)
+    ]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].reset_after > 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_hit_consumes_no_window(tmp_path):
+    """
+    A hit blocked by one limit is not counted against the others
+    """
+    limiter = RateLimiter(SharedWindowStore(tmp_path / "rl.sqlite3"))
+    tight = parse_limits("1/minute")
+    both = parse_limits("1/minute;10/hour")
+
+    await limiter.hit("client", tight)
+    blocked = await limiter.hit("client", both)
+    hourly = await limiter.hit("client", parse_limits("10/hour"))
+
+    assert not blocked.allowed
+    assert blocked.limit == RateLimitItem(1, 60)
+    assert hourly.remaining == 9
+
+
+@pytest.mark.asyncio
+async def test_locked_fallback_refuses_with_retry_after(tmp_path):
+    """
+    A fallback file held by another writer refuses instead of erroring
+    """
+    path = tmp_path / "rate_limit.sqlite3"
+    limiter = RateLimiter(SharedWindowStore(path, busy_timeout = 0.05))
+    limits = parse_limits("3/minute")
+    assert (await limiter.hit("login:203.0.113.7", limits)).allowed
+
+    holder = sqlite3.connect(path, isolation_level = None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        result = await limiter.hit("login:203.0.113.7", limits)
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+
+    assert not result.allowed
+    assert result.reset_after == FALLBACK_BUSY_RETRY_SECONDS
+    assert (await limiter.hit("login:203.0.113.7", limits)).allowed
@@ -0,0 +1,55 @@
+"""
+©AngelaMos | 2026
+test_redis_pool.py
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.redis_pool import RedisConnectionManager
+
+
+@pytest.mark.asyncio
+async def test_manager_shares_one_bounded_pool():
+    """
+    The client is reused across calls and the pool opens nothing up front
+    """
+    manager = RedisConnectionManager()
+    assert manager.client is None
+    assert manager.stats() is None
+
+    manager.init("redis://localhost:6379/0")
+    try:
+        client = manager.client
+        assert client is not None
+        assert manager.client is client
+
+        stats = manager.stats()
+        assert stats is not None
+        assert stats.open_connections == 0
+        assert stats.max_connections >= 1
+    finally:
+        await manager.close()
+
+    assert manager.client is None
+
+
+@pytest.mark.asyncio
+async def test_stats_survive_missing_pool_internals():
+    """
+    Without redis-py's private counters only the pool limit is reported
+    """
+    manager = RedisConnectionManager()
+    manager.init("redis://localhost:6379/0")
+    pool = manager._pool
+    try:
+        manager._pool = SimpleNamespace(max_connections = 7)
+        stats = manager.stats()
+        assert stats is not None
+        assert stats.max_connections == 7
+        assert stats.in_use is None
+        assert stats.open_connections is None
+    finally:
+        manager._pool = pool
+        await manager.close()
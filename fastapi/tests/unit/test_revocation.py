@@ -0,0 +1,54 @@
+"""
+©AngelaMos | 2026
+test_revocation.py
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from conftest import FakeRedis
+from core.revocation import RedisRevocationStore
+
+
+@pytest.mark.asyncio
+async def test_token_versions_only_move_forward():
+    """
+    A late write through of an older version does not lower the floor
+    """
+    fake = FakeRedis()
+    store = RedisRevocationStore(ttl_seconds = 60, client = lambda: fake)
+    user_id = uuid4()
+
+    assert await store.token_version(user_id) is None
+    await store.set_token_version(user_id, 2)
+    await store.set_token_version(user_id, 1)
+
+    assert await store.token_version(user_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_revoked_family_is_reported():
+    """
+    Only the revoked family is reported revoked
+    """
+    fake = FakeRedis()
+    store = RedisRevocationStore(ttl_seconds = 60, client = lambda: fake)
+    family_id = uuid4()
+
+    await store.revoke_family(family_id)
+
+    assert await store.is_family_revoked(family_id)
+    assert not await store.is_family_revoked(uuid4())
+
+
+@pytest.mark.asyncio
+async def test_store_without_redis_has_no_opinion():
+    """
+    Without a client the database rows decide
+    """
+    store = RedisRevocationStore(ttl_seconds = 60, client = lambda: None)
+    await store.revoke_family(uuid4())
+
+    assert await store.token_version(uuid4()) is None
+    assert not await store.is_family_revoked(uuid4())
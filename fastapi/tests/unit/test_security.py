@@ -0,0 +1,89 @@
+"""
+©AngelaMos | 2026
+test_security.py
+"""
+
+from uuid import uuid4
+
+import jwt
+import pytest
+from starlette.requests import Request
+
+from core import jwt_keys
+from core.rate_limit import get_identifier
+from core.security import (
+    access_token_cache,
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    hash_token,
+)
+
+
+def bearer_request(token: str) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("203.0.113.7", 1234),
+    })
+
+
+def test_decode_access_token_verifies_once(monkeypatch):
+    """
+    A reused token is served from the cache without verifying again
+    """
+    access_token_cache.clear()
+    token = create_access_token(uuid4(), 0)
+    payload = decode_access_token(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token verified twice")
+
+    monkeypatch.setattr(jwt_keys.jwt, "decode", fail)
+
+    assert decode_access_token(token) == payload
+
+
+def test_decode_access_token_does_not_cache_failures():
+    """
+    Tokens with a bad signature are rejected every time
+    """
+    access_token_cache.clear()
+    forged = jwt.encode(
+        {"sub": str(uuid4())},
+        "not-the-secret-key-but-long-enough-for-hmac",
+        algorithm = "HS256",
+    )
+
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidTokenError):
+            decode_access_token(forged)
+    assert len(access_token_cache) == 0
+
+
+def test_rate_limit_identifier_uses_verified_subject():
+    """
+    Valid tokens key on the user, forged ones fall back to the client IP
+    """
+    access_token_cache.clear()
+    user_id = uuid4()
+    forged = jwt.encode(
+        {"sub": str(user_id)},
+        "not-the-secret-key-but-long-enough-for-hmac",
+        algorithm = "HS256",
+    )
+
+    valid = bearer_request(create_access_token(user_id, 0))
+    assert get_identifier(valid) == f"user:{user_id}"
+    assert get_identifier(bearer_request(forged)) == "203.0.113.7"
+
+
+def test_refresh_token_hash_is_raw_digest():
+    """
+    Refresh tokens are stored as their 32 byte SHA 256 digest
+    """
+    raw_token, token_hash, _ = create_refresh_token()
+
+    assert token_hash == hash_token(raw_token)
+    assert isinstance(token_hash, bytes)
+    assert len(token_hash) == 32
@@ -0,0 +1,24 @@
+"""
+©AngelaMos | 2026
+test_serve.py
+"""
+
+import pytest
+
+import serve
+from config import settings
+
+
+def test_server_takes_its_config_from_settings(monkeypatch: pytest.MonkeyPatch):
+    """
+    Gunicorn is configured from SERVER_* settings without reading argv
+    """
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 2)
+    server = serve.Server(serve.gunicorn_options())
+
+    assert server.cfg.workers == 2
+    assert server.cfg.worker_class is serve.AppWorker
+    assert server.cfg.preload_app is settings.SERVER_PRELOAD
+    assert server.cfg.backlog == settings.SERVER_BACKLOG
+    assert server.cfg.keepalive == settings.SERVER_KEEPALIVE
+    assert server.cfg.graceful_timeout == settings.SERVER_GRACEFUL_TIMEOUT
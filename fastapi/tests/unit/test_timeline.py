@@ -0,0 +1,115 @@
+"""
+©AngelaMos | 2026
+test_timeline.py
+"""
+
+from datetime import date
+
+import pytest
+
+from core.enums import CyclePhase
+from cycle.timeline import (
+    build_timeline,
+    next_period_start,
+    phase_boundaries,
+    phase_day,
+    phase_for_day,
+)
+
+
+def test_phase_boundaries_standard_cycle():
+    """
+    28 day cycle splits into the expected phase ranges
+    """
+    assert phase_boundaries(28) == [
+        (CyclePhase.MENSTRUAL, 1, 5),
+        (CyclePhase.FOLLICULAR, 6, 12),
+        (CyclePhase.OVULATION, 13, 16),
+        (CyclePhase.LUTEAL, 17, 28),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("cycle_day", "expected_phase", "expected_phase_day"),
+    [
+        (0, CyclePhase.UNKNOWN, 1),
+        (1, CyclePhase.MENSTRUAL, 1),
+        (6, CyclePhase.FOLLICULAR, 1),
+        (13, CyclePhase.OVULATION, 1),
+        (28, CyclePhase.LUTEAL, 12),
+        (29, CyclePhase.UNKNOWN, 1),
+    ],
+)
+def test_phase_lookup(cycle_day, expected_phase, expected_phase_day):
+    """
+    Phase and phase day lookups match the phase ranges
+    """
+    assert phase_for_day(cycle_day, 28) == expected_phase
+    assert phase_day(cycle_day, 28) == expected_phase_day
+
+
+def test_next_period_start_skips_elapsed_cycles():
+    """
+    Next predicted start is always after the given date
+    """
+    last = date(2026, 1, 1)
+    assert next_period_start(last, 28, date(2026, 1, 1)) == date(2026, 1, 29)
+    assert next_period_start(last, 28, date(2026, 1, 29)) == date(2026, 2, 26)
+
+
+def test_build_timeline_without_last_period():
+    """
+    No known period leaves every day unknown
+    """
+    window = build_timeline(
+        28, 5, None, [], date(2026, 3, 1), date(2026, 3, 31)
+    )
+
+    assert len(window) == 31
+    assert window.cycle_day_at(0) is None
+    assert {window.phase_at(i) for i in range(31)} == {CyclePhase.UNKNOWN}
+    assert not any(window.predicted)
+
+
+def test_build_timeline_marks_actual_and_predicted_periods():
+    """
+    Logged periods are actual, projected ones predicted
+    """
+    last = date(2026, 1, 5)
+    window = build_timeline(
+        28,
+        5,
+        last,
+        [(last, date(2026, 1, 7), False)],
+        date(2026, 1, 1),
+        date(2026, 2, 28),
+    )
+
+    assert window.cycle_day_at(window.offset(date(2026, 1, 4))) is None
+    assert window.cycle_day_at(window.offset(last)) == 1
+    assert window.phase_at(window.offset(date(2026, 2, 1))) == CyclePhase.LUTEAL
+
+    period_days = [d for i, d in enumerate(window.dates()) if window.period[i]]
+    assert period_days == [
+        date(2026, 1, 5),
+        date(2026, 1, 6),
+        date(2026, 1, 7),
+    ]
+
+    predicted_days = [
+        d for i, d in enumerate(window.dates()) if window.predicted[i]
+    ]
+    assert predicted_days[0] == date(2026, 2, 2)
+    assert len(predicted_days) == 5
+
+
+def test_build_timeline_predicted_period_spans_month_boundary():
+    """
+    A predicted period starting last month still shows this month
+    """
+    window = build_timeline(
+        28, 5, date(2026, 1, 2), [], date(2026, 3, 1), date(2026, 3, 31)
+    )
+
+    assert window.predicted[: 3] == b"\x01\x01\x01"
+    assert window.predicted[3] == 0